@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Sequence
 
-from aiwd.citeextract.pipeline import iter_citation_sentences_from_pages, load_pdf_pages
+from aiwd.citeextract.pipeline import iter_citation_sentence_dicts_from_pages, load_pdf_pages
 from aiwd.citeextract.references import iter_reference_entries_from_pages
 
 try:
@@ -194,14 +194,13 @@ class CitationBankIndexer:
                     continue
 
                 try:
-                    for rec in iter_citation_sentences_from_pages(
+                    for d in iter_citation_sentence_dicts_from_pages(
                         pages,
                         pdf_label=rel,
                         stop_at_references=stop_at_references,
                     ):
                         if stats.citation_sentence_count >= int(max_citation_sentences):
                             break
-                        d = rec.to_dict()
                         f_c.write(json.dumps(d, ensure_ascii=False) + "\n")
                         stats.citation_sentence_count += 1
                 except Exception:
@@ -6,17 +6,30 @@ import hashlib
 import json
 import os
 import re
+import threading
 import time
-from dataclasses import asdict, dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
 try:
     import numpy as np  # type: ignore
 except Exception:  # pragma: no cover
     np = None
 
-from aiwd.citeextract.pipeline import iter_citation_sentences_from_pages, load_pdf_pages
+try:
+    import xxhash  # type: ignore
+except Exception:  # pragma: no cover
+    xxhash = None
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
+from aiwd.citeextract.pipeline import CitationSentenceRecord, iter_citation_sentences_from_pages, load_pdf_pages
 from aiwd.citeextract.references import ReferenceEntry, iter_reference_entries_from_pages
 from aiwd.llm_budget import LLMBudget, approx_tokens
 from aiwd.openai_compat import OpenAICompatClient, extract_first_content, extract_usage
@@ -39,8 +52,115 @@ def _file_sig(path: str) -> dict:
         return {"size": 0, "mtime": 0}
 
 
+# Cache keys only shard cache directories, so a fast non-crypto hash is enough.
+# The algorithm is recorded in each cache manifest; switching it invalidates old caches.
+_CACHE_KEY_ALGO = "xxh128" if xxhash is not None else "md5"
+
+
 def _hash_key(s: str) -> str:
-    return hashlib.md5((s or "").encode("utf-8", errors="ignore")).hexdigest()
+    b = (s or "").encode("utf-8", errors="ignore")
+    if xxhash is not None:
+        return xxhash.xxh128_hexdigest(b)
+    return hashlib.md5(b).hexdigest()
+
+
+def _jsonl_bytes(rows: Sequence[dict]) -> bytes:
+    if orjson is not None:
+        return b"".join(orjson.dumps(r, option=orjson.OPT_APPEND_NEWLINE) for r in rows)
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows).encode("utf-8")
+
+
+def _json_bytes(obj: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _l2_normalize_rows(x: "np.ndarray") -> "np.ndarray":
+    """Contiguous float32 copy with unit-length rows, so a plain dot product is cosine similarity."""
+    m = np.ascontiguousarray(x, dtype=np.float32)
+    if m.ndim == 1:
+        m = m.reshape(1, -1)
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / np.clip(norms, 1e-12, None)
+
+
+# Cached embeddings are stored as int8 rows with one float32 scale per row (4x smaller on
+# disk and in the page cache). Scoring dequantizes in row blocks to keep temporaries small.
+_SCORE_BLOCK = 4096
+
+
+def _quantize_rows(m: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    m = np.asarray(m, dtype=np.float32)
+    if m.ndim == 1:
+        m = m.reshape(1, -1)
+    scales = (np.max(np.abs(m), axis=1) / 127.0).astype(np.float32) if m.size else np.zeros((m.shape[0],), dtype=np.float32)
+    scales = np.where(scales > 0, scales, np.float32(1.0)).astype(np.float32)
+    q = np.clip(np.rint(m / scales[:, None]), -127, 127).astype(np.int8)
+    return q, scales
+
+
+def _rows_float32(vecs: "np.ndarray", scales: Optional["np.ndarray"], rows: Optional[Sequence[int]] = None) -> "np.ndarray":
+    """Float32 copy of (a subset of) stored rows, dequantizing int8 rows when scales are given."""
+    sub = np.asarray(vecs)[list(rows)] if rows is not None else np.asarray(vecs)
+    out = np.asarray(sub, dtype=np.float32)
+    if scales is not None:
+        sc = np.asarray(scales)[list(rows)] if rows is not None else np.asarray(scales)
+        out = out * sc[:, None]
+    return out
+
+
+def _score_rows(vecs: "np.ndarray", scales: Optional["np.ndarray"], qmat: "np.ndarray") -> "np.ndarray":
+    """(Q, D) float32 queries against stored (N, D) rows -> (Q, N) scores."""
+    if scales is None:
+        return qmat @ np.ascontiguousarray(vecs, dtype=np.float32).T
+    n = int(vecs.shape[0])
+    out = np.empty((int(qmat.shape[0]), n), dtype=np.float32)
+    for a in range(0, n, _SCORE_BLOCK):
+        b = min(n, a + _SCORE_BLOCK)
+        out[:, a:b] = (qmat @ np.asarray(vecs[a:b], dtype=np.float32).T) * np.asarray(scales[a:b], dtype=np.float32)
+    return out
+
+
+def _scales_path(vecs_path: str) -> str:
+    return vecs_path[: -len(".npy")] + "_scales.npy" if vecs_path.endswith(".npy") else vecs_path + "_scales.npy"
+
+
+def _save_vecs(vecs_path: str, vecs: "np.ndarray", scales: Optional["np.ndarray"]) -> None:
+    if scales is None:
+        vecs, scales = _quantize_rows(vecs)
+    for path, arr in ((vecs_path, vecs), (_scales_path(vecs_path), scales)):
+        tmp = path + ".tmp"
+        np.save(tmp, np.asarray(arr))
+        tmp2 = tmp if tmp.endswith(".npy") else tmp + ".npy"
+        os.replace(tmp2, path)
+
+
+def _load_vecs(vecs_path: str, meta: dict, n_rows: int) -> Optional[Tuple["np.ndarray", Optional["np.ndarray"]]]:
+    """Load cached rows (memory-mapped) plus per-row scales; legacy float caches are normalized."""
+    vecs = np.load(vecs_path, allow_pickle=False, mmap_mode="r")
+    if int(getattr(vecs, "shape", [0])[0] or 0) != int(n_rows):
+        return None
+    if str(meta.get("vec_dtype", "") or "") == "int8":
+        if vecs.dtype != np.int8:
+            return None
+        scales = np.load(_scales_path(vecs_path), allow_pickle=False)
+        if int(scales.shape[0]) != int(n_rows):
+            return None
+        return vecs, np.asarray(scales, dtype=np.float32)
+    if not np.issubdtype(vecs.dtype, np.floating):
+        return None
+    if not meta.get("unit_rows", False):
+        vecs = _l2_normalize_rows(vecs)
+    return vecs, None
+
+
+def _top_k_desc(sims: "np.ndarray", k: int) -> "np.ndarray":
+    """Indices of the k largest scores in descending order (argpartition, then sort only k)."""
+    n = int(sims.shape[0])
+    k = min(max(1, int(k)), n)
+    idx = np.argpartition(-sims, k - 1)[:k] if k < n else np.arange(n)
+    return idx[np.argsort(-sims[idx], kind="stable")]
 
 
 _REF_TITLE_QUOTED_RE = re.compile(r'"([^"]{20,})"')
@@ -71,6 +191,9 @@ def extract_reference_title(reference_text: str) -> str:
     return ref_text[:120]
 
 
+_DIGIT_RUN_RE = re.compile(r"\d{4,}")
+
+
 def _surname_tokens(authors: str) -> List[str]:
     authors = (authors or "").strip()
     if not authors:
@@ -108,17 +231,30 @@ def _surname_tokens(authors: str) -> List[str]:
     return out
 
 
+def group_references_by_year(references: Sequence[ReferenceEntry]) -> Dict[str, List[ReferenceEntry]]:
+    """Bucket references by year once so per-citation matching only scans one year."""
+    out: Dict[str, List[ReferenceEntry]] = {}
+    for ref in references:
+        out.setdefault((ref.year or "").strip(), []).append(ref)
+    return out
+
+
 def match_reference_entry(
     *,
     cited_author: str,
     cited_year: str,
-    references: Sequence[ReferenceEntry],
+    references: Union[Sequence[ReferenceEntry], Mapping[str, Sequence[ReferenceEntry]]],
 ) -> Optional[ReferenceEntry]:
-    """Map a (author, year) citation to a ReferenceEntry using simple heuristics."""
+    """Map a (author, year) citation to a ReferenceEntry using simple heuristics.
+
+    `references` may be a plain list or the output of `group_references_by_year`.
+    """
     year = (cited_year or "").strip()
     want = _surname_tokens(cited_author)
     if not want or not year:
         return None
+    if isinstance(references, Mapping):
+        references = references.get(year, ())
 
     def _has_cjk(s: str) -> bool:
         for ch in (s or ""):
@@ -200,7 +336,7 @@ class CiteCheckItem:
             "claim": self.claim,
             "reason": self.reason,
             "suggested_fix": self.suggested_fix,
-            "evidence": [asdict(e) for e in (self.evidence or [])],
+            "evidence": [{"page": e.page, "score": e.score, "text": e.text} for e in (self.evidence or [])],
         }
 
 
@@ -211,6 +347,19 @@ class CiteCheckConfig:
     max_pairs: int = 80
     use_llm: bool = True
     llm_timeout_s: float = 90.0
+    # Pairs whose best evidence paragraph scores below this get NO_EVIDENCE without an LLM call.
+    min_evidence_score: float = 0.15
+
+
+# PyMuPDF is not safe to drive from several threads at once; serialize PDF reads so
+# concurrent index builds overlap extraction with embedding and cache I/O instead.
+# Runners share title indexes across jobs, so every read in this module goes through here.
+_PDF_READ_LOCK = threading.Lock()
+
+
+def _read_pdf_pages(pdf_path: str, *, max_pages: Optional[int] = None) -> List[str]:
+    with _PDF_READ_LOCK:
+        return load_pdf_pages(Path(pdf_path), max_pages=max_pages)
 
 
 class PapersTitleIndex:
@@ -231,11 +380,34 @@ class PapersTitleIndex:
 
         self.entries: List[dict] = []
         self.vecs = None
+        self.scales = None
+        # rel -> file signature of the indexed PDFs; lets a rebuild of the same object skip the disk cache.
+        self.files: Dict[str, dict] = {}
+        # Filename year buckets for find_by_author_year, tied to the entries list they were built from.
+        self._ay_map: Dict[str, List[Tuple[dict, str]]] = {}
+        self._ay_entries: Optional[List[dict]] = None
+        self._ay_len = -1
+        # One index can be shared by runners on several threads: build and lookups take turns.
+        self._lock = threading.RLock()
 
     @staticmethod
-    def _iter_pdfs(root: str) -> List[str]:
-        p = Path(root)
-        return [str(x) for x in p.rglob("*.pdf")]
+    def _iter_pdfs(root: str) -> Iterator[str]:
+        """Yield PDF paths under root (scandir walk; symlinked dirs are not followed, like rglob)."""
+        stack = [root]
+        while stack:
+            d = stack.pop()
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif os.path.normcase(entry.name).endswith(".pdf") and entry.is_file():
+                                yield entry.path
+                        except OSError:
+                            continue
+            except OSError:
+                continue
 
     def _cache_paths(self) -> Tuple[str, str, str]:
         root_key = _hash_key(self.papers_root)
@@ -245,29 +417,26 @@ class PapersTitleIndex:
         vecs = os.path.join(base, "title_embeddings.npy")
         return meta, entries, vecs
 
-    def _load_cache(self) -> bool:
+    def _read_cache(self) -> Optional[Tuple[Dict[str, dict], List[dict], "np.ndarray", Optional["np.ndarray"]]]:
+        """Load cached (files, entries, vecs, scales) if the cache matches this root/model; no file checks."""
         meta_path, entries_path, vecs_path = self._cache_paths()
         try:
             if not (os.path.exists(meta_path) and os.path.exists(entries_path) and os.path.exists(vecs_path)):
-                return False
+                return None
             with open(meta_path, "r", encoding="utf-8") as f:
                 meta = json.load(f)
             if not isinstance(meta, dict):
-                return False
+                return None
             if os.path.abspath(str(meta.get("papers_root", "") or "")) != self.papers_root:
-                return False
+                return None
+            if str(meta.get("key_algo", "md5") or "md5") != _CACHE_KEY_ALGO:
+                return None
             if meta.get("model_fingerprint", {}) != (self.model_fingerprint or {}):
-                return False
+                return None
 
             files = meta.get("files", {})
             if not isinstance(files, dict):
-                return False
-            for rel, sig in files.items():
-                full = os.path.join(self.papers_root, str(rel).replace("\\", "/"))
-                if not os.path.exists(full):
-                    return False
-                if _file_sig(full) != (sig or {}):
-                    return False
+                return None
 
             entries: List[dict] = []
             with open(entries_path, "r", encoding="utf-8") as f:
@@ -282,16 +451,14 @@ class PapersTitleIndex:
                     if isinstance(obj, dict):
                         entries.append(obj)
             if not entries:
-                return False
-            vecs = np.load(vecs_path, allow_pickle=False)
-            if int(getattr(vecs, "shape", [0])[0] or 0) != len(entries):
-                return False
-
-            self.entries = entries
-            self.vecs = vecs
-            return True
+                return None
+            # Memory-map: only the pages a query touches are paged in.
+            loaded = _load_vecs(vecs_path, meta, len(entries))
+            if loaded is None:
+                return None
+            return files, entries, loaded[0], loaded[1]
         except Exception:
-            return False
+            return None
 
     def _save_cache(self) -> None:
         meta_path, entries_path, vecs_path = self._cache_paths()
@@ -299,15 +466,11 @@ class PapersTitleIndex:
         os.makedirs(base, exist_ok=True)
 
         entries_tmp = entries_path + ".tmp"
-        with open(entries_tmp, "w", encoding="utf-8") as f:
-            for e in self.entries:
-                f.write(json.dumps(e, ensure_ascii=False) + "\n")
+        with open(entries_tmp, "wb") as f:
+            f.write(_jsonl_bytes(self.entries))
         os.replace(entries_tmp, entries_path)
 
-        vecs_tmp = vecs_path + ".tmp"
-        np.save(vecs_tmp, self.vecs)
-        vecs_tmp2 = vecs_tmp if vecs_tmp.endswith(".npy") else vecs_tmp + ".npy"
-        os.replace(vecs_tmp2, vecs_path)
+        _save_vecs(vecs_path, self.vecs, self.scales)
 
         files = {}
         for e in self.entries:
@@ -315,15 +478,19 @@ class PapersTitleIndex:
             if not rel:
                 continue
             files[rel] = _file_sig(os.path.join(self.papers_root, rel))
+        self.files = files
         meta = {
             "papers_root": self.papers_root,
+            "key_algo": _CACHE_KEY_ALGO,
             "model_fingerprint": self.model_fingerprint or {},
             "updated_at": int(time.time()),
+            "unit_rows": True,
+            "vec_dtype": "int8",
             "files": files,
         }
         meta_tmp = meta_path + ".tmp"
-        with open(meta_tmp, "w", encoding="utf-8") as f:
-            json.dump(meta, f, ensure_ascii=False, indent=2)
+        with open(meta_tmp, "wb") as f:
+            f.write(_json_bytes(meta))
         os.replace(meta_tmp, meta_path)
 
     def build(
@@ -331,15 +498,59 @@ class PapersTitleIndex:
         *,
         progress_cb: Optional[Callable[[int, int, str], None]] = None,
         cancel_cb: Optional[Callable[[], bool]] = None,
+        embed_texts: Optional[Callable[[List[str]], "np.ndarray"]] = None,
     ) -> None:
-        if self._load_cache():
-            return
+        """Index the PDFs under papers_root; `embed_texts` overrides the constructor's embedder for this call."""
+        with self._lock:
+            self._build(progress_cb=progress_cb, cancel_cb=cancel_cb, embed_texts=embed_texts or self.embed_texts)
 
-        pdfs = self._iter_pdfs(self.papers_root)
+    def _build(
+        self,
+        *,
+        progress_cb: Optional[Callable[[int, int, str], None]],
+        cancel_cb: Optional[Callable[[], bool]],
+        embed_texts: Callable[[List[str]], "np.ndarray"],
+    ) -> None:
+        rel_of: Dict[str, str] = {}
+        for p in self._iter_pdfs(self.papers_root):
+            try:
+                rel_of[p] = os.path.relpath(p, self.papers_root).replace("\\", "/")
+            except Exception:
+                rel_of[p] = os.path.basename(p).replace("\\", "/")
+
+        # Delta rebuild: reuse rows whose PDF is unchanged, only read/embed new or changed PDFs.
+        keep_rows: Dict[str, int] = {}
+        old_entries: List[dict] = []
+        old_vecs = None
+        old_scales = None
+        if self.files and self.vecs is not None:
+            # Already built in this process: diff against the in-memory index instead of re-reading the cache.
+            cached = (self.files, self.entries, self.vecs, self.scales)
+        else:
+            cached = self._read_cache()
+        if cached is not None:
+            files, old_entries, old_vecs, old_scales = cached
+            for row, e in enumerate(old_entries):
+                rel = str(e.get("rel", "") or "")
+                sig = files.get(rel, None)
+                if not rel or not isinstance(sig, dict):
+                    continue
+                if _file_sig(os.path.join(self.papers_root, rel)) == sig:
+                    keep_rows[rel] = row
+            current = set(rel_of.values())
+            keep_rows = {rel: row for rel, row in keep_rows.items() if rel in current}
+            if len(keep_rows) == len(old_entries) and current == set(keep_rows):
+                self.files = files
+                self.entries = old_entries
+                self.vecs = old_vecs
+                self.scales = old_scales
+                return
+
+        todo = [p for p, rel in rel_of.items() if rel not in keep_rows]
         entries: List[dict] = []
         texts: List[str] = []
-        total = int(len(pdfs))
-        for i, p in enumerate(pdfs, start=1):
+        total = int(len(todo))
+        for i, p in enumerate(todo, start=1):
             try:
                 if cancel_cb and cancel_cb():
                     raise CiteCheckError("canceled")
@@ -353,25 +564,53 @@ class PapersTitleIndex:
                     progress_cb(int(i), total, os.path.basename(p))
                 except Exception:
                     pass
-            try:
-                rel = os.path.relpath(p, self.papers_root).replace("\\", "/")
-            except Exception:
-                rel = os.path.basename(p).replace("\\", "/")
-            pages = load_pdf_pages(Path(p), max_pages=2)
+            pages = _read_pdf_pages(p, max_pages=2)
             head = "\n".join((pages or [])[:2])
             title_area = (head or "")[:500]
             match_text = f"{os.path.basename(p)} {title_area}"
-            entries.append({"rel": rel, "filename": os.path.basename(p), "title_area": title_area})
+            entries.append({"rel": rel_of[p], "filename": os.path.basename(p), "title_area": title_area})
             texts.append(match_text[:700])
 
-        self.entries = entries
-        if entries:
-            self.vecs = self.embed_texts(texts)
+        kept = sorted(keep_rows.values())
+        vec_parts = []
+        if kept and old_vecs is not None:
+            vec_parts.append(_rows_float32(old_vecs, old_scales, kept))
+        # Release the memory-mapped cache before overwriting its file (required on Windows).
+        cached = None
+        old_vecs = None
+        old_scales = None
+        if texts:
+            vec_parts.append(_l2_normalize_rows(np.asarray(embed_texts(texts))))
+
+        self.entries = [old_entries[row] for row in kept] + entries
+        if self.entries and vec_parts:
+            self.vecs = np.concatenate(vec_parts, axis=0) if len(vec_parts) > 1 else vec_parts[0]
         else:
             self.vecs = np.zeros((0, 1), dtype=np.float32)
+        self.scales = None
         self._save_cache()
 
+    def _year_buckets(self) -> Dict[str, List[Tuple[dict, str]]]:
+        """4-digit run in filename -> [(entry, lowered filename)] in entry order; rebuilt when entries change."""
+        entries = self.entries
+        if self._ay_entries is entries and self._ay_len == len(entries):
+            return self._ay_map
+        buckets: Dict[str, List[Tuple[dict, str]]] = {}
+        for e in entries:
+            name = str(e.get("filename", "") or "").lower()
+            keys = dict.fromkeys(run[i : i + 4] for run in _DIGIT_RUN_RE.findall(name) for i in range(len(run) - 3))
+            for key in keys:
+                buckets.setdefault(key, []).append((e, name))
+        self._ay_map = buckets
+        self._ay_entries = entries
+        self._ay_len = len(entries)
+        return buckets
+
     def find_by_author_year(self, author: str, year: str) -> Optional[dict]:
+        with self._lock:
+            return self._find_by_author_year(author, year)
+
+    def _find_by_author_year(self, author: str, year: str) -> Optional[dict]:
         author = (author or "").strip()
         year = (year or "").strip()
         if not author or not year:
@@ -380,10 +619,15 @@ class PapersTitleIndex:
         if not surnames:
             return None
 
+        year_l = year.lower()
+        if len(year_l) >= 4 and year_l[:4].isdigit():
+            candidates = self._year_buckets().get(year_l[:4], [])
+        else:
+            candidates = [(e, str(e.get("filename", "") or "").lower()) for e in self.entries]
+
         best = None
         best_score = 0.0
-        for e in self.entries:
-            name = str(e.get("filename", "") or "").lower()
+        for e, name in candidates:
             if year not in name:
                 continue
             hit = 0
@@ -398,62 +642,129 @@ class PapersTitleIndex:
                 best = e
         return best
 
-    def find_by_title(self, title: str, authors: str = "", *, threshold: Optional[float] = None) -> Optional[dict]:
-        if np is None:
-            return None
-        title = _normalize_ws(title)
-        if not title:
-            return None
-        if not self.entries or self.vecs is None:
-            return None
-        q = _normalize_ws(f"{title} {authors}")
-        qv = self.embed_texts([q])
-        try:
-            qv1 = np.asarray(qv[0], dtype=np.float32)
-        except Exception:
-            return None
-        sims = np.dot(self.vecs, qv1)
-        best_idx = int(np.argmax(sims))
-        best_score = float(sims[best_idx])
-        thr = float(threshold) if threshold is not None else 0.55
-        if best_score < thr:
+    def _score_queries(
+        self,
+        queries: Sequence[str],
+        embed_texts: Optional[Callable[[List[str]], "np.ndarray"]] = None,
+    ) -> Optional["np.ndarray"]:
+        """Embed all queries in one call and return the (Q, N) score matrix."""
+        if np is None or not queries or not self.entries or self.vecs is None:
             return None
         try:
-            e = self.entries[best_idx]
-            return {**e, "score": best_score}
+            qv = _l2_normalize_rows(np.asarray((embed_texts or self.embed_texts)(list(queries)), dtype=np.float32))
+            return _score_rows(self.vecs, self.scales, qv)
         except Exception:
             return None
 
-    def search(self, query: str, *, top_k: int = 5) -> List[dict]:
-        """Embedding search over (filename + first-page title area) to suggest candidate PDFs."""
-        if np is None:
-            return []
-        q = _normalize_ws(query)
-        if not q:
-            return []
-        if not self.entries or self.vecs is None:
-            return []
-        try:
-            qv = self.embed_texts([q])
-            qv1 = np.asarray(qv[0], dtype=np.float32)
-        except Exception:
-            return []
-        sims = np.dot(self.vecs, qv1)
-        k = max(1, min(int(top_k or 0), 12))
-        idxs = np.argsort(sims)[-k:][::-1]
-        out: List[dict] = []
-        for i in idxs:
-            ii = int(i)
-            if ii < 0 or ii >= len(self.entries):
+    def find_by_title(
+        self,
+        title: str,
+        authors: str = "",
+        *,
+        threshold: Optional[float] = None,
+        embed_texts: Optional[Callable[[List[str]], "np.ndarray"]] = None,
+    ) -> Optional[dict]:
+        return self.find_by_title_batch([(title, authors)], threshold=threshold, embed_texts=embed_texts)[0]
+
+    def find_by_title_batch(
+        self,
+        items: Sequence[Tuple[str, str]],
+        *,
+        threshold: Optional[float] = None,
+        embed_texts: Optional[Callable[[List[str]], "np.ndarray"]] = None,
+    ) -> List[Optional[dict]]:
+        """Batched `find_by_title` over (title, authors) pairs."""
+        with self._lock:
+            return self._find_by_title_batch(items, threshold=threshold, embed_texts=embed_texts)
+
+    def _find_by_title_batch(
+        self,
+        items: Sequence[Tuple[str, str]],
+        *,
+        threshold: Optional[float],
+        embed_texts: Optional[Callable[[List[str]], "np.ndarray"]],
+    ) -> List[Optional[dict]]:
+        out: List[Optional[dict]] = [None] * len(items)
+        rows: List[int] = []
+        queries: List[str] = []
+        for i, (title, authors) in enumerate(items):
+            if not _normalize_ws(title):
+                continue
+            rows.append(i)
+            queries.append(_normalize_ws(f"{_normalize_ws(title)} {authors}"))
+        sims = self._score_queries(queries, embed_texts)
+        if sims is None:
+            return out
+        thr = float(threshold) if threshold is not None else 0.55
+        best = np.argmax(sims, axis=1)
+        for r, i in enumerate(rows):
+            best_idx = int(best[r])
+            best_score = float(sims[r, best_idx])
+            if best_score < thr:
                 continue
             try:
-                e = dict(self.entries[ii])
+                out[i] = {**self.entries[best_idx], "score": best_score}
             except Exception:
                 continue
-            e["score"] = float(sims[ii])
-            out.append(e)
         return out
 
+    def search(
+        self,
+        query: str,
+        *,
+        top_k: int = 5,
+        embed_texts: Optional[Callable[[List[str]], "np.ndarray"]] = None,
+    ) -> List[dict]:
+        """Embedding search over (filename + first-page title area) to suggest candidate PDFs."""
+        return self.search_batch([query], top_k=top_k, embed_texts=embed_texts)[0]
+
+    def search_batch(
+        self,
+        queries: Sequence[str],
+        *,
+        top_k: int = 5,
+        embed_texts: Optional[Callable[[List[str]], "np.ndarray"]] = None,
+    ) -> List[List[dict]]:
+        """Batched `search`: one embed call and one matmul for all queries."""
+        with self._lock:
+            return self._search_batch(queries, top_k=top_k, embed_texts=embed_texts)
+
+    def _search_batch(
+        self,
+        queries: Sequence[str],
+        *,
+        top_k: int,
+        embed_texts: Optional[Callable[[List[str]], "np.ndarray"]],
+    ) -> List[List[dict]]:
+        out: List[List[dict]] = [[] for _ in queries]
+        rows: List[int] = []
+        qs: List[str] = []
+        for i, query in enumerate(queries):
+            q = _normalize_ws(query)
+            if q:
+                rows.append(i)
+                qs.append(q)
+        sims = self._score_queries(qs, embed_texts)
+        if sims is None:
+            return out
+        k = max(1, min(int(top_k or 0), 12))
+        for r, i in enumerate(rows):
+            cand = _top_k_desc(sims[r], k)
+            hits: List[dict] = []
+            for ii in cand:
+                ii = int(ii)
+                try:
+                    e = dict(self.entries[ii])
+                except Exception:
+                    continue
+                e["score"] = float(sims[r, ii])
+                hits.append(e)
+            out[i] = hits
+        return out
+
+
+# Upper bound on texts per embed_texts call when batching across paragraph indexes.
+_EMBED_BATCH = 256
 
 class ParagraphIndex:
     def __init__(
@@ -472,6 +783,7 @@ class ParagraphIndex:
         self.model_fingerprint = model_fingerprint or {}
         self.paragraphs: List[dict] = []
         self.vecs = None
+        self.scales = None
 
     def _cache_paths(self) -> Tuple[str, str, str]:
         key = _hash_key(self.pdf_path)
@@ -492,6 +804,8 @@ class ParagraphIndex:
                 return False
             if os.path.abspath(str(meta.get("pdf_path", "") or "")) != self.pdf_path:
                 return False
+            if str(meta.get("key_algo", "md5") or "md5") != _CACHE_KEY_ALGO:
+                return False
             if meta.get("model_fingerprint", {}) != (self.model_fingerprint or {}):
                 return False
             if meta.get("file_sig", {}) != _file_sig(self.pdf_path):
@@ -511,12 +825,13 @@ class ParagraphIndex:
                         paras.append(obj)
             if not paras:
                 return False
-            vecs = np.load(vecs_path, allow_pickle=False)
-            if int(getattr(vecs, "shape", [0])[0] or 0) != len(paras):
+            # Memory-map: only the pages a query touches are paged in.
+            loaded = _load_vecs(vecs_path, meta, len(paras))
+            if loaded is None:
                 return False
 
             self.paragraphs = paras
-            self.vecs = vecs
+            self.vecs, self.scales = loaded
             return True
         except Exception:
             return False
@@ -527,25 +842,24 @@ class ParagraphIndex:
         os.makedirs(base, exist_ok=True)
 
         paras_tmp = paras_path + ".tmp"
-        with open(paras_tmp, "w", encoding="utf-8") as f:
-            for p in self.paragraphs:
-                f.write(json.dumps(p, ensure_ascii=False) + "\n")
+        with open(paras_tmp, "wb") as f:
+            f.write(_jsonl_bytes(self.paragraphs))
         os.replace(paras_tmp, paras_path)
 
-        vecs_tmp = vecs_path + ".tmp"
-        np.save(vecs_tmp, self.vecs)
-        vecs_tmp2 = vecs_tmp if vecs_tmp.endswith(".npy") else vecs_tmp + ".npy"
-        os.replace(vecs_tmp2, vecs_path)
+        _save_vecs(vecs_path, self.vecs, self.scales)
 
         meta = {
             "pdf_path": self.pdf_path,
+            "key_algo": _CACHE_KEY_ALGO,
             "file_sig": _file_sig(self.pdf_path),
             "model_fingerprint": self.model_fingerprint or {},
             "updated_at": int(time.time()),
+            "unit_rows": True,
+            "vec_dtype": "int8",
         }
         meta_tmp = meta_path + ".tmp"
-        with open(meta_tmp, "w", encoding="utf-8") as f:
-            json.dump(meta, f, ensure_ascii=False, indent=2)
+        with open(meta_tmp, "wb") as f:
+            f.write(_json_bytes(meta))
         os.replace(meta_tmp, meta_path)
 
     @staticmethod
@@ -568,9 +882,18 @@ class ParagraphIndex:
     ) -> None:
         if self._load_cache():
             return
-        pages = load_pdf_pages(Path(self.pdf_path))
+        paras = self._collect_paragraphs(progress_cb=progress_cb, cancel_cb=cancel_cb)
+        self._finish_build(paras, self.embed_texts([p["text"] for p in paras]) if paras else None)
+
+    def _collect_paragraphs(
+        self,
+        *,
+        progress_cb: Optional[Callable[[int, int, str], None]] = None,
+        cancel_cb: Optional[Callable[[], bool]] = None,
+    ) -> List[dict]:
+        """Extract indexable paragraphs (first half of `build`; no embedding)."""
+        pages = _read_pdf_pages(self.pdf_path)
         paras: List[dict] = []
-        texts: List[str] = []
 
         total_pages = int(len(pages or []))
         stop = False
@@ -603,13 +926,16 @@ class ParagraphIndex:
                 if "." not in chunk and "。" not in chunk:
                     continue
                 paras.append({"page": int(page_num), "text": chunk})
-                texts.append(chunk)
+        return paras
 
+    def _finish_build(self, paras: List[dict], vecs: Optional["np.ndarray"]) -> None:
+        """Second half of `build`: attach embeddings for `paras` and persist the cache."""
         self.paragraphs = paras
-        if texts:
-            self.vecs = self.embed_texts(texts)
+        if paras and vecs is not None:
+            self.vecs = _l2_normalize_rows(vecs)
         else:
             self.vecs = np.zeros((0, 1), dtype=np.float32)
+        self.scales = None
         self._save_cache()
 
     def search(self, query: str, *, top_k: int = 5) -> List[EvidenceParagraph]:
@@ -620,14 +946,13 @@ class ParagraphIndex:
             return []
         if not self.paragraphs or self.vecs is None:
             return []
-        qv = self.embed_texts([query])
         try:
-            qv1 = np.asarray(qv[0], dtype=np.float32)
+            qv = self.embed_texts([query])
+            qv1 = _l2_normalize_rows(np.asarray(qv[0], dtype=np.float32))[0]
         except Exception:
             return []
-        sims = np.dot(self.vecs, qv1)
-        k = max(1, min(int(top_k or 0), 12))
-        idxs = np.argsort(sims)[-k:][::-1]
+        sims = _score_rows(self.vecs, self.scales, qv1.reshape(1, -1))[0]
+        idxs = _top_k_desc(sims, max(1, min(int(top_k or 0), 12)))
         out: List[EvidenceParagraph] = []
         for i in idxs:
             ii = int(i)
@@ -638,6 +963,158 @@ class ParagraphIndex:
         return out
 
 
+_JSON_DECODER = json.JSONDecoder()
+
+_LLM_VERDICTS = ("ACCURATE", "INACCURATE", "MISATTRIBUTED", "NOT_FOUND")
+
+# Per-process memo of verify verdicts, so repeated (sentence, ref, evidence) pairs
+# within one report (or across reports in the same session) share one LLM call.
+_VERIFY_MEMO: "OrderedDict[tuple, dict]" = OrderedDict()
+_VERIFY_MEMO_MAX = 512
+# Cite checks run on worker threads; the LRU reorders on every hit.
+_VERIFY_MEMO_LOCK = threading.Lock()
+
+
+def _verify_memo_key(
+    *,
+    model: str,
+    citation_sentence: str,
+    cited_author: str,
+    cited_year: str,
+    ref_title: str,
+    evidence_text: str,
+) -> tuple:
+    # `evidence_text` is the evidence block exactly as the prompt shows it (order and length).
+    return (
+        str(model or ""),
+        stable_text_key(prefix="cs", text=citation_sentence or ""),
+        (cited_author or "").strip().lower(),
+        (cited_year or "").strip(),
+        stable_text_key(prefix="rt", text=ref_title or ""),
+        _hash_key(evidence_text or ""),
+    )
+
+
+def _verify_memo_get(key: tuple) -> Optional[dict]:
+    with _VERIFY_MEMO_LOCK:
+        hit = _VERIFY_MEMO.get(key)
+        if hit is None:
+            return None
+        _VERIFY_MEMO.move_to_end(key)
+        return dict(hit)
+
+
+def _verify_memo_put(key: tuple, result: dict) -> None:
+    if str((result or {}).get("verdict", "") or "") not in _LLM_VERDICTS:
+        return
+    with _VERIFY_MEMO_LOCK:
+        _VERIFY_MEMO[key] = dict(result)
+        _VERIFY_MEMO.move_to_end(key)
+        while len(_VERIFY_MEMO) > _VERIFY_MEMO_MAX:
+            _VERIFY_MEMO.popitem(last=False)
+
+
+class CiteCheckLLMCache:
+    """
+    Persistent cache of LLM verdicts, so re-runs (or minor whitespace edits) skip the API.
+
+    Keys are built from whitespace-normalized inputs (see `stable_text_key`) plus the LLM model name.
+    """
+
+    VERSION = 1
+
+    def __init__(self, *, cache_dir: str, model: str = ""):
+        self.model = (model or "").strip()
+        self.path = os.path.join(cache_dir, "citecheck_llm", f"{_hash_key(self.model or 'default')}.json")
+        self.items: Dict[str, dict] = {}
+        self._dirty = False
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    obj = json.load(f)
+                if isinstance(obj, dict) and int(obj.get("version", 0) or 0) == self.VERSION:
+                    items = obj.get("items", {})
+                    if isinstance(items, dict):
+                        self.items = items
+        except Exception:
+            self.items = {}
+
+    def key(self, *, citation_sentence: str, cited_author: str, cited_year: str, ref_title: str, evidence_text: str) -> str:
+        parts = [
+            stable_text_key(prefix="s", text=citation_sentence),
+            (cited_author or "").strip().lower(),
+            (cited_year or "").strip(),
+            stable_text_key(prefix="t", text=ref_title),
+            stable_text_key(prefix="e", text=(evidence_text or "")[:1200]),
+            self.model,
+        ]
+        return _hash_key("|".join(parts))
+
+    def get(self, key: str) -> Optional[dict]:
+        ent = self.items.get(str(key or ""), None)
+        if not isinstance(ent, dict):
+            return None
+        res = ent.get("result", None)
+        if not isinstance(res, dict) or str(res.get("verdict", "") or "") not in _LLM_VERDICTS:
+            return None
+        return dict(res)
+
+    def put(self, key: str, result: dict) -> None:
+        key = str(key or "")
+        if not key or not isinstance(result, dict):
+            return
+        if str(result.get("verdict", "") or "") not in _LLM_VERDICTS:
+            return
+        self.items[key] = {"result": dict(result), "updated_at": int(time.time())}
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": self.VERSION, "model": self.model, "items": self.items}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+_VERIFY_SYSTEM = "Return STRICT JSON only."
+_VERIFY_SYSTEM_TOKENS = approx_tokens(_VERIFY_SYSTEM)
+
+_VERIFY_PROMPT_TMPL = """验证学术引用准确性（白箱）。请只依据【相关段落】判断，不要编造。
+
+【引用句】\"{sentence}\"
+【被引文献】{author} ({year}), \"{title}\"
+
+【论文摘要区】{summary}
+
+【相关段落】
+{ev_text}
+
+【任务】
+1) 用一句话提炼【引用句】里的“被引用论点”（claim）。
+2) 判断：该论点是否真能从【相关段落】推出？
+3) 如不准确，给出一条“低风险改写”（suggested_fix），尽量保留原句语气/结构，避免新增事实；不确定时用更弱的表述。
+
+【输出 JSON】必须只输出一个 JSON 对象，字段如下：
+{{\"verdict\":\"X\",\"confidence\":0.9,\"claim\":\"...\",\"reason\":\"...\",\"suggested_fix\":\"...\"}}
+
+verdict 取值:
+- ACCURATE: 论文确实表达了引用所述观点
+- INACCURATE: 论点有偏差或曲解
+- MISATTRIBUTED: 观点存在但不是该作者的贡献
+- NOT_FOUND: 找不到支持依据
+
+输出要求:
+- 只输出 JSON（不要 Markdown / 代码块 / 多余文字）
+- claim ≤ 200 字符；suggested_fix ≤ 280 字符（ACCURATE 时可为空字符串）
+"""
+
+_VERIFY_RETRY_SUFFIX = "\n\n你上一次没有输出有效 JSON。请严格只输出一个 JSON 对象，必须包含 verdict/confidence/claim/reason/suggested_fix 五个字段，不要 Markdown/列表/多余文字。"
+_VERIFY_RETRY_SUFFIX_TOKENS = approx_tokens(_VERIFY_RETRY_SUFFIX)
+
+
 def verify_citation_with_llm(
     *,
     llm: OpenAICompatClient,
@@ -649,6 +1126,7 @@ def verify_citation_with_llm(
     evidence: Sequence[EvidenceParagraph],
     timeout_s: float = 90.0,
     budget: Optional[LLMBudget] = None,
+    cache: Optional[CiteCheckLLMCache] = None,
 ) -> dict:
     if not evidence:
         return {"verdict": "NOT_FOUND", "confidence": 0.0, "claim": "", "reason": "未找到相关段落", "suggested_fix": ""}
@@ -666,52 +1144,70 @@ def verify_citation_with_llm(
         if not s:
             return None
         if s.startswith("```"):
-            s = re.sub(r"^```(?:json)?\s*", "", s)
-            s = re.sub(r"\s*```$", "", s).strip()
+            s = s.removeprefix("```json").removeprefix("```").strip()
+            s = s.removesuffix("```").strip()
         try:
             obj = json.loads(s)
             return obj if isinstance(obj, dict) else None
         except Exception:
             pass
-        try:
-            start = s.find("{")
-            end = s.rfind("}")
-            if start >= 0 and end > start:
-                obj = json.loads(s[start : end + 1])
-                return obj if isinstance(obj, dict) else None
-        except Exception:
-            return None
+        # Single pass: try raw_decode at each "{" and stop at the first dict.
+        i = s.find("{")
+        while i >= 0:
+            try:
+                obj, _end = _JSON_DECODER.raw_decode(s, i)
+                if isinstance(obj, dict):
+                    return obj
+            except ValueError:
+                pass
+            i = s.find("{", i + 1)
         return None
 
     ev_text = "\n\n".join([f"[P{i+1}, Page {p.page}] {p.text[:400]}" for i, p in enumerate(list(evidence)[:3])])
-    prompt = f"""验证学术引用准确性（白箱）。请只依据【相关段落】判断，不要编造。
-
-【引用句】\"{(citation_sentence or '')[:320]}\"
-【被引文献】{cited_author} ({cited_year}), \"{(ref_title or '')[:120]}\"
-
-【论文摘要区】{(paper_summary or '')[:900]}
-
-【相关段落】
-{ev_text}
-
-【任务】
-1) 用一句话提炼【引用句】里的“被引用论点”（claim）。
-2) 判断：该论点是否真能从【相关段落】推出？
-3) 如不准确，给出一条“低风险改写”（suggested_fix），尽量保留原句语气/结构，避免新增事实；不确定时用更弱的表述。
-
-【输出 JSON】必须只输出一个 JSON 对象，字段如下：
-{{\"verdict\":\"X\",\"confidence\":0.9,\"claim\":\"...\",\"reason\":\"...\",\"suggested_fix\":\"...\"}}
-
-verdict 取值:
-- ACCURATE: 论文确实表达了引用所述观点
-- INACCURATE: 论点有偏差或曲解
-- MISATTRIBUTED: 观点存在但不是该作者的贡献
-- NOT_FOUND: 找不到支持依据
 
-输出要求:
-- 只输出 JSON（不要 Markdown / 代码块 / 多余文字）
-- claim ≤ 200 字符；suggested_fix ≤ 280 字符（ACCURATE 时可为空字符串）
-"""
+    try:
+        memo_model = str(getattr(getattr(llm, "cfg", None), "model", "") or "")
+    except Exception:
+        memo_model = ""
+    memo_key = _verify_memo_key(
+        model=memo_model,
+        citation_sentence=citation_sentence,
+        cited_author=cited_author,
+        cited_year=cited_year,
+        ref_title=ref_title,
+        evidence_text=ev_text,
+    )
+    memo_hit = _verify_memo_get(memo_key)
+    if memo_hit is not None:
+        return memo_hit
+
+    cache_key = ""
+    if cache is not None:
+        cache_key = cache.key(
+            citation_sentence=citation_sentence,
+            cited_author=cited_author,
+            cited_year=cited_year,
+            ref_title=ref_title,
+            evidence_text=ev_text,
+        )
+        hit = cache.get(cache_key)
+        if hit is not None:
+            if budget is not None and "citecheck_cache_hit" not in (budget.warnings or []):
+                budget.warnings.append("citecheck_cache_hit")
+            _verify_memo_put(memo_key, hit)
+            return hit
+
+    prompt = _VERIFY_PROMPT_TMPL.format_map(
+        {
+            "sentence": (citation_sentence or "")[:320],
+            "author": cited_author,
+            "year": cited_year,
+            "title": (ref_title or "")[:120],
+            "summary": (paper_summary or "")[:900],
+            "ev_text": ev_text,
+        }
+    )
+    prompt_tokens = _VERIFY_SYSTEM_TOKENS + approx_tokens(prompt)
 
     last_err = ""
     last_cleaned = ""
@@ -722,22 +1218,20 @@ verdict 取值:
     token_budget = [base, max(8192, base)]
     for attempt in range(2):
         prompt2 = prompt
+        pt = prompt_tokens
         if attempt >= 1:
-            prompt2 = (
-                prompt
-                + "\n\n你上一次没有输出有效 JSON。请严格只输出一个 JSON 对象，必须包含 verdict/confidence/claim/reason/suggested_fix 五个字段，不要 Markdown/列表/多余文字。"
-            )
+            prompt2 = prompt + _VERIFY_RETRY_SUFFIX
+            pt += _VERIFY_RETRY_SUFFIX_TOKENS
 
         max_tok = int(token_budget[min(attempt, len(token_budget) - 1)])
         if budget is not None:
-            pt = approx_tokens("Return STRICT JSON only.") + approx_tokens(prompt2)
             if budget.would_exceed_budget(approx_prompt_tokens=pt, max_completion_tokens=max_tok):
                 budget.warnings.append("budget_exceeded: citecheck llm skipped")
                 return {"verdict": "EVIDENCE_ONLY", "confidence": 0.0, "claim": "", "reason": "LLM 预算不足，跳过判定。", "suggested_fix": ""}
 
         status, resp = llm.chat(
             messages=[
-                {"role": "system", "content": "Return STRICT JSON only."},
+                {"role": "system", "content": _VERIFY_SYSTEM},
                 {"role": "user", "content": prompt2},
             ],
             temperature=0.0,
@@ -830,7 +1324,11 @@ verdict 取值:
                     reason = reason[:800] + "…"
                 if len(suggested_fix) > 320:
                     suggested_fix = suggested_fix[:320] + "…"
-                return {"verdict": verdict, "confidence": conf, "claim": claim, "reason": reason, "suggested_fix": suggested_fix}
+                out = {"verdict": verdict, "confidence": conf, "claim": claim, "reason": reason, "suggested_fix": suggested_fix}
+                _verify_memo_put(memo_key, out)
+                if cache is not None and cache_key:
+                    cache.put(cache_key, out)
+                return out
 
         # If the model started outputting JSON but it's clearly truncated, retry instead of
         # returning a half-parsed verdict/reason.
@@ -861,7 +1359,11 @@ verdict 取值:
         suggested_fix = fix_m.group(1) if fix_m else ""
 
         if verdict != "PARSE_ERROR":
-            return {"verdict": verdict, "confidence": conf, "claim": claim, "reason": reason, "suggested_fix": suggested_fix}
+            out = {"verdict": verdict, "confidence": conf, "claim": claim, "reason": reason, "suggested_fix": suggested_fix}
+            _verify_memo_put(memo_key, out)
+            if cache is not None and cache_key:
+                cache.put(cache_key, out)
+            return out
 
     if last_err:
         msg = last_err.strip()
@@ -871,7 +1373,157 @@ verdict 取值:
     return {"verdict": "PARSE_ERROR", "confidence": 0.5, "claim": "", "reason": (last_cleaned[:200] if last_cleaned else ""), "suggested_fix": ""}
 
 
+def _paper_summary(pdf_path: str) -> str:
+    """Title/abstract area (first two pages) of a matched PDF, used as LLM context."""
+    try:
+        pages = _read_pdf_pages(pdf_path, max_pages=2)
+        return ("\n".join((pages or [])[:2]) or "")[:2000]
+    except Exception:
+        return ""
+
+
+@dataclass(frozen=True)
+class _PairCtx:
+    """Per-(author, year) values the run loop needs, computed once instead of per citation pair."""
+
+    ref: Optional[ReferenceEntry]
+    ref_title: str
+    entry: str
+    rel: str
+    full: str
+    matched_name: str
+
+    @classmethod
+    def of(cls, resolved: Tuple[Optional[ReferenceEntry], str, Optional[dict]], papers_root: str) -> "_PairCtx":
+        ref, ref_title, picked = resolved
+        entry = str(ref.reference or "") if ref is not None else ""
+        if not picked:
+            return cls(ref=ref, ref_title=ref_title, entry=entry, rel="", full="", matched_name="")
+        rel = str(picked.get("rel", "") or "").replace("\\", "/")
+        full = os.path.normpath(os.path.join(papers_root, rel))
+        return cls(ref=ref, ref_title=ref_title, entry=entry, rel=rel, full=full, matched_name=os.path.basename(full))
+
+
+_REPORT_STEPS = 100
+_REPORT_MIN_INTERVAL_S = 0.25
+
+
+def _throttled_report(
+    progress_cb: Optional[Callable[[str, int, int, str], None]],
+) -> Callable[..., None]:
+    """
+    Wrap a (stage, done, total, detail) progress callback so each stage emits ~100 updates at most.
+
+    Stage start/end and indeterminate (total <= 0) updates always go through; in between an update
+    is sent every total/100 items or after 0.25s of silence.
+    """
+    last: Dict[str, Tuple[int, float]] = {}
+
+    def report(stage: str, done: int, total: int, detail: str = "") -> None:
+        if not callable(progress_cb):
+            return
+        done = int(done or 0)
+        total = int(total or 0)
+        now = time.monotonic()
+        if total > 0 and 0 < done < total and stage in last:
+            last_done, last_t = last[stage]
+            step = max(1, total // _REPORT_STEPS)
+            # done going backwards means the stage restarted (e.g. the next PDF); let that through.
+            if last_done <= done < last_done + step and now - last_t < _REPORT_MIN_INTERVAL_S:
+                return
+        last[stage] = (done, now)
+        try:
+            progress_cb(stage, done, total, str(detail or ""))
+        except Exception:
+            pass
+
+    return report
+
+
+class _ReferenceLookup:
+    """Per-document memo of (author, year) -> ReferenceEntry matches and reference titles."""
+
+    def __init__(self, references: Sequence[ReferenceEntry]):
+        self.refs_by_year = group_references_by_year(references)
+        self._matches: Dict[Tuple[str, str], Optional[ReferenceEntry]] = {}
+        self._titles: Dict[int, str] = {}
+
+    def match(self, author: str, year: str) -> Optional[ReferenceEntry]:
+        key = (author, year)
+        if key not in self._matches:
+            self._matches[key] = match_reference_entry(cited_author=author, cited_year=year, references=self.refs_by_year)
+        return self._matches[key]
+
+    def cited_keys(self, citations: Sequence[CitationSentenceRecord]) -> set[tuple[str, str]]:
+        """(authors, year) keys of the References entries that in-text citations resolve to."""
+        # Each distinct (author, year) is matched once, however often it is cited.
+        pairs = {
+            ((c.get("authors", "") or "").strip(), (c.get("year", "") or "").strip())
+            for rec in citations
+            for c in rec.citations
+        }
+        match = self.match
+        out: set[tuple[str, str]] = set()
+        for a, y in pairs:
+            if not a or not y:
+                continue
+            ref = match(a, y)
+            if ref is not None:
+                key = ((ref.authors or "").strip(), (ref.year or "").strip())
+                if key[0] and key[1]:
+                    out.add(key)
+        return out
+
+    def title(self, ref: Optional[ReferenceEntry]) -> str:
+        if ref is None:
+            return ""
+        # Entries live as long as the lookup (it holds them via refs_by_year), so id() is stable.
+        k = id(ref)
+        if k not in self._titles:
+            self._titles[k] = extract_reference_title(ref.reference)
+        return self._titles[k]
+
+
+def _resolve_cited_papers(
+    *,
+    title_index: PapersTitleIndex,
+    ref_lookup: _ReferenceLookup,
+    targets: Sequence[Tuple[str, str]],
+    title_match_threshold: float,
+    embed_texts: Optional[Callable[[List[str]], "np.ndarray"]] = None,
+) -> Dict[Tuple[str, str], Tuple[Optional[ReferenceEntry], str, Optional[dict]]]:
+    """Map (author, year) -> (reference entry, ref title, matched PDF entry); title lookups are batched."""
+    out: Dict[Tuple[str, str], Tuple[Optional[ReferenceEntry], str, Optional[dict]]] = {}
+    need_title: List[Tuple[str, str]] = []
+    for key in targets:
+        if key in out:
+            continue
+        author, year = key
+        ref = ref_lookup.match(author, year)
+        ref_title = ref_lookup.title(ref)
+        picked = title_index.find_by_author_year(author, year)
+        out[key] = (ref, ref_title, picked or None)
+        if not picked and ref_title and ref is not None:
+            need_title.append(key)
+    if need_title:
+        found = title_index.find_by_title_batch(
+            [(out[k][1], out[k][0].authors or "") for k in need_title],
+            threshold=title_match_threshold,
+            embed_texts=embed_texts,
+        )
+        for key, picked in zip(need_title, found):
+            if picked:
+                out[key] = (out[key][0], out[key][1], picked)
+    return out
+
+
 class CiteCheckRunner:
+    # Built title indexes shared by runners in this process (find_missing_papers -> run reuses one);
+    # LRU-bounded since each holds a papers library's vectors.
+    _title_index_cache: "OrderedDict[str, PapersTitleIndex]" = OrderedDict()
+    _title_index_lock = threading.Lock()
+    _TITLE_INDEX_CACHE_MAX = 4
+
     def __init__(self, *, data_dir: str, embed_texts: Callable[[List[str]], "np.ndarray"], model_fingerprint: dict):
         if np is None:
             raise CiteCheckError("numpy is required")
@@ -880,6 +1532,28 @@ class CiteCheckRunner:
         self.model_fingerprint = model_fingerprint or {}
         self.cache_dir = os.path.join(data_dir, "citecheck", "cache")
 
+    def _title_index(self, papers_root: str) -> PapersTitleIndex:
+        fp = json.dumps(self.model_fingerprint or {}, sort_keys=True, ensure_ascii=False)
+        key = _hash_key("\n".join([os.path.abspath(self.cache_dir), os.path.abspath(papers_root), fp]))
+        cls = type(self)
+        with cls._title_index_lock:
+            idx = cls._title_index_cache.get(key)
+            if idx is None:
+                idx = PapersTitleIndex(
+                    cache_dir=self.cache_dir,
+                    papers_root=papers_root,
+                    embed_texts=self.embed_texts,
+                    model_fingerprint=self.model_fingerprint,
+                )
+                cls._title_index_cache[key] = idx
+                while len(cls._title_index_cache) > cls._TITLE_INDEX_CACHE_MAX:
+                    cls._title_index_cache.popitem(last=False)
+            else:
+                cls._title_index_cache.move_to_end(key)
+        # build() still checks file signatures, so a reused index picks up added/changed PDFs.
+        # Callers pass their own embedder per call; the shared index is never rebound to it.
+        return idx
+
     def find_missing_papers(
         self,
         *,
@@ -902,12 +1576,7 @@ class CiteCheckRunner:
         main_pdf_path = os.path.abspath(main_pdf_path)
         papers_root = os.path.abspath(papers_root)
 
-        def report(stage: str, done: int, total: int, detail: str = ""):
-            if callable(progress_cb):
-                try:
-                    progress_cb(stage, int(done or 0), int(total or 0), str(detail or ""))
-                except Exception:
-                    pass
+        report = _throttled_report(progress_cb)
 
         def canceled() -> bool:
             try:
@@ -915,23 +1584,13 @@ class CiteCheckRunner:
             except Exception:
                 return False
 
-        pages = load_pdf_pages(Path(main_pdf_path))
+        pages = _read_pdf_pages(main_pdf_path)
         citations = list(iter_citation_sentences_from_pages(pages, pdf_label=os.path.basename(main_pdf_path), stop_at_references=True))
         references = list(iter_reference_entries_from_pages(pages, pdf_label=os.path.basename(main_pdf_path)))
+        ref_lookup = _ReferenceLookup(references)
 
-        cited_ref_keys: set[tuple[str, str]] = set()
         # Map in-text citations to References entries (surname-only citations are common).
-        for rec in citations:
-            for c in rec.citations:
-                a = (c.get("authors", "") or "").strip()
-                y = (c.get("year", "") or "").strip()
-                if not a or not y:
-                    continue
-                ref = match_reference_entry(cited_author=a, cited_year=y, references=references)
-                if ref is not None:
-                    key = ((ref.authors or "").strip(), (ref.year or "").strip())
-                    if key[0] and key[1]:
-                        cited_ref_keys.add(key)
+        cited_ref_keys = ref_lookup.cited_keys(citations)
 
         targets: List[tuple[str, str]] = []
         if only_cited:
@@ -948,37 +1607,47 @@ class CiteCheckRunner:
             targets = targets[: int(max_items)]
 
         report("papers_index", 0, 1, "索引参考文献原文 PDF…")
-        title_index = PapersTitleIndex(
-            cache_dir=self.cache_dir,
-            papers_root=papers_root,
+        title_index = self._title_index(papers_root)
+        title_index.build(
+            progress_cb=lambda d, t, detail: report("papers_index", d, t, f"读取标题 · {detail}"),
+            cancel_cb=canceled,
             embed_texts=self.embed_texts,
-            model_fingerprint=self.model_fingerprint,
         )
-        title_index.build(progress_cb=lambda d, t, detail: report("papers_index", d, t, f"读取标题 · {detail}"), cancel_cb=canceled)
         report("papers_index", int(len(title_index.entries)), int(len(title_index.entries)), f"已索引 {len(title_index.entries)} 篇 PDF")
 
         missing: List[dict] = []
         report("missing_scan", 0, len(targets), "扫描缺失原文…")
 
+        resolved = _resolve_cited_papers(
+            title_index=title_index,
+            ref_lookup=ref_lookup,
+            targets=targets,
+            title_match_threshold=cfg.title_match_threshold,
+            embed_texts=self.embed_texts,
+        )
+        unmatched = [key for key in targets if not resolved[key][2]]
+        suggestions = dict(
+            zip(
+                unmatched,
+                title_index.search_batch(
+                    [resolved[k][1] or f"{k[0]} {k[1]}" for k in unmatched], top_k=3, embed_texts=self.embed_texts
+                ),
+            )
+        )
+
         for idx, (author, year) in enumerate(targets, start=1):
             if canceled():
                 break
 
-            ref = match_reference_entry(cited_author=author, cited_year=year, references=references)
+            ref, ref_title, picked = resolved[(author, year)]
             ref_missing = ref is None
-            ref_title = extract_reference_title(ref.reference) if ref is not None else ""
             entry = str(ref.reference or "") if ref is not None else ""
 
-            picked = title_index.find_by_author_year(author, year)
-            if not picked and ref_title and ref is not None:
-                picked = title_index.find_by_title(ref_title, ref.authors or "", threshold=cfg.title_match_threshold)
-
             if picked:
                 report("missing_scan", idx, len(targets), f"已匹配 · {author} ({year})")
                 continue
 
-            query = ref_title or f"{author} {year}"
-            candidates0 = title_index.search(query, top_k=3)
+            candidates0 = suggestions.get((author, year), [])
             candidates = []
             for c in candidates0:
                 try:
@@ -1039,12 +1708,7 @@ class CiteCheckRunner:
         papers_root = os.path.abspath(papers_root)
         library_pdf_root = os.path.abspath(library_pdf_root)
 
-        def report(stage: str, done: int, total: int, detail: str = ""):
-            if callable(progress_cb):
-                try:
-                    progress_cb(stage, int(done or 0), int(total or 0), str(detail or ""))
-                except Exception:
-                    pass
+        report = _throttled_report(progress_cb)
 
         def canceled() -> bool:
             try:
@@ -1052,23 +1716,13 @@ class CiteCheckRunner:
             except Exception:
                 return False
 
-        pages = load_pdf_pages(Path(main_pdf_path))
+        pages = _read_pdf_pages(main_pdf_path)
         citations = list(iter_citation_sentences_from_pages(pages, pdf_label=os.path.basename(main_pdf_path), stop_at_references=True))
         references = list(iter_reference_entries_from_pages(pages, pdf_label=os.path.basename(main_pdf_path)))
+        ref_lookup = _ReferenceLookup(references)
 
-        cited_ref_keys: set[tuple[str, str]] = set()
         # Map in-text citations to References entries (surname-only citations are common).
-        for rec in citations:
-            for c in rec.citations:
-                a = (c.get("authors", "") or "").strip()
-                y = (c.get("year", "") or "").strip()
-                if not a or not y:
-                    continue
-                ref = match_reference_entry(cited_author=a, cited_year=y, references=references)
-                if ref is not None:
-                    key = ((ref.authors or "").strip(), (ref.year or "").strip())
-                    if key[0] and key[1]:
-                        cited_ref_keys.add(key)
+        cited_ref_keys = ref_lookup.cited_keys(citations)
 
         uncited_refs: List[dict] = []
         for r in references:
@@ -1082,53 +1736,47 @@ class CiteCheckRunner:
                         "index": int(r.index or 0),
                         "authors": r.authors,
                         "year": r.year,
-                        "title": extract_reference_title(r.reference),
+                        "title": ref_lookup.title(r),
                         "reference": r.reference,
                     }
                 )
 
         report("papers_index", 0, 1, "索引参考文献 PDF（标题匹配）…")
-        title_index = PapersTitleIndex(
-            cache_dir=self.cache_dir,
-            papers_root=papers_root,
-            embed_texts=self.embed_texts,
-            model_fingerprint=self.model_fingerprint,
-        )
+        title_index = self._title_index(papers_root)
         title_index.build(
             progress_cb=lambda d, t, detail: report("papers_index", d, t, f"读取标题 · {detail}"),
             cancel_cb=canceled,
+            embed_texts=self.embed_texts,
         )
         report("papers_index", int(len(title_index.entries)), int(len(title_index.entries)), f"已索引 {len(title_index.entries)} 篇 PDF")
 
         pairs: List[Tuple[int, str, dict]] = []
+        # (author, year) per pair, stripped once; pairs missing either are skipped in the loop.
+        pair_ay: List[Tuple[str, str]] = []
         for rec in citations:
             sent = (rec.sentence or "").strip()
+            page0 = int(rec.page or 0)
             for c in rec.citations:
-                pairs.append((int(rec.page or 0), sent, dict(c)))
+                pairs.append((page0, sent, dict(c)))
+                pair_ay.append(((c.get("authors", "") or "").strip(), (c.get("year", "") or "").strip()))
+        pair_cov_keys: List[str] = []
+        if coverage is not None:
+            # One stable key per pair, reused for ordering, the unseen filter and mark_seen.
+            pair_cov_keys = [
+                stable_text_key(prefix="cc", page=page0, text=str(sent0 or ""), extra=f"{a0}|{y0}")
+                for (page0, sent0, _c0), (a0, y0) in zip(pairs, pair_ay)
+            ]
         if coverage is not None and pairs:
-            scored_pairs: List[Tuple[int, int, int, str, Tuple[int, str, dict]]] = []
-            for i0, (page0, sent0, cite0) in enumerate(pairs):
-                a0 = (cite0.get("authors", "") or "").strip()
-                y0 = (cite0.get("year", "") or "").strip()
-                sk = stable_text_key(prefix="cc", page=int(page0 or 0), text=str(sent0 or ""), extra=f"{a0}|{y0}")
-                seen = int(coverage.seen_count("citecheck", sk))
-                page_seen = int(coverage.page_seen_count("citecheck", int(page0 or 0)))
-                scored_pairs.append((0 if seen <= 0 else 1, page_seen, i0, sk, (page0, sent0, cite0)))
-            scored_pairs.sort(key=lambda t: (int(t[0]), int(t[1]), int(t[2])))
-            pairs = [p for _a, _b, _c, _sk, p in scored_pairs]
-
-            # Strictly avoid repeating the same unchanged cite-check pair across iterations.
-            unseen_pairs: List[Tuple[int, str, dict]] = []
-            for page0, sent0, cite0 in pairs:
-                a0 = (cite0.get("authors", "") or "").strip()
-                y0 = (cite0.get("year", "") or "").strip()
-                if not a0 or not y0:
-                    continue
-                sk = stable_text_key(prefix="cc", page=int(page0 or 0), text=str(sent0 or ""), extra=f"{a0}|{y0}")
-                if int(coverage.seen_count("citecheck", sk)) <= 0:
-                    unseen_pairs.append((page0, sent0, cite0))
-            if unseen_pairs:
-                pairs = unseen_pairs
+            # Strictly avoid repeating the same unchanged cite-check pair across iterations:
+            # keep unseen pairs with an author and year, least-covered pages first.
+            seen = coverage.seen_counts("citecheck", pair_cov_keys)
+            keep = [i for i, (a0, y0) in enumerate(pair_ay) if int(seen[i]) <= 0 and a0 and y0]
+            if keep:
+                page_seen = np.asarray(coverage.page_seen_counts("citecheck", [pairs[i][0] for i in keep]), dtype=np.int64)
+                keep = [keep[int(j)] for j in np.lexsort((np.asarray(keep), page_seen))]
+                pairs = [pairs[i] for i in keep]
+                pair_cov_keys = [pair_cov_keys[i] for i in keep]
+                pair_ay = [pair_ay[i] for i in keep]
             else:
                 return {
                     "meta": {
@@ -1149,34 +1797,100 @@ class CiteCheckRunner:
 
         if cfg.max_pairs and len(pairs) > int(cfg.max_pairs):
             pairs = pairs[: int(cfg.max_pairs)]
+            pair_cov_keys = pair_cov_keys[: int(cfg.max_pairs)]
+            pair_ay = pair_ay[: int(cfg.max_pairs)]
 
         items: List[CiteCheckItem] = []
         report("checking", 0, len(pairs), "开始核查…")
 
+        pair_keys = [key for key in pair_ay if key[0] and key[1]]
+        resolved = _resolve_cited_papers(
+            title_index=title_index,
+            ref_lookup=ref_lookup,
+            targets=pair_keys,
+            title_match_threshold=cfg.title_match_threshold,
+            embed_texts=self.embed_texts,
+        )
+        pair_ctx = {key: _PairCtx.of(resolved[key], papers_root) for key in resolved}
+
         para_cache: Dict[str, ParagraphIndex] = {}
+        summary_cache: Dict[str, str] = {}
+        unique_fulls = list(dict.fromkeys(pair_ctx[key].full for key in pair_keys if pair_ctx[key].full))
+
+        if len(unique_fulls) > 1 and not canceled():
+            # Pre-build paragraph indexes for all matched PDFs: cache loads and paragraph
+            # extraction run concurrently, then every uncached paragraph is embedded in a few
+            # large batches instead of one embed call per PDF.
+            def prepare_one(full0: str) -> Tuple[ParagraphIndex, Optional[List[dict]]]:
+                summary_cache[full0] = _paper_summary(full0)
+                pi0 = ParagraphIndex(cache_dir=self.cache_dir, pdf_path=full0, embed_texts=self.embed_texts, model_fingerprint=self.model_fingerprint)
+                if pi0._load_cache():
+                    return pi0, None
+                return pi0, pi0._collect_paragraphs(cancel_cb=canceled)
+
+            report("para", 0, len(unique_fulls), "抽取原文段落…")
+            pending: List[Tuple[str, ParagraphIndex, List[dict]]] = []
+            workers = max(1, min(len(unique_fulls), os.cpu_count() or 1, 8))
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                futs = {ex.submit(prepare_one, f0): f0 for f0 in unique_fulls}
+                for done_n, fut in enumerate(as_completed(futs), start=1):
+                    f0 = futs[fut]
+                    try:
+                        pi0, paras0 = fut.result()
+                    except Exception:
+                        # Fall back to a lazy build (and its error reporting) in the main loop.
+                        continue
+                    finally:
+                        report("para", done_n, len(unique_fulls), f"抽取原文段落 · {os.path.basename(f0)}")
+                    if paras0 is None:
+                        para_cache[f0] = pi0
+                    else:
+                        pending.append((f0, pi0, paras0))
+
+            order = {f: i for i, f in enumerate(unique_fulls)}
+            pending.sort(key=lambda t: order[t[0]])
+            all_texts = [p["text"] for _f0, _pi0, paras0 in pending for p in paras0]
+            if all_texts and not canceled():
+                try:
+                    report("para", 0, len(all_texts), f"向量化原文段落 · {len(all_texts)} 段")
+                    parts = [np.asarray(self.embed_texts(all_texts[i : i + _EMBED_BATCH])) for i in range(0, len(all_texts), _EMBED_BATCH)]
+                    all_vecs = np.concatenate(parts, axis=0) if len(parts) > 1 else parts[0]
+                    off = 0
+                    for f0, pi0, paras0 in pending:
+                        n0 = len(paras0)
+                        pi0._finish_build(paras0, all_vecs[off : off + n0] if n0 else None)
+                        off += n0
+                        para_cache[f0] = pi0
+                except Exception as e:
+                    # PDFs left out of para_cache are built (and fail visibly) one by one in the main loop.
+                    report("para", 0, 0, f"批量向量化失败，逐篇重试 · {str(e)[:200]}")
+            else:
+                for f0, pi0, paras0 in pending:
+                    if not paras0:
+                        try:
+                            pi0._finish_build(paras0, None)
+                            para_cache[f0] = pi0
+                        except Exception:
+                            pass
+
+        llm_cache: Optional[CiteCheckLLMCache] = None
+        if cfg.use_llm and llm is not None:
+            llm_cache = CiteCheckLLMCache(cache_dir=self.cache_dir, model=str(getattr(getattr(llm, "cfg", None), "model", "") or ""))
 
         for idx, (page_in_main, sentence, cite) in enumerate(pairs, start=1):
             if canceled():
                 break
 
-            author = (cite.get("authors", "") or "").strip()
-            year = (cite.get("year", "") or "").strip()
+            author, year = pair_ay[idx - 1]
             if not author or not year:
                 continue
-            cov_key = ""
-            if coverage is not None:
-                cov_key = stable_text_key(prefix="cc", page=int(page_in_main or 0), text=str(sentence or ""), extra=f"{author}|{year}")
+            cov_key = pair_cov_keys[idx - 1] if coverage is not None else ""
 
-            ref = match_reference_entry(cited_author=author, cited_year=year, references=references)
-            ref_missing = ref is None
-            ref_title = extract_reference_title(ref.reference) if ref is not None else ""
-            entry = str(ref.reference or "") if ref is not None else ""
-
-            picked = title_index.find_by_author_year(author, year)
-            if not picked and ref_title and ref is not None:
-                picked = title_index.find_by_title(ref_title, ref.authors or "", threshold=cfg.title_match_threshold)
+            ctx = pair_ctx[(author, year)]
+            ref_title, entry = ctx.ref_title, ctx.entry
+            ref_missing = ctx.ref is None
 
-            if not picked:
+            if not ctx.full:
                 if ref_missing:
                     verdict = "REF_NOT_FOUND"
                     reason = "参考文献列表中未找到对应条目，且未在当前库中找到包含作者/年份的原文 PDF（可能 References 缺失/格式不标准）"
@@ -1207,9 +1921,7 @@ class CiteCheckRunner:
                 report("checking", idx, len(pairs), f"{verdict} · {author} ({year})")
                 continue
 
-            rel = str(picked.get("rel", "") or "").replace("\\", "/")
-            full = os.path.normpath(os.path.join(papers_root, rel))
-            matched_name = os.path.basename(full)
+            rel, full, matched_name = ctx.rel, ctx.full, ctx.matched_name
 
             pi = para_cache.get(full)
             if pi is None:
@@ -1219,13 +1931,10 @@ class CiteCheckRunner:
                 para_cache[full] = pi
 
             evidence = pi.search(sentence, top_k=int(cfg.paragraph_top_k or 5))
-            paper_summary = ""
-            try:
-                pages2 = load_pdf_pages(Path(full), max_pages=2)
-                head = "\n".join((pages2 or [])[:2])
-                paper_summary = (head or "")[:2000]
-            except Exception:
-                paper_summary = ""
+            paper_summary = summary_cache.get(full)
+            if paper_summary is None:
+                paper_summary = _paper_summary(full)
+                summary_cache[full] = paper_summary
 
             verdict = "EVIDENCE_ONLY"
             confidence = 0.0
@@ -1236,7 +1945,13 @@ class CiteCheckRunner:
             reason_prefix = ""
             if ref_missing:
                 reason_prefix = "注意：你的 References 中未找到该条目（可能缺失/格式不标准）。以下判定基于库中疑似原文证据。"
-            if cfg.use_llm and llm is not None:
+            top_score = max((float(e.score or 0.0) for e in (evidence or [])), default=0.0)
+            if cfg.use_llm and llm is not None and top_score < float(cfg.min_evidence_score or 0.0):
+                # Nothing in the PDF resembles the sentence; the LLM would only answer NOT_FOUND.
+                verdict = "NO_EVIDENCE"
+                confidence = max(0.0, top_score)
+                reason = (reason_prefix + " 段落检索无高置信证据（未调用大模型）。").strip()
+            elif cfg.use_llm and llm is not None:
                 report("llm", idx, len(pairs), f"LLM 判定 · {author} ({year})")
                 v = verify_citation_with_llm(
                     llm=llm,
@@ -1248,6 +1963,7 @@ class CiteCheckRunner:
                     evidence=evidence,
                     timeout_s=float(cfg.llm_timeout_s or 90.0),
                     budget=budget,
+                    cache=llm_cache,
                 )
                 verdict = str(v.get("verdict", "") or "").strip() or verdict
                 try:
@@ -1289,6 +2005,12 @@ class CiteCheckRunner:
 
             report("checking", idx, len(pairs), f"{verdict} · {author} ({year})")
 
+        if llm_cache is not None:
+            try:
+                llm_cache.save()
+            except Exception:
+                pass
+
         counts: Dict[str, int] = {}
         for it in items:
             counts[it.verdict] = counts.get(it.verdict, 0) + 1
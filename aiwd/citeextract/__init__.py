@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
-from .pipeline import CitationSentenceRecord, iter_citation_sentences, iter_citation_sentences_from_pages, load_pdf_pages
+from .pipeline import (
+    CitationSentenceRecord,
+    iter_citation_sentence_dicts_from_pages,
+    iter_citation_sentences,
+    iter_citation_sentences_from_pages,
+    iter_citation_sentences_parallel,
+    load_pdf_pages,
+)
 from .references import ReferenceEntry, iter_reference_entries_from_pages
 
 __all__ = [
     "CitationSentenceRecord",
     "ReferenceEntry",
+    "iter_citation_sentence_dicts_from_pages",
     "iter_citation_sentences",
     "iter_citation_sentences_from_pages",
+    "iter_citation_sentences_parallel",
     "iter_reference_entries_from_pages",
     "load_pdf_pages",
 ]
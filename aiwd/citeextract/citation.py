@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import functools
 import re
-from dataclasses import asdict, dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
 
 YEAR_PATTERN = r"(?:18|19|20)\d{2}[a-zA-Z]?"
@@ -26,6 +27,14 @@ _NARRATIVE_RE = re.compile(
 _PAREN_EXCLUDE_RE = re.compile(r"(?i)^\s*(?:fig|figure|table|eq|equation|appendix|section|sec|chap|chapter)\b")
 _NARRATIVE_EXCLUDE_HEAD = {"fig", "figure", "table", "eq", "equation", "appendix", "section", "sec", "chap", "chapter", "panel"}
 
+_PAREN_SPLIT_RE = re.compile(r"\s*[;；]\s*")
+_PAREN_AUTHORS_RE = re.compile(r"^(?P<authors>[^,，]{2,120})\s*[,，]\s*(?P<rest>.*)$")
+_PREFIX_STRIP_RE = re.compile(r"(?i)^\s*(?:see|e\.g\.|i\.e\.|cf\.|for example|e\.g\.,|i\.e\.,)\s*")
+_YEAR_LETTER_RUN_RE = re.compile(
+    rf"\b((?:18|19|20)\d{{2}})([a-zA-Z])\b\s*(?:,|;)\s*([a-zA-Z](?:\s*(?:,|;)\s*[a-zA-Z])*)"
+)
+_LETTER_RE = re.compile(r"[a-zA-Z]")
+
 _CJK_AUTH_TOKEN = r"[\u4e00-\u9fff]{1,8}"
 _CJK_AUTHORS_PATTERN = rf"{_CJK_AUTH_TOKEN}(?:\s*[、,，]\s*{_CJK_AUTH_TOKEN})*(?:\s*(?:等|等人))?"
 _CJK_NARRATIVE_RE = re.compile(
@@ -41,12 +50,15 @@ class Citation:
     raw: str
 
     def to_dict(self) -> Dict[str, str]:
-        return asdict(self)
+        return {"kind": self.kind, "authors": self.authors, "year": self.year, "raw": self.raw}
 
 
 def find_citations(sentence: str) -> List[Citation]:
     if not sentence:
         return []
+    # Every citation form carries a year; most sentences have none, so skip all passes.
+    if not YEAR_RE.search(sentence):
+        return []
 
     citations: List[Citation] = []
 
@@ -79,7 +91,7 @@ def find_citations(sentence: str) -> List[Citation]:
 
 
 def _parse_parenthetical(inner: str, *, raw: str) -> List[Citation]:
-    parts = re.split(r"\s*[;；]\s*", inner)
+    parts = _PAREN_SPLIT_RE.split(inner)
     out: List[Citation] = []
     last_authors: Optional[str] = None
     for part in parts:
@@ -87,7 +99,7 @@ def _parse_parenthetical(inner: str, *, raw: str) -> List[Citation]:
         if not part:
             continue
 
-        m = re.match(r"^(?P<authors>[^,，]{2,120})\s*[,，]\s*(?P<rest>.*)$", part)
+        m = _PAREN_AUTHORS_RE.match(part)
         if m:
             authors = (m.group("authors") or "").strip()
             years = _extract_years(m.group("rest") or "")
@@ -108,33 +120,28 @@ def _parse_parenthetical(inner: str, *, raw: str) -> List[Citation]:
 def _strip_prefixes(s: str) -> str:
     if not s:
         return ""
-    s = re.sub(r"(?i)^\s*(?:see|e\.g\.|i\.e\.|cf\.|for example|e\.g\.,|i\.e\.,)\s*", "", s)
+    s = _PREFIX_STRIP_RE.sub("", s)
     return s.strip()
 
 
 def _extract_years(s: str) -> List[str]:
     if not s:
         return []
+    return list(_extract_years_cached(s))
 
-    years: List[str] = []
-    for token in YEAR_RE.findall(s):
-        years.append(token)
 
-    for m in re.finditer(
-        rf"\b((?:18|19|20)\d{{2}})([a-zA-Z])\b\s*(?:,|;)\s*([a-zA-Z](?:\s*(?:,|;)\s*[a-zA-Z])*)",
-        s,
-    ):
+@functools.lru_cache(maxsize=4096)
+def _extract_years_cached(s: str) -> Tuple[str, ...]:
+    # Year groups ("2020", "2019a, b", "Smith, 2020") repeat heavily across a paper.
+    years: List[str] = YEAR_RE.findall(s)
+    if not years:
+        return ()
+
+    for m in _YEAR_LETTER_RUN_RE.finditer(s):
         base = m.group(1)
-        letters = [m.group(2)] + re.findall(r"[a-zA-Z]", m.group(3) or "")
+        letters = [m.group(2)] + _LETTER_RE.findall(m.group(3) or "")
         for letter in letters:
             years.append(base + letter)
 
-    seen = set()
-    out: List[str] = []
-    for y in years:
-        y = (y or "").strip()
-        if not y or y in seen:
-            continue
-        seen.add(y)
-        out.append(y)
-    return out
+    # Ordered de-duplication.
+    return tuple(dict.fromkeys(y for y in (t.strip() for t in years) if y))
@@ -1,10 +1,30 @@
 from __future__ import annotations
 
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Pages with many blocks (dense layouts, tables) sort faster with a vectorized lexsort.
+_LEXSORT_MIN_BLOCKS = 64
+
+# Below this many pages the serial path is faster than fanning out to workers.
+_PARALLEL_MIN_PAGES = 8
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
 
 
 def extract_pdf_pages(pdf_path: Path, *, max_pages: Optional[int] = None) -> List[str]:
+    return list(iter_pdf_pages(pdf_path, max_pages=max_pages))
+
+
+def iter_pdf_pages(pdf_path: Path, *, max_pages: Optional[int] = None) -> Iterator[str]:
+    """Yield page texts one at a time; the document stays open until the generator is exhausted or closed."""
     try:
         import fitz  # PyMuPDF
     except Exception as exc:  # pragma: no cover
@@ -13,14 +33,108 @@ def extract_pdf_pages(pdf_path: Path, *, max_pages: Optional[int] = None) -> Lis
     pdf_path = Path(pdf_path)
     doc = fitz.open(str(pdf_path))
     try:
-        pages: List[str] = []
         for page_index, page in enumerate(doc, start=1):
             if max_pages is not None and page_index > int(max_pages):
                 break
-            pages.append(_extract_page_text_blocks(page, fitz))
-        return pages
+            yield _extract_page_text_blocks(page, fitz)
+    finally:
+        doc.close()
+
+
+def _env_pdf_workers() -> Optional[int]:
+    raw = (os.environ.get("TOPHUMANWRITING_PDF_WORKERS", "") or "").strip()
+    if raw:
+        try:
+            return max(1, int(raw))
+        except Exception:
+            pass
+    return None
+
+
+def _default_pdf_workers() -> int:
+    n = _env_pdf_workers()
+    return n if n is not None else max(1, min(4, os.cpu_count() or 1))
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        # Grow only: a smaller request reuses the bigger pool rather than replacing it under another caller.
+        if _POOL is None or _POOL_WORKERS < int(workers):
+            if _POOL is not None:
+                _POOL.shutdown(wait=False)
+            _POOL = ProcessPoolExecutor(max_workers=int(workers))
+            _POOL_WORKERS = int(workers)
+        return _POOL
+
+
+def _reset_pool(pool: Optional[ProcessPoolExecutor] = None) -> None:
+    """Drop the shared pool; with `pool`, only if it is still the current one."""
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or (pool is not None and pool is not _POOL):
+            return
+        try:
+            _POOL.shutdown(wait=False)
+        except Exception:
+            pass
+        _POOL = None
+        _POOL_WORKERS = 0
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> Tuple[int, List[str]]:
+    import fitz  # PyMuPDF
+
+    doc = fitz.open(pdf_path)
+    try:
+        return start, [_extract_page_text_blocks(doc.load_page(i), fitz) for i in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def extract_pdf_pages_parallel(
+    pdf_path: Path,
+    *,
+    max_pages: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Same output as `extract_pdf_pages`, but splits the page range across worker processes.
+
+    PyMuPDF documents cannot be shared between threads, so each worker opens its own copy.
+    Small documents (and any pool failure) use the serial path.
+    """
+    n_workers = int(workers) if workers is not None else _default_pdf_workers()
+    if n_workers <= 1 or (max_pages is not None and int(max_pages) < _PARALLEL_MIN_PAGES):
+        return extract_pdf_pages(pdf_path, max_pages=max_pages)
+    try:
+        import fitz  # PyMuPDF
+    except Exception as exc:  # pragma: no cover
+        raise RuntimeError("PyMuPDF is required. Install with: pip install PyMuPDF") from exc
+
+    pdf_path = Path(pdf_path)
+    doc = fitz.open(str(pdf_path))
+    try:
+        n = int(doc.page_count)
     finally:
         doc.close()
+    if max_pages is not None:
+        n = min(n, int(max_pages))
+    if n < _PARALLEL_MIN_PAGES:
+        return extract_pdf_pages(pdf_path, max_pages=max_pages)
+
+    n_workers = min(n_workers, n)
+    step = (n + n_workers - 1) // n_workers
+    ex = None
+    try:
+        ex = _get_pool(n_workers)
+        futs = [ex.submit(_extract_page_range, str(pdf_path), a, min(n, a + step)) for a in range(0, n, step)]
+        parts = sorted(f.result() for f in futs)
+    except Exception:
+        # Broken pool, or a spawn-based platform where worker bootstrap failed.
+        _reset_pool(ex)
+        return extract_pdf_pages(pdf_path, max_pages=max_pages)
+    return [t for _start, texts in parts for t in texts]
 
 
 def _extract_page_text_blocks(page, fitz_module) -> str:
@@ -30,8 +144,12 @@ def _extract_page_text_blocks(page, fitz_module) -> str:
     except Exception:
         flags = 0
 
-    blocks = page.get_text("blocks", flags=flags) or []
-    text_blocks = []
+    # Build the text page once and hand it to get_text so MuPDF does not re-parse the page.
+    tp = page.get_textpage(flags=flags)
+    blocks = page.get_text("blocks", textpage=tp) or []
+    ys: List[float] = []
+    xs: List[float] = []
+    texts: List[str] = []
     for block in blocks:
         if not isinstance(block, (list, tuple)) or len(block) < 5:
             continue
@@ -48,10 +166,16 @@ def _extract_page_text_blocks(page, fitz_module) -> str:
             continue
         x0 = float(block[0]) if _is_number(block[0]) else 0.0
         y0 = float(block[1]) if _is_number(block[1]) else 0.0
-        text_blocks.append((y0, x0, text))
+        # Reading order keys, rounded once per block.
+        ys.append(round(y0, 1))
+        xs.append(round(x0, 1))
+        texts.append(text)
 
-    text_blocks.sort(key=lambda t: (round(t[0], 1), round(t[1], 1)))
-    return "\n".join(t[2] for t in text_blocks)
+    if len(texts) >= _LEXSORT_MIN_BLOCKS:
+        order = np.lexsort((np.asarray(xs), np.asarray(ys)))
+    else:
+        order = sorted(range(len(texts)), key=lambda i: (ys[i], xs[i]))
+    return "\n".join(texts[int(i)] for i in order)
 
 
 def _is_number(x) -> bool:
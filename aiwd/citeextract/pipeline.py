@@ -1,21 +1,36 @@
 from __future__ import annotations
 
+import os
+import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterator, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from .citation import find_citations
-from .pdf_text import extract_pdf_pages
+from .pdf_text import (
+    _PARALLEL_MIN_PAGES,
+    _default_pdf_workers,
+    _env_pdf_workers,
+    _get_pool,
+    _reset_pool,
+    extract_pdf_pages,
+    extract_pdf_pages_parallel,
+)
 from .references import ReferenceEntry, iter_reference_entries_from_pages
 from .sentence_split import split_sentences
 from .text_clean import (
-    find_references_heading_line_index,
+    locate_references_heading,
     looks_like_reference_entry,
     normalize_for_sentence_split,
-    page_has_references_heading,
     remove_repeated_headers_footers,
 )
 
+# Every citation form `find_citations` accepts carries a year. Without \b this is a superset of
+# its year pattern on any substring, so a page (or sentence) with no hit cannot yield a citation.
+_YEAR_HINT_RE = re.compile(r"(?:18|19|20)\d\d")
+
 
 @dataclass(frozen=True)
 class CitationSentenceRecord:
@@ -33,50 +48,143 @@ class CitationSentenceRecord:
         }
 
 
-def load_pdf_pages(pdf_path: Path, *, max_pages: Optional[int] = None) -> List[str]:
-    pages = extract_pdf_pages(Path(pdf_path), max_pages=max_pages)
-    return remove_repeated_headers_footers(pages)
+def _extract_pages(path: str, max_pages: Optional[int], workers: Optional[int]) -> List[str]:
+    # Serial unless the caller (or TOPHUMANWRITING_PDF_WORKERS) asks for worker processes.
+    n_workers = int(workers) if workers is not None else (_env_pdf_workers() or 1)
+    if n_workers > 1:
+        return extract_pdf_pages_parallel(Path(path), max_pages=max_pages, workers=n_workers)
+    return extract_pdf_pages(Path(path), max_pages=max_pages)
+
+
+# (path, max_pages) -> (mtime_ns, size, cleaned pages). One entry per path, so an edited PDF
+# replaces its stale pages, and LRU-bounded by total text size rather than entry count.
+_PAGES_CACHE: "OrderedDict[Tuple[str, Optional[int]], Tuple[int, int, Tuple[str, ...]]]" = OrderedDict()
+_PAGES_CACHE_MAX_CHARS = 8_000_000
+_PAGES_CACHE_CHARS = 0
+_PAGES_CACHE_LOCK = threading.Lock()
+
+
+def _pages_chars(pages: Tuple[str, ...]) -> int:
+    return sum(len(p) for p in pages)
+
+
+def _clear_pages_cache() -> None:
+    global _PAGES_CACHE_CHARS
+    with _PAGES_CACHE_LOCK:
+        _PAGES_CACHE.clear()
+        _PAGES_CACHE_CHARS = 0
+
+
+def _load_pages_cached(
+    path: str, mtime_ns: int, size: int, max_pages: Optional[int], workers: Optional[int]
+) -> Tuple[str, ...]:
+    global _PAGES_CACHE_CHARS
+    key = (path, max_pages)
+    with _PAGES_CACHE_LOCK:
+        hit = _PAGES_CACHE.get(key)
+        if hit is not None and hit[0] == mtime_ns and hit[1] == size:
+            _PAGES_CACHE.move_to_end(key)
+            return hit[2]
+    pages = tuple(remove_repeated_headers_footers(_extract_pages(path, max_pages, workers)))
+    n = _pages_chars(pages)
+    with _PAGES_CACHE_LOCK:
+        old = _PAGES_CACHE.pop(key, None)
+        if old is not None:
+            _PAGES_CACHE_CHARS -= _pages_chars(old[2])
+        if n <= _PAGES_CACHE_MAX_CHARS:
+            _PAGES_CACHE[key] = (mtime_ns, size, pages)
+            _PAGES_CACHE_CHARS += n
+        while _PAGES_CACHE_CHARS > _PAGES_CACHE_MAX_CHARS and _PAGES_CACHE:
+            _k, (_m, _s, evicted) = _PAGES_CACHE.popitem(last=False)
+            _PAGES_CACHE_CHARS -= _pages_chars(evicted)
+    return pages
+
+
+def load_pdf_pages(pdf_path: Path, *, max_pages: Optional[int] = None, workers: Optional[int] = None) -> List[str]:
+    """
+    Page texts with repeated headers/footers removed.
+
+    Extraction is serial by default; pass `workers` > 1 (or set TOPHUMANWRITING_PDF_WORKERS)
+    to split larger PDFs across worker processes.
+    """
+    # The same PDFs are re-read across stages (title index, paragraphs, per-pair summaries);
+    # memoize by path + stat so edits on disk still invalidate.
+    path = os.path.abspath(str(pdf_path))
+    try:
+        st = os.stat(path)
+    except OSError:
+        return remove_repeated_headers_footers(_extract_pages(path, max_pages, workers))
+    return list(_load_pages_cached(path, int(st.st_mtime_ns), int(st.st_size), max_pages, workers))
 
 
 def iter_citation_sentences_from_pages(
-    pages: List[str],
+    pages: Iterable[str],
     *,
     pdf_label: str,
     stop_at_references: bool = True,
 ) -> Iterator[CitationSentenceRecord]:
-    if stop_at_references:
-        # Keep text before the References heading on the same page (common when references start mid-page).
-        cut_page = _find_references_start(pages)
-        if cut_page is not None:
-            kept = pages[:cut_page]
-            try:
-                idx = find_references_heading_line_index(pages[cut_page])
-            except Exception:
-                idx = None
-            if idx is not None:
-                try:
-                    lines = (pages[cut_page] or "").splitlines()
-                    head = "\n".join(lines[: idx]).strip()
-                    if head:
-                        kept.append(head)
-                except Exception:
-                    pass
-            pages = kept
+    """
+    Yield citation sentences page by page.
+
+    `pages` may be any iterable (e.g. a lazy page stream): pages are consumed one at a time and,
+    with `stop_at_references`, nothing after the References heading page is read.
+    """
+    for page_num, page_text in _iter_body_pages(pages, stop_at_references=stop_at_references):
+        yield from _iter_page_citations(page_text, page_num=page_num, pdf_label=pdf_label)
 
+
+def _iter_body_pages(pages: Iterable[str], *, stop_at_references: bool) -> Iterator[Tuple[int, str]]:
+    """(page_num, text) of the pages to scan, cut at the References heading when asked."""
     for page_num, page_text in enumerate(pages, start=1):
-        clean = normalize_for_sentence_split(page_text)
-        for sent in split_sentences(clean):
-            if looks_like_reference_entry(sent):
-                continue
-            cits = find_citations(sent)
-            if not cits:
-                continue
-            yield CitationSentenceRecord(
-                pdf=pdf_label,
-                page=page_num,
-                sentence=sent,
-                citations=[c.to_dict() for c in cits],
-            )
+        idx = locate_references_heading(page_text) if stop_at_references else None
+        if idx is not None:
+            # Keep text before the References heading on the same page (common when references start mid-page).
+            head = "\n".join(page_text.splitlines()[:idx]).strip()
+            if head:
+                yield page_num, head
+            return
+        yield page_num, page_text
+
+
+def _page_citations(args: Tuple[str, int, str]) -> List[CitationSentenceRecord]:
+    # Process-pool entry point; must stay a module-level function so it pickles.
+    page_text, page_num, pdf_label = args
+    return list(_iter_page_citations(page_text, page_num=page_num, pdf_label=pdf_label))
+
+
+def _iter_page_citations(page_text: str, *, page_num: int, pdf_label: str) -> Iterator[CitationSentenceRecord]:
+    for sent, cits in _iter_page_citation_rows(page_text):
+        yield CitationSentenceRecord(pdf=pdf_label, page=page_num, sentence=sent, citations=cits)
+
+
+def _iter_page_citation_rows(page_text: str) -> Iterator[Tuple[str, List[Dict[str, str]]]]:
+    clean = normalize_for_sentence_split(page_text)
+    if not _YEAR_HINT_RE.search(clean):
+        return
+    for sent in split_sentences(clean):
+        if not _YEAR_HINT_RE.search(sent) or looks_like_reference_entry(sent):
+            continue
+        cits = find_citations(sent)
+        if not cits:
+            continue
+        yield sent, [c.to_dict() for c in cits]
+
+
+def iter_citation_sentence_dicts_from_pages(
+    pages: Iterable[str],
+    *,
+    pdf_label: str,
+    stop_at_references: bool = True,
+) -> Iterator[Dict[str, object]]:
+    """
+    Same rows as `iter_citation_sentences_from_pages`, already in `CitationSentenceRecord.to_dict()` form.
+
+    For callers that only serialize the records (JSONL banks, material packs): skips building a
+    frozen dataclass per sentence just to copy it into a dict again.
+    """
+    for page_num, page_text in _iter_body_pages(pages, stop_at_references=stop_at_references):
+        for sent, cits in _iter_page_citation_rows(page_text):
+            yield {"pdf": pdf_label, "page": page_num, "sentence": sent, "citations": cits}
 
 
 def iter_citation_sentences(
@@ -91,6 +199,41 @@ def iter_citation_sentences(
     yield from iter_citation_sentences_from_pages(pages, pdf_label=label, stop_at_references=stop_at_references)
 
 
+def iter_citation_sentences_parallel(
+    pdf_path: Path,
+    *,
+    pdf_label: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    stop_at_references: bool = True,
+    workers: Optional[int] = None,
+) -> Iterator[CitationSentenceRecord]:
+    """
+    Same output as `iter_citation_sentences`, with pages processed across worker processes.
+
+    Normalization, sentence splitting and citation matching are pure Python, so threads would
+    serialize on the GIL. Short documents (and any pool failure) use the serial path.
+    """
+    label = pdf_label if pdf_label is not None else str(pdf_path)
+    pages = load_pdf_pages(Path(pdf_path), max_pages=max_pages)
+    body = list(_iter_body_pages(pages, stop_at_references=stop_at_references))
+    n_workers = int(workers) if workers is not None else _default_pdf_workers()
+    if n_workers <= 1 or len(body) < _PARALLEL_MIN_PAGES:
+        for page_num, page_text in body:
+            yield from _iter_page_citations(page_text, page_num=page_num, pdf_label=label)
+        return
+
+    chunksize = max(1, len(body) // (4 * n_workers))
+    ex = None
+    try:
+        ex = _get_pool(n_workers)
+        results = list(ex.map(_page_citations, [(t, n, label) for n, t in body], chunksize=chunksize))
+    except Exception:
+        _reset_pool(ex)
+        results = [_page_citations((t, n, label)) for n, t in body]
+    for recs in results:
+        yield from recs
+
+
 def iter_reference_entries(
     pdf_path: Path,
     *,
@@ -100,10 +243,3 @@ def iter_reference_entries(
     label = pdf_label if pdf_label is not None else str(pdf_path)
     pages = load_pdf_pages(Path(pdf_path), max_pages=max_pages)
     yield from iter_reference_entries_from_pages(pages, pdf_label=label)
-
-
-def _find_references_start(pages: List[str]) -> Optional[int]:
-    for i, text in enumerate(pages):
-        if page_has_references_heading(text):
-            return i
-    return None
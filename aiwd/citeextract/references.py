@@ -1,21 +1,25 @@
 from __future__ import annotations
 
+import functools
 import re
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from typing import Dict, Iterator, List, Optional, Tuple
 
 from .citation import YEAR_RE
-from .text_clean import find_references_heading_line_index, page_has_references_heading
+from .text_clean import locate_references_heading, page_has_references_heading
 
 
 _WS_RE = re.compile(r"\s+")
+_PAGENUM_RE = re.compile(r"\d{1,4}")
 _NUM_PREFIX_RE = re.compile(r"^\s*(?:\[\d+\]|\d+\.)\s+")
 
 _REF_START_NUMERIC_RE = re.compile(r"^\s*(?:\[\d+\]|\d+\.)\s+")
-_REF_START_AUTHOR_RE = re.compile(r"^[A-Z][A-Za-z'’\-]+,")
-_REF_START_AUTHOR_NO_COMMA_RE = re.compile(r"^[A-Z][A-Za-z'’\-]+(?:\s+[A-Z][A-Za-z'’\-]+){0,2}\s*\(")
-_REF_START_CJK_RE = re.compile(r"^[\u4e00-\u9fff]{1,8}\s*[,，]")
-_REF_START_CJK_NO_COMMA_RE = re.compile(r"^[\u4e00-\u9fff]{1,8}(?:\s+[\u4e00-\u9fff]{1,8}){0,2}\s*[（(]")
+# Author-led openings ("Smith, J." / "Smith and Doe (2020)" / "张三，" / "张三（2020）"), each
+# shape in one pattern; all of them also need a year near the start of the line.
+_REF_START_AUTHOR_RE = re.compile(
+    r"^(?:[A-Z][A-Za-z'’\-]+(?:,|(?:\s+[A-Z][A-Za-z'’\-]+){0,2}\s*\()"
+    r"|[\u4e00-\u9fff]{1,8}(?:\s*[,，]|(?:\s+[\u4e00-\u9fff]{1,8}){0,2}\s*[（(]))"
+)
 
 
 @dataclass(frozen=True)
@@ -28,20 +32,29 @@ class ReferenceEntry:
     year: str
 
     def to_dict(self) -> Dict[str, object]:
-        return asdict(self)
+        # Literal dict: asdict() deep-copies field by field, needless for primitive fields.
+        return {
+            "pdf": self.pdf,
+            "page": self.page,
+            "index": self.index,
+            "reference": self.reference,
+            "authors": self.authors,
+            "year": self.year,
+        }
 
 
 def iter_reference_entries_from_pages(pages: List[str], *, pdf_label: str) -> Iterator[ReferenceEntry]:
-    start_page = _find_references_start_page(pages)
-    if start_page is None:
+    start = _find_references_start(pages)
+    if start is None:
         return
+    start_page, heading_idx = start
 
     entry_index = 0
     cur_parts: List[str] = []
     cur_start_page: Optional[int] = None
 
     for page_i in range(start_page, len(pages)):
-        for line in _iter_reference_lines(pages[page_i], is_first_page=(page_i == start_page)):
+        for line in _iter_reference_lines(pages[page_i], heading_idx=heading_idx if page_i == start_page else None):
             if _is_new_reference_line(line):
                 if cur_parts:
                     entry_index += 1
@@ -80,20 +93,20 @@ def iter_reference_entries_from_pages(pages: List[str], *, pdf_label: str) -> It
             )
 
 
-def _find_references_start_page(pages: List[str]) -> Optional[int]:
+def _find_references_start(pages: List[str]) -> Optional[Tuple[int, int]]:
+    """(page index, heading line index) of the first References heading."""
     for i, text in enumerate(pages):
-        if page_has_references_heading(text):
-            return i
+        idx = locate_references_heading(text)
+        if idx is not None:
+            return i, idx
     return None
 
 
-def _iter_reference_lines(page_text: str, *, is_first_page: bool) -> Iterator[str]:
+def _iter_reference_lines(page_text: str, *, heading_idx: Optional[int] = None) -> Iterator[str]:
     raw_lines = (page_text or "").splitlines()
 
-    if is_first_page:
-        idx = find_references_heading_line_index(page_text)
-        if idx is not None and 0 <= idx < len(raw_lines):
-            raw_lines = raw_lines[idx + 1 :]
+    if heading_idx is not None and 0 <= heading_idx < len(raw_lines):
+        raw_lines = raw_lines[heading_idx + 1 :]
 
     for line in raw_lines:
         s = (line or "").strip()
@@ -101,7 +114,7 @@ def _iter_reference_lines(page_text: str, *, is_first_page: bool) -> Iterator[st
             continue
         if len(s) <= 60 and page_has_references_heading(s):
             continue
-        if re.fullmatch(r"\d{1,4}", s):
+        if _PAGENUM_RE.fullmatch(s):
             continue
         s = _WS_RE.sub(" ", s)
         yield s
@@ -112,27 +125,29 @@ def _is_new_reference_line(line: str) -> bool:
         return False
     if _REF_START_NUMERIC_RE.match(line):
         return True
-    if _REF_START_AUTHOR_RE.match(line) and YEAR_RE.search(line[:220]):
-        return True
-    if _REF_START_AUTHOR_NO_COMMA_RE.match(line) and YEAR_RE.search(line[:220]):
-        return True
-    if _REF_START_CJK_RE.match(line) and YEAR_RE.search(line[:220]):
-        return True
-    if _REF_START_CJK_NO_COMMA_RE.match(line) and YEAR_RE.search(line[:220]):
-        return True
-    return False
+    return _REF_START_AUTHOR_RE.match(line) is not None and YEAR_RE.search(line, 0, 220) is not None
 
 
 def _join_ref_parts(parts: List[str]) -> str:
-    s = " ".join(p.strip() for p in parts if (p or "").strip())
-    s = _WS_RE.sub(" ", s).strip()
+    # Parts are lines from _iter_reference_lines (stripped, whitespace collapsed), so a plain
+    # join is normally final. A printable string's only whitespace is " ", so these checks
+    # catch every case the normalizing path would change.
+    s = " ".join(parts)
+    if "  " in s or s != s.strip() or not s.isprintable():
+        s = " ".join(p.strip() for p in parts if (p or "").strip())
+        s = _WS_RE.sub(" ", s).strip()
     return s
 
 
 def _parse_authors_year(reference_text: str) -> Tuple[str, str]:
     if not reference_text:
         return ("", "")
+    return _parse_authors_year_cached(reference_text)
+
 
+@functools.lru_cache(maxsize=4096)
+def _parse_authors_year_cached(reference_text: str) -> Tuple[str, str]:
+    # The same References section is re-parsed by every stage (and run) that reads the PDF.
     s = _NUM_PREFIX_RE.sub("", reference_text).strip()
     m = YEAR_RE.search(s)
     if not m:
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import re
-from typing import List
+from typing import List, Optional
 
 
 _PARA_RE = re.compile(r"\n{2,}")
 _WS_RE = re.compile(r"\s+")
+# A run of .?! plus closing brackets/quotes. A run directly followed (after spaces) by a
+# lowercase ASCII letter can never end a sentence, so it is rejected here. The lookahead +
+# backreference makes the run atomic (no backtracking into a shorter run) without needing
+# Python 3.11 possessive quantifiers.
+_BOUNDARY_RE = re.compile(r"(?=([.?!]+)([)\]}\"']*))\1(?!\s*[a-z])\2")
+_ASCII_LETTERS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")
+_INITIALS_RE = re.compile(r"(?:\b[A-Z]\.){2,}$")
+# Trailing initials only need a short look-back; `pos` keeps the \b context of the full text.
+_INITIALS_LOOKBACK = 64
 
 _ABBREV_TAILS = (
     "e.g.",
@@ -48,33 +57,24 @@ def split_sentences(text: str) -> List[str]:
 
 
 def _split_para(text: str) -> List[str]:
-    n = len(text)
     start = 0
-    i = 0
     out: List[str] = []
 
-    while i < n:
-        ch = text[i]
-        if ch in ".?!":
-            j = i + 1
-            while j < n and text[j] in ".?!":
-                j += 1
-
-            if _is_sentence_end(text, i, j):
-                end = j
-                while end < n and text[end] in ")]}\"'":
-                    end += 1
-                sent = text[start:end].strip()
-                if sent:
-                    out.append(_cleanup_sentence(sent))
-                start = end
-                i = end
-                continue
-
-            i = j
-            continue
+    # Lowercase once for the abbreviation windows (unless lowering changes the length,
+    # which would shift indices).
+    lower: Optional[str] = text.lower()
+    if len(lower) != len(text):
+        lower = None
 
-        i += 1
+    # Candidate boundaries are found in C; only those hits go through the abbreviation checks.
+    for m in _BOUNDARY_RE.finditer(text):
+        if not _is_sentence_end(text, m.start(), m.end(1), lower):
+            continue
+        end = m.end()
+        sent = text[start:end].strip()
+        if sent:
+            out.append(_cleanup_sentence(sent))
+        start = end
 
     tail = text[start:].strip()
     if tail:
@@ -82,21 +82,23 @@ def _split_para(text: str) -> List[str]:
     return out
 
 
-def _is_sentence_end(text: str, period_i: int, after_punct_i: int) -> bool:
+def _is_sentence_end(text: str, period_i: int, after_punct_i: int, lower: Optional[str] = None) -> bool:
     n = len(text)
-    window = text[max(0, period_i - 12) : min(n, after_punct_i)].lower()
-    if any(window.endswith(t) for t in _ABBREV_TAILS):
+    if lower is not None:
+        window = lower[max(0, period_i - 12) : min(n, after_punct_i)]
+    else:
+        window = text[max(0, period_i - 12) : min(n, after_punct_i)].lower()
+    if window.endswith(_ABBREV_TAILS):
         return False
 
     if text[period_i] == ".":
         if period_i > 0 and after_punct_i < n and text[period_i - 1].isdigit() and text[after_punct_i].isdigit():
             return False
 
-        m = re.search(r"([A-Za-z]{1,6})\.$", window)
-        if m and m.group(1).lower() in _ABBREV_WORDS:
+        if _is_abbrev_word_end(window):
             return False
 
-        if re.search(r"(?:\b[A-Z]\.){2,}$", text[: after_punct_i]):
+        if _INITIALS_RE.search(text, max(0, after_punct_i - _INITIALS_LOOKBACK), after_punct_i):
             return False
 
     k = after_punct_i
@@ -112,6 +114,19 @@ def _is_sentence_end(text: str, period_i: int, after_punct_i: int) -> bool:
     return True
 
 
+def _is_abbrev_word_end(window: str) -> bool:
+    """True when `window` ends with "<letters>." and those letters (1-6 of them) are a known abbreviation."""
+    end = len(window) - 1
+    if end < 1 or window[end] != ".":
+        return False
+    # Walk back over the ASCII letters before the final period; 7 is enough to know the word is too long.
+    i = end
+    while i > 0 and end - i < 7 and window[i - 1] in _ASCII_LETTERS:
+        i -= 1
+    word = window[i:end]
+    return 0 < len(word) <= 6 and word.lower() in _ABBREV_WORDS
+
+
 def _cleanup_sentence(s: str) -> str:
     s = s.replace("\u00ad", "")
     s = _WS_RE.sub(" ", s).strip()
@@ -2,12 +2,24 @@ from __future__ import annotations
 
 import re
 from collections import Counter
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 _WS_RE = re.compile(r"[ \t]+")
-_CTRL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
-_DIGITS_RE = re.compile(r"\d+")
+_MULTI_NL_RE = re.compile(r"\n{3,}")
+_SINGLE_NL_RE = re.compile(r"(?<!\n)\n(?!\n)")
+# Dropped before whitespace handling: control characters (keeps \t \n \r) and soft hyphens.
+_NORMALIZE_DELETE = {c: None for c in [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x00AD]}
+_NORMALIZE_DELETE[0x0D] = "\n"
+# Whitespace runs that normalization changes: any run with a newline, a tab, or 2+ spaces.
+_NORMALIZE_WS_RE = re.compile(r"[ \t]*\n[ \t\n]*|[ \t]*\t[ \t]*|  +")
+_NON_WORD_RE = re.compile(r"[^A-Za-z\u4e00-\u9fff ]+")
+
+# One pass per line for every heading spelling, and for both reference-entry openings.
+_REF_HEADING_RE = re.compile(r"(?i)references|bibliography|literature cited|参考文献|引用文献|文献")
+# Every heading spelling contains one of these; a page without any cannot have the heading.
+_REF_HEADING_TOKENS = ("references", "bibliography", "literature cited", "文献")
+_REF_ENTRY_START_RE = re.compile(r"[A-Z][A-Za-z'’\-]+,\s*[A-Z](?:\.[A-Z])?\.|\[\d+\]\s*[A-Z][A-Za-z'’\-]+")
 
 
 def remove_repeated_headers_footers(pages: List[str]) -> List[str]:
@@ -17,16 +29,25 @@ def remove_repeated_headers_footers(pages: List[str]) -> List[str]:
     header_counts: Counter[str] = Counter()
     footer_counts: Counter[str] = Counter()
 
+    # Header/footer lines repeat by construction, so each distinct raw line is normalized once.
+    norm_cache: Dict[str, str] = {}
+
+    def norm(line: str) -> str:
+        key = norm_cache.get(line)
+        if key is None:
+            key = norm_cache[line] = _norm_header_footer_line(line)
+        return key
+
     for text in pages:
         lines = _non_empty_lines(text)
         if not lines:
             continue
         for line in lines[:2]:
-            key = _norm_header_footer_line(line)
+            key = norm(line)
             if key:
                 header_counts[key] += 1
         for line in lines[-2:]:
-            key = _norm_header_footer_line(line)
+            key = norm(line)
             if key:
                 footer_counts[key] += 1
 
@@ -39,39 +60,52 @@ def remove_repeated_headers_footers(pages: List[str]) -> List[str]:
     for text in pages:
         kept_lines = []
         for line in text.splitlines():
-            if _norm_header_footer_line(line) in drop:
+            if norm(line) in drop:
                 continue
             kept_lines.append(line)
         cleaned.append("\n".join(kept_lines))
     return cleaned
 
 
+def _may_have_references_heading(text: str) -> bool:
+    tl = text.lower()
+    return any(tok in tl for tok in _REF_HEADING_TOKENS)
+
+
 def page_has_references_heading(text: str) -> bool:
-    if not text:
-        return False
+    return locate_references_heading(text) is not None
 
-    for line in _non_empty_lines(text)[:30]:
+
+def locate_references_heading(text: str) -> Optional[int]:
+    """
+    Line index (in `text.splitlines()`) of a References heading among the first 30 non-empty
+    lines, or None. One scan answers both "is this the References page" and "where does it start".
+    """
+    if not text or not _may_have_references_heading(text):
+        return None
+
+    seen = 0
+    for idx, line in enumerate(text.splitlines()):
         s = line.strip()
-        if len(s) > 60:
+        if not s:
             continue
-        if re.fullmatch(r"(?i)references|bibliography|literature cited", s):
-            return True
-        if re.fullmatch(r"参考文献|引用文献|文献", s):
-            return True
-    return False
+        seen += 1
+        if seen > 30:
+            break
+        if len(s) <= 60 and _REF_HEADING_RE.fullmatch(s):
+            return idx
+    return None
 
 
 def find_references_heading_line_index(text: str) -> Optional[int]:
-    if not text:
+    if not text or not _may_have_references_heading(text):
         return None
     lines = (text or "").splitlines()
     for idx, line in enumerate(lines[:300]):
         s = (line or "").strip()
         if not s or len(s) > 60:
             continue
-        if re.fullmatch(r"(?i)references|bibliography|literature cited", s):
-            return idx
-        if re.fullmatch(r"参考文献|引用文献|文献", s):
+        if _REF_HEADING_RE.fullmatch(s):
             return idx
     return None
 
@@ -79,27 +113,32 @@ def find_references_heading_line_index(text: str) -> Optional[int]:
 def normalize_for_sentence_split(text: str) -> str:
     if not text:
         return ""
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-    text = _CTRL_RE.sub("", text)
-    text = text.replace("\u00ad", "")
-    text = _WS_RE.sub(" ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = re.sub(r"(?<!\n)\n(?!\n)", " ", text)
-    text = _WS_RE.sub(" ", text)
+    # One translate for line endings/control chars/soft hyphens, then one pass over the
+    # whitespace runs that need rewriting (plain single spaces are never touched).
+    text = text.replace("\r\n", "\n").translate(_NORMALIZE_DELETE)
+    text = _NORMALIZE_WS_RE.sub(_normalize_ws_run, text)
     return text.strip()
 
 
+def _normalize_ws_run(m: "re.Match[str]") -> str:
+    run = m.group(0)
+    if "\n\n" not in run:
+        # Only lone newlines: the whole run folds into one space.
+        return " "
+    # Paragraph break: collapse 3+ newlines to two, lone newlines to spaces, space runs to one.
+    run = _WS_RE.sub(" ", run)
+    run = _MULTI_NL_RE.sub("\n\n", run)
+    run = _SINGLE_NL_RE.sub(" ", run)
+    return _WS_RE.sub(" ", run)
+
+
 def looks_like_reference_entry(sentence: str) -> bool:
     if not sentence:
         return False
     s = sentence.strip()
     if len(s) < 8:
         return False
-    if re.match(r"^[A-Z][A-Za-z'’\-]+,\s*[A-Z](?:\.[A-Z])?\.", s):
-        return True
-    if re.match(r"^\[\d+\]\s*[A-Z][A-Za-z'’\-]+", s):
-        return True
-    return False
+    return _REF_ENTRY_START_RE.match(s) is not None
 
 
 def _non_empty_lines(text: str) -> List[str]:
@@ -112,10 +151,8 @@ def _norm_header_footer_line(line: str) -> str:
     s = line.strip()
     if len(s) < 5 or len(s) > 160:
         return ""
-    s = s.replace("\u00ad", "")
-    s = _WS_RE.sub(" ", s)
-    s = _DIGITS_RE.sub("", s)
-    s = re.sub(r"[^A-Za-z\u4e00-\u9fff ]+", "", s)
+    # Digits and soft hyphens are non-word characters, so one removal pass covers them.
+    s = _NON_WORD_RE.sub("", s.replace("\t", " "))
     s = _WS_RE.sub(" ", s).strip().lower()
     if len(s) < 6:
         return ""
@@ -6,6 +6,16 @@ import re
 from dataclasses import dataclass, field
 from typing import Dict, List
 
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None
+
+
+_CJK_RUN_RE = re.compile(r"[\u4e00-\u9fff]+")
+# Above this length a vectorized UTF-16 scan beats the regex on non-ASCII text.
+_NUMPY_MIN_CHARS = 1024
+
 
 def approx_tokens(text: str) -> int:
     """
@@ -16,7 +26,16 @@ def approx_tokens(text: str) -> int:
     - other chars ~ 1 token / 4 chars
     """
     s = text or ""
-    cjk = len(re.findall(r"[\u4e00-\u9fff]", s))
+    # ASCII text has no CJK; otherwise count whole runs instead of building a list of characters.
+    if s.isascii():
+        cjk = 0
+    elif np is not None and len(s) >= _NUMPY_MIN_CHARS:
+        # The CJK block is in the BMP, so each such char is exactly one UTF-16 code unit. A lone
+        # surrogate (possible in decoded text) passes through as one unit outside that block.
+        units = np.frombuffer(s.encode("utf-16-le", errors="surrogatepass"), dtype=np.uint16)
+        cjk = int(np.count_nonzero((units >= 0x4E00) & (units <= 0x9FFF)))
+    else:
+        cjk = sum(m.end() - m.start() for m in _CJK_RUN_RE.finditer(s))
     other = len(s) - cjk
     return max(1, int(cjk + max(0, other) / 4))
 
@@ -60,8 +79,10 @@ class LLMBudget:
         self.total_tokens += max(0, tt)
         self.calls += 1
 
-    def add_approx(self, prompt_text: str, completion_text: str):
-        self.approx_total_tokens += approx_tokens(prompt_text) + approx_tokens(completion_text)
+    def add_approx(self, prompt_text: str, completion_text: str, *, prompt_tokens: int = 0):
+        # Callers that already estimated the prompt (for the budget check) pass it in.
+        pt = int(prompt_tokens) if int(prompt_tokens or 0) > 0 else approx_tokens(prompt_text)
+        self.approx_total_tokens += pt + approx_tokens(completion_text)
         self.calls += 1
 
     def estimated_cost(self) -> float:
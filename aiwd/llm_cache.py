@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
+
+# Cache hits are read with orjson when available. It reads integers past 64 bits as floats, so
+# entries with such digit runs go through the stdlib (see polish.extract_json).
+_LONG_DIGITS_RE = re.compile(rb"\d{19}")
+
+
+class LLMJsonCache:
+    """
+    Content-addressed cache of parsed JSON responses, so byte-identical review prompts skip the API.
+
+    One small file per entry under `<cache_dir>/<key[:2]>/<key>.json`: concurrent batch calls
+    write different files, and a crash can only lose the entry being written.
+    """
+
+    VERSION = 1
+
+    def __init__(self, *, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def key(
+        *,
+        model: str,
+        system: str,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        response_format: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        parts: list = [str(model or ""), str(system or ""), str(prompt or ""), int(max_tokens or 0), float(temperature or 0.0)]
+        if response_format:
+            parts.append(response_format)
+        base = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(base.encode("utf-8", errors="ignore")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Tuple[dict, dict]]:
+        key = str(key or "")
+        if not key:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                raw = f.read()
+        except Exception:
+            return None
+        ent = None
+        if orjson is not None and not _LONG_DIGITS_RE.search(raw):
+            try:
+                ent = orjson.loads(raw)
+            except Exception:
+                ent = None  # e.g. NaN written by the stdlib: fall through
+        if ent is None:
+            try:
+                ent = json.loads(raw.decode("utf-8"))
+            except Exception:
+                return None
+        if not isinstance(ent, dict) or int(ent.get("version", 0) or 0) != self.VERSION:
+            return None
+        obj = ent.get("obj", None)
+        meta = ent.get("meta", None)
+        if not isinstance(obj, dict):
+            return None
+        return obj, (meta if isinstance(meta, dict) else {})
+
+    def put(self, key: str, obj: dict, meta: Optional[Dict[str, Any]] = None) -> None:
+        key = str(key or "")
+        if not key or not isinstance(obj, dict):
+            return
+        path = self._path(key)
+        ent = {"version": self.VERSION, "obj": obj, "meta": dict(meta or {}), "created_at": int(time.time())}
+        tmp = ""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # A unique temp file per write: batch threads in one process may store the same key at once.
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f"{key}.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(ent, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except Exception:
+            if tmp:
+                try:
+                    os.remove(tmp)
+                except Exception:
+                    pass
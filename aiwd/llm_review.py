@@ -2,87 +2,258 @@
 
 from __future__ import annotations
 
-import hashlib
+import functools
+import heapq
 import json
+import os
+import random
 import re
+import threading
 import time
-from typing import Any, Callable, Dict, List, Optional, Tuple
+import weakref
+import zlib
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None
 
 from aiwd.llm_budget import LLMBudget, approx_tokens
-from aiwd.openai_compat import OpenAICompatClient, extract_first_content, extract_usage
+from aiwd.llm_cache import LLMJsonCache
+from aiwd.openai_compat import OpenAICompatClient, _is_transient_response, extract_first_content, extract_usage
 from aiwd.polish import extract_json
 from aiwd.review_coverage import ReviewCoverageStore, stable_text_key
 
+_JSON_SYSTEM_PROMPT = "Return STRICT JSON only."
+_JSON_SYSTEM_PROMPT_TOKENS = approx_tokens(_JSON_SYSTEM_PROMPT)
+_JSON_REPAIR_SUFFIX = (
+    "\n\nYour last response was not valid JSON. Return ONLY one JSON object matching OUTPUT_SCHEMA. No markdown, no code fences."
+)
+_JSON_REPAIR_SUFFIX_TOKENS = approx_tokens(_JSON_REPAIR_SUFFIX)
 
+# Batch reviews fan out over threads; budget counters and warnings are shared between them.
+_BUDGET_LOCK = threading.Lock()
+_DEFAULT_LLM_WORKERS = 4
+
+# Full-jitter backoff before re-sending after a transient HTTP failure. The client already
+# retried with its own backoff, so this only spaces out the one extra attempt here.
+_RETRY_BASE_DELAY_S = 0.5
+_RETRY_MAX_DELAY_S = 8.0
+
+
+class _CircuitBreaker:
+    """
+    Per-endpoint breaker for provider outages: after `threshold` consecutive failed calls it
+    opens and rejects calls for `cooldown_s`, then lets a single trial call through
+    (half-open); that call's outcome closes it again or restarts the cooldown. A trial that ends
+    without an outcome (skipped, or a request error) is handed back with `release`.
+    """
+
+    def __init__(self, *, threshold: int = 5, cooldown_s: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.threshold = max(1, int(threshold))
+        self.cooldown_s = float(cooldown_s)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._trial: Dict[str, bool] = {}
+
+    def allow(self, key: str) -> bool:
+        with self._lock:
+            opened = self._opened_at.get(key, None)
+            if opened is None:
+                return True
+            if self._clock() - opened < self.cooldown_s or self._trial.get(key, False):
+                return False
+            self._trial[key] = True
+            return True
+
+    def record_success(self, key: str) -> None:
+        with self._lock:
+            self._failures.pop(key, None)
+            self._opened_at.pop(key, None)
+            self._trial.pop(key, None)
+
+    def release(self, key: str) -> None:
+        """Give back a claimed half-open trial without recording an outcome."""
+        with self._lock:
+            self._trial.pop(key, None)
+
+    def record_failure(self, key: str) -> bool:
+        """Returns True when this failure opens (or re-opens) the breaker."""
+        with self._lock:
+            n = self._failures[key] = int(self._failures.get(key, 0)) + 1
+            if self._trial.pop(key, False) or (n >= self.threshold and key not in self._opened_at):
+                self._opened_at[key] = self._clock()
+                return True
+            return False
+
+
+# One breaker per client object: jobs build their own client (own credentials), so one job's
+# outage never short-circuits another's calls. Entries go away with their client.
+_LLM_BREAKERS: "weakref.WeakKeyDictionary[Any, _CircuitBreaker]" = weakref.WeakKeyDictionary()
+_LLM_BREAKERS_LOCK = threading.Lock()
+
+
+def _breaker_for(llm: Any) -> _CircuitBreaker:
+    with _LLM_BREAKERS_LOCK:
+        try:
+            br = _LLM_BREAKERS.get(llm)
+            if br is None:
+                br = _LLM_BREAKERS[llm] = _CircuitBreaker()
+        except TypeError:
+            # Not weak-referenceable (or unhashable): a fresh breaker, i.e. no state across calls.
+            return _CircuitBreaker()
+        return br
+
+
+def _breaker_key(llm: Any) -> str:
+    cfg = getattr(llm, "cfg", None)
+    return f"{getattr(cfg, 'base_url', '') or ''}|{getattr(cfg, 'model', '') or ''}"
+
+
+_WS_RE = re.compile(r"\s+")
+# Whitespace is outside the id alphabet too, so this single pass also drops it.
+_ID_STRIP_RE = re.compile(r"[^A-Za-z0-9_]+")
+_ID_COLLAPSE_RE = re.compile(r"__+")
+
+
+# The same top-k exemplar texts recur across neighbouring targets in one review pass.
+@functools.lru_cache(maxsize=8192)
 def _norm_ws(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "")).strip()
+    return _WS_RE.sub(" ", (s or "")).strip()
 
 
+@functools.lru_cache(maxsize=4096)
 def _norm_evidence_id(ev_id: str) -> str:
     s = str(ev_id or "").strip()
     if not s:
         return ""
-    s = s.replace("-", "_")
-    s = re.sub(r"\s+", "", s)
-    s = re.sub(r"[^A-Za-z0-9_]", "", s)
-    s = re.sub(r"_+", "_", s)
+    s = _ID_STRIP_RE.sub("", s.replace("-", "_"))
+    s = _ID_COLLAPSE_RE.sub("_", s)
     return s.upper()
 
 
-def _resolve_allowed_id(allowed: Dict[str, str], *, ev_id: str) -> str:
-    raw = str(ev_id or "").strip()
+def _allowed_norm_map(allowed: Dict[str, str]) -> Dict[str, str]:
+    """Normalized id -> first allowed id (with non-empty text) that normalizes to it."""
+    out: Dict[str, str] = {}
+    for k, v in (allowed or {}).items():
+        if v:
+            out.setdefault(_norm_evidence_id(k), k)
+    return out
+
+
+def _raw_evidence_id(v: Any) -> str:
+    # Model ids are nearly always strings already; only odd values (ints, None) need str().
+    return v.strip() if isinstance(v, str) else str(v or "").strip()
+
+
+def _resolve_allowed_id(allowed: Dict[str, str], *, ev_id: Any, allowed_norm: Optional[Dict[str, str]] = None) -> str:
+    raw = _raw_evidence_id(ev_id)
     if not raw:
         return ""
-    if raw in allowed and allowed.get(raw, ""):
+    if allowed.get(raw, ""):
         return raw
     want = _norm_evidence_id(raw)
     if not want:
         return ""
-    for k in (allowed or {}).keys():
-        if _norm_evidence_id(k) == want and allowed.get(k, ""):
-            return k
-    return ""
+    if allowed_norm is None:
+        allowed_norm = _allowed_norm_map(allowed)
+    return allowed_norm.get(want, "")
+
 
+def _allowed_id_set(allowed: Dict[str, str]) -> Set[str]:
+    """Ids in `allowed` that carry text, i.e. the ids `_resolve_allowed_id` accepts verbatim."""
+    return {k for k, v in (allowed or {}).items() if v}
 
-def _evidence_id_ok(allowed: Dict[str, str], *, ev_id: str) -> bool:
-    ev_id = str(ev_id or "").strip()
-    if not ev_id:
+
+def _evidence_id_ok(
+    allowed: Dict[str, str],
+    *,
+    ev_id: Any,
+    allowed_norm: Optional[Dict[str, str]] = None,
+    allowed_ids: Optional[Set[str]] = None,
+) -> bool:
+    if allowed_ids is None:
+        return bool(_resolve_allowed_id(allowed, ev_id=ev_id, allowed_norm=allowed_norm))
+    # Membership only: same answer as `_resolve_allowed_id`, without fetching the id or its text.
+    raw = _raw_evidence_id(ev_id)
+    if not raw:
         return False
-    if bool(allowed.get(ev_id, "")):
+    if raw in allowed_ids:
         return True
-    return bool(_resolve_allowed_id(allowed, ev_id=ev_id))
+    want = _norm_evidence_id(raw)
+    if not want:
+        return False
+    if allowed_norm is None:
+        allowed_norm = _allowed_norm_map(allowed)
+    return want in allowed_norm
 
 
-def _allowed_excerpt(allowed_text: str) -> str:
-    s = _norm_ws(str(allowed_text or ""))
+def _excerpt_of_normalized(s: str) -> str:
+    # `s` is already whitespace-normalized and the meta prefix eats trailing spaces, so the
+    # remainder needs no second normalization pass.
     m = _EVID_META_RE.match(s)
     if not m:
         return s
-    return _norm_ws(s[m.end() :])
+    return s[m.end() :]
+
+
+def _normalized_allowed_text(allowed: Dict[str, str], eid: str, cache: Optional[Dict[str, str]]) -> str:
+    if cache is None:
+        return _norm_ws(allowed.get(eid, ""))
+    ns = cache.get(eid, None)
+    if ns is None:
+        ns = cache[eid] = _norm_ws(allowed.get(eid, ""))
+    return ns
 
 
-def _ensure_evidence_quote(ev: Dict[str, Any], *, allowed: Dict[str, str], max_chars: int = 180) -> None:
+def _ensure_evidence_quote(
+    ev: Dict[str, Any],
+    *,
+    allowed: Dict[str, str],
+    max_chars: int = 180,
+    allowed_norm: Optional[Dict[str, str]] = None,
+    allowed_text_norm: Optional[Dict[str, str]] = None,
+) -> None:
     if not isinstance(ev, dict):
         return
-    eid_raw = str(ev.get("id", "") or "").strip()
-    eid = _resolve_allowed_id(allowed, ev_id=eid_raw) or eid_raw
+    eid_raw = _raw_evidence_id(ev.get("id", ""))
+    eid = _resolve_allowed_id(allowed, ev_id=eid_raw, allowed_norm=allowed_norm) or eid_raw
     if not eid:
         return
     if eid != eid_raw:
         ev["id"] = eid
+    _set_evidence_quote(ev, eid, allowed=allowed, max_chars=max_chars, allowed_text_norm=allowed_text_norm)
+
+
+def _set_evidence_quote(
+    ev: Dict[str, Any],
+    eid: str,
+    *,
+    allowed: Dict[str, str],
+    max_chars: int = 180,
+    allowed_text_norm: Optional[Dict[str, str]] = None,
+) -> None:
+    """`_ensure_evidence_quote` for an `ev` whose id is already resolved to `eid`."""
     src = allowed.get(eid, "")
     if not src:
         return
 
+    src_norm = _normalized_allowed_text(allowed, eid, allowed_text_norm)
     quote = str(ev.get("quote", "") or "").strip()
     if quote:
         # Keep quote only if it's a true substring (after whitespace normalization).
-        if _norm_ws(quote) in _norm_ws(src):
+        if _norm_ws(quote) in src_norm:
             return
 
     # Fallback: use an excerpt from the provided exemplar text.
     # IMPORTANT: keep it an exact substring (no ellipsis), so evidence is verifiable.
-    ex = _allowed_excerpt(src)
+    ex = _excerpt_of_normalized(src_norm)
     if len(ex) > int(max_chars):
         ex = ex[: int(max_chars)].rstrip()
     ev["quote"] = ex.strip()
@@ -104,46 +275,87 @@ def _evidence_meta_from_allowed(allowed_text: str) -> Tuple[str, int]:
     return pdf, max(0, page)
 
 
-def _attach_evidence_meta(obj: Any, *, allowed: Dict[str, str]):
-    if not isinstance(obj, dict):
-        return
+def _response_items(obj: Optional[dict]) -> List[Dict[str, Any]]:
+    """The dict entries of a review response's `items` list; any other shape yields none."""
+    items = obj.get("items", []) if isinstance(obj, dict) else []
+    if not isinstance(items, list):
+        return []
+    return [x for x in items if isinstance(x, dict)]
 
-    def patch_evs(evs: Any):
-        if not isinstance(evs, list):
-            return
-        for ev in evs:
-            if not isinstance(ev, dict):
-                continue
-            eid_raw = str(ev.get("id", "") or "").strip()
-            eid = _resolve_allowed_id(allowed, ev_id=eid_raw) or eid_raw
-            if not eid:
-                continue
-            if eid != eid_raw:
-                ev["id"] = eid
-            if "pdf" in ev and "page" in ev:
-                _ensure_evidence_quote(ev, allowed=allowed)
+
+def _has_valid_evidence(
+    x: Dict[str, Any],
+    *,
+    allowed: Dict[str, str],
+    allowed_norm: Optional[Dict[str, str]] = None,
+    allowed_ids: Optional[Set[str]] = None,
+    keys: Tuple[str, ...] = ("diagnosis", "templates"),
+) -> bool:
+    """Whether any entry under `keys` cites at least one allowed evidence id (first hit wins)."""
+    if allowed_ids is None:
+        allowed_ids = _allowed_id_set(allowed)
+    for k in keys:
+        for d in x.get(k, []) or []:
+            if not isinstance(d, dict):
                 continue
-            pdf, page = _evidence_meta_from_allowed(allowed.get(eid, ""))
-            if pdf:
-                ev["pdf"] = pdf
-            if page:
-                ev["page"] = int(page)
-            _ensure_evidence_quote(ev, allowed=allowed)
-
-    for d in obj.get("diagnosis", []) or []:
-        if isinstance(d, dict):
-            patch_evs(d.get("evidence", None))
-    for t in obj.get("templates", []) or []:
-        if isinstance(t, dict):
-            patch_evs(t.get("evidence", None))
-    for it in obj.get("issues", []) or []:
-        if isinstance(it, dict):
-            patch_evs(it.get("evidence", None))
-    for it in obj.get("section_template_hints", []) or []:
-        if isinstance(it, dict):
-            patch_evs(it.get("evidence", None))
+            for ev in d.get("evidence", []) or []:
+                if not isinstance(ev, dict):
+                    continue
+                # Verbatim ids (the usual answer) are settled inline; only variants go through
+                # the normalizing check.
+                raw = _raw_evidence_id(ev.get("id", ""))
+                if not raw:
+                    continue
+                if raw in allowed_ids or _evidence_id_ok(allowed, ev_id=raw, allowed_norm=allowed_norm, allowed_ids=allowed_ids):
+                    return True
+    return False
+
 
+# Item lists in a review answer whose entries carry an "evidence" list.
+_EVIDENCE_BEARING_KEYS = ("diagnosis", "templates", "issues", "section_template_hints")
 
+
+def _attach_evidence_meta(
+    obj: Any,
+    *,
+    allowed: Dict[str, str],
+    allowed_norm: Optional[Dict[str, str]] = None,
+    allowed_text_norm: Optional[Dict[str, str]] = None,
+):
+    # With nothing allowed no id resolves, so there is no pdf/page or quote to attach.
+    if not isinstance(obj, dict) or not allowed:
+        return
+    if allowed_norm is None:
+        allowed_norm = _allowed_norm_map(allowed)
+    if allowed_text_norm is None:
+        allowed_text_norm = {}
+
+    for k in _EVIDENCE_BEARING_KEYS:
+        for d in obj.get(k, None) or ():
+            if not isinstance(d, dict):
+                continue
+            evs = d.get("evidence", None)
+            if not isinstance(evs, list):
+                continue
+            for ev in evs:
+                if not isinstance(ev, dict):
+                    continue
+                eid_raw = _raw_evidence_id(ev.get("id", ""))
+                eid = _resolve_allowed_id(allowed, ev_id=eid_raw, allowed_norm=allowed_norm) or eid_raw
+                if not eid:
+                    continue
+                if eid != eid_raw:
+                    ev["id"] = eid
+                if not ("pdf" in ev and "page" in ev):
+                    pdf, page = _evidence_meta_from_allowed(allowed.get(eid, ""))
+                    if pdf:
+                        ev["pdf"] = pdf
+                    if page:
+                        ev["page"] = int(page)
+                _set_evidence_quote(ev, eid, allowed=allowed, allowed_text_norm=allowed_text_norm)
+
+
+@functools.lru_cache(maxsize=4096)  # see _norm_ws
 def _trim_excerpt(text: str, *, max_chars: int = 380) -> str:
     s = _norm_ws(text)
     if len(s) <= max_chars:
@@ -151,6 +363,18 @@ def _trim_excerpt(text: str, *, max_chars: int = 380) -> str:
     return (s[: max_chars - 1] + "…").strip()
 
 
+def _join_prompt(lines: List[str]) -> str:
+    r"""
+    `"\n".join(lines).strip()`, but trailing blank lines are dropped before joining: stripping them
+    afterwards would copy the whole prompt (`str.strip` only returns the same object when unchanged).
+    """
+    end = len(lines)
+    while end and not lines[end - 1].strip():
+        end -= 1
+    prompt = "\n".join(lines[:end])
+    return prompt.strip() if (prompt[:1].isspace() or prompt[-1:].isspace()) else prompt
+
+
 def _call_llm_json(
     *,
     llm: OpenAICompatClient,
@@ -158,11 +382,38 @@ def _call_llm_json(
     budget: LLMBudget,
     max_tokens: int,
     timeout_s: float = 180.0,
+    cache: Optional[LLMJsonCache] = None,
+    response_schema: Optional[dict] = None,
 ) -> Tuple[Optional[dict], dict]:
     prompt = (prompt or "").strip()
     if not prompt:
         return None, {}
 
+    # JSON mode (or, with structured outputs, the schema) keeps answers to one bare object, so the
+    # review headers carry no "JSON only" line of their own; the system prompt still asks for it
+    # where a gateway drops response_format, and `extract_json` strips any fences that slip through.
+    response_format: Dict[str, Any] = {"type": "json_object"}
+    if response_schema and bool(getattr(llm, "supports_json_schema", False)):
+        response_format = {"type": "json_schema", "json_schema": {"name": "review", "schema": response_schema, "strict": True}}
+
+    # Byte-identical prompts (unchanged text + exemplars across runs) reuse the stored answer:
+    # no network round-trip and no budget spend. The response format is part of the key, so a
+    # schema change (or a gateway gaining structured outputs) does not reuse older answers.
+    cache_key = ""
+    if cache is not None:
+        cache_key = LLMJsonCache.key(
+            model=str(getattr(getattr(llm, "cfg", None), "model", "") or ""),
+            system=_JSON_SYSTEM_PROMPT,
+            prompt=prompt,
+            max_tokens=int(max_tokens or 0),
+            temperature=0.0,
+            response_format=response_format,
+        )
+        hit = cache.get(cache_key)
+        if hit is not None:
+            obj, meta = hit
+            return obj, dict(meta, cached=True)
+
     # If we've already detected a non-recoverable auth/validation issue, stop
     # making repeated calls that will deterministically fail.
     try:
@@ -171,100 +422,476 @@ def _call_llm_json(
     except Exception:
         pass
 
+    # Estimated once; the reminder is a fixed ASCII suffix, so its estimate just adds on.
+    prompt_pt = approx_tokens(prompt)
+    base = max(4096, int(max_tokens or 0))
+
+    # Checked before the breaker so a skipped call never claims the half-open trial.
+    with _BUDGET_LOCK:
+        if budget.would_exceed_budget(approx_prompt_tokens=_JSON_SYSTEM_PROMPT_TOKENS + prompt_pt, max_completion_tokens=base):
+            budget.warnings.append("budget_exceeded: skipped LLM call")
+            return None, {"skipped": True, "reason": "budget_exceeded"}
+
+    breaker = _breaker_for(llm)
+    breaker_key = _breaker_key(llm)
+    if not breaker.allow(breaker_key):
+        return None, {"skipped": True, "reason": "circuit_open"}
+
     # Some gateways (Gemini-style) may truncate JSON when max_tokens is too low
     # because hidden reasoning tokens can count into the cap. Retry once with a
     # larger completion budget and an explicit "JSON only" reminder.
-    base = max(4096, int(max_tokens or 0))
     token_budget = [base, max(8192, base)]
 
     last_meta: dict = {}
     last_content: str = ""
+    # The "JSON only" reminder only helps after a bad/truncated answer, not after an HTTP failure.
+    repair = False
+    # The breaker hears one outcome per call, from its last attempt: True once the provider
+    # answered, False on a transient failure (5xx/429/network). Request errors (400/401/...) say
+    # nothing about the provider's health and leave it None.
+    healthy: Optional[bool] = None
+    try:
+        for attempt in range(2):
+            prompt2 = prompt
+            prompt2_pt = prompt_pt
+            if repair:
+                prompt2 = prompt + _JSON_REPAIR_SUFFIX
+                prompt2_pt = prompt_pt + _JSON_REPAIR_SUFFIX_TOKENS
+
+            max_tok = int(token_budget[min(attempt, len(token_budget) - 1)])
+            approx_pt = _JSON_SYSTEM_PROMPT_TOKENS + prompt2_pt
+            with _BUDGET_LOCK:
+                if budget.would_exceed_budget(approx_prompt_tokens=approx_pt, max_completion_tokens=max_tok):
+                    budget.warnings.append("budget_exceeded: skipped LLM call")
+                    return None, {"skipped": True, "reason": "budget_exceeded"}
 
-    for attempt in range(2):
-        prompt2 = prompt
-        if attempt >= 1:
-            prompt2 = (
-                prompt
-                + "\n\nYour last response was not valid JSON. Return ONLY one JSON object matching OUTPUT_SCHEMA. No markdown, no code fences."
-            )
-
-        max_tok = int(token_budget[min(attempt, len(token_budget) - 1)])
-        approx_pt = approx_tokens("Return STRICT JSON only.") + approx_tokens(prompt2)
-        if budget.would_exceed_budget(approx_prompt_tokens=approx_pt, max_completion_tokens=max_tok):
-            budget.warnings.append("budget_exceeded: skipped LLM call")
-            return None, {"skipped": True, "reason": "budget_exceeded"}
+            try:
+                status, resp = llm.chat(
+                    messages=[
+                        {"role": "system", "content": _JSON_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt2},
+                    ],
+                    temperature=0.0,
+                    max_tokens=max_tok,
+                    response_format=response_format,
+                    timeout_s=float(timeout_s),
+                )
+            except Exception as e:
+                status, resp = 0, {"_error": str(e)[:300]}
+
+            content = extract_first_content(resp)
+            last_content = content or ""
+            usage = extract_usage(resp)
+            with _BUDGET_LOCK:
+                if usage.get("total_tokens", 0) > 0:
+                    budget.add_usage(usage)
+                else:
+                    budget.add_approx(prompt2, content, prompt_tokens=prompt2_pt)
 
-        status, resp = llm.chat(
-            messages=[
-                {"role": "system", "content": "Return STRICT JSON only."},
-                {"role": "user", "content": prompt2},
-            ],
-            temperature=0.0,
-            max_tokens=max_tok,
-            response_format={"type": "json_object"},
-            timeout_s=float(timeout_s),
-        )
+            if int(status or 0) != 200:
+                # Surface important API failures to the user via budget warnings.
+                try:
+                    raw_msg = ""
+                    if isinstance(resp, dict):
+                        if isinstance(resp.get("error", None), dict):
+                            raw_msg = str((resp.get("error", {}) or {}).get("message", "") or "").strip()
+                        if not raw_msg:
+                            raw_msg = str(resp.get("_raw", "") or resp.get("_error", "") or "").strip()
+                    low = raw_msg.lower()
+                    with _BUDGET_LOCK:
+                        if int(status or 0) == 403 and ("verify your account" in low or "validation_required" in low):
+                            n = 0
+                            try:
+                                n = int(budget.inc_error("403_validation_required") or 0)
+                            except Exception:
+                                n = 0
+                            if "llm_error:403_validation_required" not in (budget.warnings or []):
+                                budget.warnings.append("llm_error:403_validation_required")
+                            # Avoid disabling LLM for the whole run on a single transient 403.
+                            if n >= 3 and "llm_blocked:403_validation_required" not in (budget.warnings or []):
+                                budget.warnings.append("llm_blocked:403_validation_required")
+                        else:
+                            w = f"llm_error:http_{int(status or 0)}"
+                            if w not in (budget.warnings or []):
+                                budget.warnings.append(w)
+                except Exception:
+                    pass
+                last_meta = {"status": int(status or 0), "raw": (content or "")[:600]}
+                if not _is_transient_response(int(status or 0), resp if isinstance(resp, dict) else {}):
+                    # Auth/request errors fail the same way on every resend.
+                    break
+                healthy = False
+                if attempt < 1:
+                    time.sleep(random.uniform(0.0, min(_RETRY_MAX_DELAY_S, _RETRY_BASE_DELAY_S * (2**attempt))))
+                continue
 
-        content = extract_first_content(resp)
-        last_content = content or ""
-        usage = extract_usage(resp)
-        if usage.get("total_tokens", 0) > 0:
-            budget.add_usage(usage)
-        else:
-            budget.add_approx(prompt2, content)
+            healthy = True
 
-        if int(status or 0) != 200:
-            # Surface important API failures to the user via budget warnings.
+            # If the provider explicitly reports truncation, retry with a larger budget.
             try:
-                raw_msg = ""
+                fr = ""
                 if isinstance(resp, dict):
-                    if isinstance(resp.get("error", None), dict):
-                        raw_msg = str((resp.get("error", {}) or {}).get("message", "") or "").strip()
-                    if not raw_msg:
-                        raw_msg = str(resp.get("_raw", "") or resp.get("_error", "") or "").strip()
-                low = raw_msg.lower()
-                if int(status or 0) == 403 and ("verify your account" in low or "validation_required" in low):
-                    n = 0
-                    try:
-                        n = int(budget.inc_error("403_validation_required") or 0)
-                    except Exception:
-                        n = 0
-                    if "llm_error:403_validation_required" not in (budget.warnings or []):
-                        budget.warnings.append("llm_error:403_validation_required")
-                    # Avoid disabling LLM for the whole run on a single transient 403.
-                    if n >= 3 and "llm_blocked:403_validation_required" not in (budget.warnings or []):
-                        budget.warnings.append("llm_blocked:403_validation_required")
-                else:
-                    w = f"llm_error:http_{int(status or 0)}"
-                    if w not in (budget.warnings or []):
-                        budget.warnings.append(w)
+                    choices = resp.get("choices", [])
+                    if isinstance(choices, list) and choices and isinstance(choices[0], dict):
+                        fr = str(choices[0].get("finish_reason", "") or "").strip().lower()
+                if fr == "length":
+                    last_meta = {"status": int(status or 0), "raw": (content or "")[:600], "truncated": True}
+                    repair = True
+                    continue
             except Exception:
                 pass
-            last_meta = {"status": int(status or 0), "raw": (content or "")[:600]}
-            continue
 
-        # If the provider explicitly reports truncation, retry with a larger budget.
+            obj = extract_json(content) if isinstance(content, str) else None
+            if isinstance(obj, dict):
+                meta = {"status": int(status or 0)}
+                if cache is not None:
+                    cache.put(cache_key, obj, meta)
+                return obj, meta
+
+            last_meta = {"status": int(status or 0), "raw": (content or "")[:600], "parse_error": True}
+            repair = True
+
+        if not last_meta:
+            last_meta = {"status": 0, "raw": (last_content or "")[:600]}
+        return None, last_meta
+    finally:
+        if healthy is True:
+            breaker.record_success(breaker_key)
+        elif healthy is False:
+            if breaker.record_failure(breaker_key):
+                with _BUDGET_LOCK:
+                    if "llm_error:circuit_open" not in (budget.warnings or []):
+                        budget.warnings.append("llm_error:circuit_open")
+        else:
+            breaker.release(breaker_key)
+
+
+def _default_llm_workers() -> int:
+    raw = (os.environ.get("TOPHUMANWRITING_LLM_WORKERS", "") or "").strip()
+    if raw:
         try:
-            fr = ""
-            if isinstance(resp, dict):
-                choices = resp.get("choices", [])
-                if isinstance(choices, list) and choices and isinstance(choices[0], dict):
-                    fr = str(choices[0].get("finish_reason", "") or "").strip().lower()
-            if fr == "length":
-                last_meta = {"status": int(status or 0), "raw": (content or "")[:600], "truncated": True}
-                continue
+            return max(1, int(raw))
         except Exception:
             pass
+    return _DEFAULT_LLM_WORKERS
+
 
-        obj = extract_json(content) if isinstance(content, str) else None
-        if isinstance(obj, dict):
-            return obj, {"status": int(status or 0)}
+# Long-lived batch threads: the client keeps one keep-alive connection per thread, so reusing the
+# threads across review passes reuses their connections instead of re-handshaking every pass.
+# One pool per worker count, never shut down: a pass holding its executor can always submit to it,
+# even while another pass runs with a different worker setting.
+_LLM_POOLS: Dict[int, ThreadPoolExecutor] = {}
+_LLM_POOL_LOCK = threading.Lock()
 
-        last_meta = {"status": int(status or 0), "raw": (content or "")[:600], "parse_error": True}
 
-    if not last_meta:
-        last_meta = {"status": 0, "raw": (last_content or "")[:600]}
-    return None, last_meta
+def _get_llm_pool(workers: int) -> ThreadPoolExecutor:
+    with _LLM_POOL_LOCK:
+        pool = _LLM_POOLS.get(int(workers))
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=int(workers), thread_name_prefix="llm-batch")
+            _LLM_POOLS[int(workers)] = pool
+        return pool
+
+
+def _call_llm_json_batches(
+    *,
+    llm: OpenAICompatClient,
+    prompts: Iterable[str],
+    budget: LLMBudget,
+    max_tokens: int,
+    timeout_s: float = 180.0,
+    workers: Optional[int] = None,
+    on_done: Optional[Callable[[int], None]] = None,
+    cache: Optional[LLMJsonCache] = None,
+    response_schema: Optional[dict] = None,
+    max_prompts: int = 0,
+) -> List[Tuple[Optional[dict], dict]]:
+    """
+    `_call_llm_json` for every prompt, results in prompt order.
+
+    Batches are independent round-trips, so they run on a small thread pool. Concurrent calls
+    all pass the per-call budget check before any usage comes back, so each send first checks that
+    the calls in flight plus this one fit the budget together at their full completion reserve.
+    When they might not, the in-flight calls are drained and this call runs alone (re-checking the
+    budget on its own); later calls go back to the pool once they fit again. Calls not sent yet
+    are checked when their turn comes. `on_done(i)` is called from the calling thread as batch `i`
+    finishes.
+
+    `prompts` may also be a lazy iterable (about `max_prompts` items; 1 or fewer skips the pool).
+    Each prompt is sent as soon as it is built, so building the next ones (retrieval, trimming)
+    overlaps the calls already in flight.
+    """
+    n_max = len(prompts) if isinstance(prompts, list) else max(0, int(max_prompts or 0))
+    pool_workers = int(workers) if workers is not None else _default_llm_workers()
+    completion_reserve = max(4096, int(max_tokens or 0))
+
+    def call(prompt: str) -> Tuple[Optional[dict], dict]:
+        return _call_llm_json(
+            llm=llm,
+            prompt=prompt,
+            budget=budget,
+            max_tokens=max_tokens,
+            timeout_s=timeout_s,
+            cache=cache,
+            response_schema=response_schema,
+        )
+
+    results: List[Tuple[Optional[dict], dict]] = []
+    if min(n_max, pool_workers) <= 1:
+        for i, prompt in enumerate(prompts):
+            results.append(call(prompt))
+            if on_done:
+                on_done(i)
+        return results
+
+    ex = _get_llm_pool(pool_workers)
+    pending: Dict[Future, Tuple[int, int]] = {}
+
+    def collect(done: Iterable[Future]) -> None:
+        for fut in done:
+            i, _pt = pending.pop(fut)
+            try:
+                results[i] = fut.result()
+            except Exception:
+                results[i] = (None, {})
+            if on_done:
+                on_done(i)
+
+    try:
+        for i, prompt in enumerate(prompts):
+            results.append((None, {}))
+            pt = _JSON_SYSTEM_PROMPT_TOKENS + approx_tokens(prompt)
+            if pending:
+                collect(wait(pending, timeout=0).done)
+            in_flight_pt = sum(v[1] for v in pending.values())
+            with _BUDGET_LOCK:
+                tight = budget.would_exceed_budget(
+                    approx_prompt_tokens=in_flight_pt + pt,
+                    max_completion_tokens=(len(pending) + 1) * completion_reserve,
+                )
+            if tight and pending:
+                collect(wait(pending).done)
+            if tight:
+                results[i] = call(prompt)
+                if on_done:
+                    on_done(i)
+            else:
+                pending[ex.submit(call, prompt)] = (i, pt)
+    finally:
+        # Also on a failing prompt source: in-flight calls still finish and record their usage.
+        if pending:
+            collect(wait(pending).done)
+    return results
+
+
+_SearchFn = Callable[[str, int], List[Tuple[float, Dict[str, Any]]]]
+_SearchBatchFn = Callable[[List[str], int], List[List[Tuple[float, Dict[str, Any]]]]]
+
+
+class _MemoizedSearch:
+    """
+    Exact-query memo around a retrieval callback for one review pass.
+
+    Duplicate paragraphs, or tokens whose context is the same sentence, would otherwise repeat the
+    same embedding + vector search. Failed searches are not memoized.
+
+    With a `search_batch` callback, `prefetch` answers a whole review batch's queries in one
+    backend call (one embedding pass for all of them); later lookups are then memo hits.
+    """
+
+    def __init__(self, search: _SearchFn, search_batch: Optional[_SearchBatchFn] = None):
+        self._search = search
+        self._search_batch = search_batch
+        self._memo: Dict[Tuple[str, int], List[Tuple[float, Dict[str, Any]]]] = {}
+
+    def __call__(self, query: str, k: int) -> List[Tuple[float, Dict[str, Any]]]:
+        key = (query, int(k))
+        hits = self._memo.get(key)
+        if hits is None:
+            hits = self._memo[key] = list(self._search(query, k) or [])
+        return list(hits)
+
+    def prefetch(self, queries: Iterable[str], k: int) -> None:
+        if self._search_batch is None:
+            return
+        k = int(k)
+        todo: List[str] = []
+        for q in queries:
+            if q and (q, k) not in self._memo and q not in todo:
+                todo.append(q)
+        # A single query gains nothing from the batch path.
+        if len(todo) < 2:
+            return
+        try:
+            res = self._search_batch(todo, k)
+        except Exception:
+            return
+        # A short or malformed answer leaves those queries to the per-query path.
+        if not isinstance(res, list) or len(res) != len(todo):
+            return
+        for q, hits in zip(todo, res):
+            self._memo[(q, k)] = list(hits or [])
+
+
+def _memoize_search(search: _SearchFn, search_batch: Optional[_SearchBatchFn] = None) -> _MemoizedSearch:
+    return _MemoizedSearch(search, search_batch)
+
+
+def _coverage_counts(
+    coverage: Optional[ReviewCoverageStore], category: str, cands: List[Any]
+) -> Tuple[Dict[str, int], Dict[int, int]]:
+    """
+    Seen counts by `_stable_key` and by page for the candidates, via the store's bulk lookups.
+
+    `page_seen_count` scans the whole category, so calling it from a sort key is quadratic.
+    """
+    if coverage is None:
+        return {}, {}
+    keys: List[str] = []
+    pages: List[int] = []
+    for it in cands:
+        if not isinstance(it, dict):
+            continue
+        keys.append(str(it.get("_stable_key", "") or ""))
+        pages.append(int(it.get("page", 0) or 0))
+    keys = list(dict.fromkeys(k for k in keys if k))
+    pages = list(dict.fromkeys(p for p in pages if p > 0))
+    seen_by_key = dict(zip(keys, (int(n) for n in coverage.seen_counts(category, keys))))
+    page_seen_by_page = dict(zip(pages, (int(n) for n in coverage.page_seen_counts(category, pages))))
+    return seen_by_key, page_seen_by_page
+
+
+def _pick_page_capped(
+    cands: List[Dict[str, Any]], *, key: Callable[[Dict[str, Any]], Any], top_n: int, max_per_page: int
+) -> List[Dict[str, Any]]:
+    """
+    The first `top_n` candidates in `key` order, taking at most `max_per_page` from any one page.
+
+    Picks from a heap shortlist instead of sorting every candidate; only when the page caps
+    exhaust the shortlist does it fall back to the full sort, so the result is the same.
+    """
+    limit = max(1, int(top_n))
+    cap_n = int(max_per_page)
+
+    def cap(ordered: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        picked: List[Dict[str, Any]] = []
+        per_page: Counter[int] = Counter()
+        for it in ordered:
+            try:
+                page = int(it.get("page", 0) or 0)
+            except Exception:
+                page = 0
+            if page > 0:
+                if cap_n > 0 and per_page[page] >= cap_n:
+                    continue
+                per_page[page] += 1
+            picked.append(it)
+            if len(picked) >= limit:
+                break
+        return picked
+
+    n_short = max(limit * 3, limit + max(0, int(max_per_page)))
+    if n_short >= len(cands):
+        return cap(sorted(cands, key=key))
+    picked = cap(heapq.nsmallest(n_short, cands, key=key))
+    if len(picked) < limit:
+        picked = cap(sorted(cands, key=key))
+    return picked
+
+
+def _strict_object(props: Dict[str, Any]) -> Dict[str, Any]:
+    # Strict structured outputs require every property listed and no extras.
+    return {"type": "object", "properties": props, "required": list(props), "additionalProperties": False}
+
+
+_STR = {"type": "string"}
+_INT = {"type": "integer"}
+_EVIDENCE_LIST_SCHEMA = {"type": "array", "items": _strict_object({"id": _STR, "quote": _STR})}
+_DIAGNOSIS_LIST_SCHEMA = {
+    "type": "array",
+    "items": _strict_object({"problem": _STR, "suggestion": _STR, "evidence": _EVIDENCE_LIST_SCHEMA}),
+}
+_TEMPLATE_LIST_SCHEMA = {"type": "array", "items": _strict_object({"text": _STR, "evidence": _EVIDENCE_LIST_SCHEMA})}
+
+
+def _review_items_schema(props: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON Schema for {"items": [...]} answers: per-item `props` plus diagnosis/templates."""
+    item = _strict_object(dict(props, diagnosis=_DIAGNOSIS_LIST_SCHEMA, templates=_TEMPLATE_LIST_SCHEMA))
+    return _strict_object({"items": {"type": "array", "items": item}})
+
+
+# Review prompt heads (instructions + OUTPUT_SCHEMA) never change, so each is joined once at import
+# and batches only append their own lines.
+_SENTENCE_REVIEW_HEADER = "\n".join(
+    (
+        "You are a strict academic writing reviewer. Focus on STYLE alignment to exemplars, not new content.",
+        "You must be conservative: avoid adding facts, numbers, citations, or new entities.",
+        "For each target sentence, explain why it sounds unlike the exemplars and propose actionable edits as templates (NOT a full rewrite).",
+        "WHITE-BOX: every point must cite at least one provided exemplar excerpt by id.",
+        "Exemplar excerpts are listed once under EXEMPLARS; each target's EVIDENCE line names the ones retrieved for it.",
+        "Evidence quote can be empty, but if non-empty it MUST be an exact substring of that excerpt.",
+        "",
+        "OUTPUT_SCHEMA (JSON):",
+        json.dumps(
+            {
+                "items": [
+                    {
+                        "id": 12,
+                        "diagnosis": [
+                            {
+                                "problem": "…",
+                                "suggestion": "…",
+                                "evidence": [{"id": "E1", "quote": "exact substring"}],
+                            }
+                        ],
+                        "templates": [
+                            {"text": "In this paper, we …", "evidence": [{"id": "E2", "quote": "exact substring"}]}
+                        ],
+                    }
+                ]
+            },
+            ensure_ascii=False,
+        ),
+        "",
+    )
+)
+_SENTENCE_REVIEW_SCHEMA = _review_items_schema({"id": _INT})
+
+_SENTENCE_REVIEW_HEADER_TOKENS = approx_tokens(_SENTENCE_REVIEW_HEADER)
+# Rough completion need per reviewed target (the old fixed 6-target batches used 1500).
+_COMPLETION_TOKENS_PER_TARGET = 250
+# Per-target line overhead (ids, labels, newlines) on top of the excerpt text.
+_PACK_ITEM_OVERHEAD_TOKENS = 16
+
+
+def _iter_pack_batches(
+    item_tokens: Iterable[int], *, head_tokens: int, max_items: int, max_prompt_tokens: int = 0
+) -> Iterator[Tuple[int, int]]:
+    """
+    Contiguous [start, end) batches over `item_tokens`. Without a token cap this is the fixed
+    `max_items` stride; with one, a batch grows until the next item would push the prompt past
+    `max_prompt_tokens` (every batch still takes at least one item). A batch is yielded as soon
+    as the item after it is seen, so items can be produced lazily.
+    """
+    step = max(1, int(max_items))
+    cap = int(max_prompt_tokens or 0)
+    start = 0
+    n = 0
+    used = int(head_tokens)
+    for i, t in enumerate(item_tokens):
+        cost = int(t) + _PACK_ITEM_OVERHEAD_TOKENS
+        if i > start and (i - start >= step or (cap > 0 and used + cost > cap)):
+            yield (start, i)
+            start = i
+            used = int(head_tokens)
+        used += cost
+        n = i + 1
+    if start < n:
+        yield (start, n)
+
+
+def _pack_batches(item_tokens: List[int], *, head_tokens: int, max_items: int, max_prompt_tokens: int = 0) -> List[Tuple[int, int]]:
+    return list(_iter_pack_batches(item_tokens, head_tokens=head_tokens, max_items=max_items, max_prompt_tokens=max_prompt_tokens))
 
 
 def review_sentence_alignment(
@@ -277,7 +904,14 @@ def review_sentence_alignment(
     batch_size: int = 6,
     evidence_top_k: int = 3,
     progress_cb: Optional[Callable[[str, int, int, str], None]] = None,
+    cache: Optional[LLMJsonCache] = None,
+    max_prompt_tokens: int = 0,
 ) -> Dict[str, Any]:
+    """
+    With `max_prompt_tokens` > 0, batches are packed greedily up to that prompt size (and at most
+    `batch_size` targets) instead of a fixed `batch_size` stride, so the shared instruction/schema
+    head is paid by as many targets as fit.
+    """
     if llm is None:
         return {"items": [], "skipped": True, "reason": "llm_not_configured"}
 
@@ -307,12 +941,14 @@ def review_sentence_alignment(
         id_to_page[sid] = page
         it["_stable_key"] = key
 
+    seen_by_key, page_seen_by_page = _coverage_counts(coverage, "sentence_alignment", cands)
+
     def cov_key(it: dict) -> Tuple[int, int, int, float]:
         base = score_key(it)
         page = int(it.get("page", 0) or 0)
         key = str(it.get("_stable_key", "") or "")
-        seen = int(coverage.seen_count("sentence_alignment", key)) if (coverage is not None and key) else 0
-        page_seen = int(coverage.page_seen_count("sentence_alignment", page)) if (coverage is not None and page) else 0
+        seen = seen_by_key.get(key, 0) if key else 0
+        page_seen = page_seen_by_page.get(page, 0) if page else 0
         return (0 if seen <= 0 else 1, page_seen, int(base[0]), float(base[1]))
 
     # Prefer unseen targets to avoid repeatedly reviewing the same unchanged text across iterations.
@@ -322,108 +958,112 @@ def review_sentence_alignment(
             key = str(it.get("_stable_key", "") or "")
             if not key:
                 continue
-            if int(coverage.seen_count("sentence_alignment", key)) <= 0:
+            if seen_by_key.get(key, 0) <= 0:
                 unseen.append(it)
         if unseen:
             cands = unseen
         else:
             return {"items": [], "skipped": True, "reason": "all_seen"}
 
-    cands.sort(key=cov_key)
     # Page-cap to spread attention across the paper (avoid over-focusing on a single page/section).
-    max_per_page = 12
-    picked = []
-    per_page: Dict[int, int] = {}
-    for it in cands:
-        try:
-            page = int(it.get("page", 0) or 0)
-        except Exception:
-            page = 0
-        if page > 0 and max_per_page > 0:
-            if int(per_page.get(page, 0) or 0) >= int(max_per_page):
-                continue
-        picked.append(it)
-        if page > 0:
-            per_page[page] = int(per_page.get(page, 0) or 0) + 1
-        if len(picked) >= max(1, int(top_n)):
-            break
-    cands = picked
+    cands = _pick_page_capped(cands, key=cov_key, top_n=top_n, max_per_page=12)
 
     out_map: Dict[int, Dict[str, Any]] = {}
 
-    total = len(cands)
+    # Per-target prompt blocks (id, TEXT line, exemplar id -> text). Targets without exemplars are
+    # left out: an answer for them has no evidence to cite and would be dropped after the call.
+    blocks: List[Tuple[int, str, List[Tuple[str, str]]]] = []
+    for it in cands:
+        sid = int(it.get("id", -1) or -1)
+        txt = str(it.get("text", "") or "").strip()
+        if sid < 0 or not txt:
+            continue
+        exs = ((it.get("alignment") or {}).get("exemplars", []) or [])[: max(1, int(evidence_top_k))]
+        if not exs:
+            continue
+        evs = [
+            (
+                f"S{sid}_E{ej}",
+                f"[{str(ex.get('pdf', '') or '')}#p{int(ex.get('page', 0) or 0)}] "
+                f"{_trim_excerpt(str(ex.get('text', '') or ''), max_chars=520)}",
+            )
+            for ej, ex in enumerate(exs, start=1)
+        ]
+        blocks.append((sid, f"TEXT: {_trim_excerpt(txt, max_chars=520)}", evs))
+    total = len(blocks)
     if total <= 0:
         return {"items": [], "skipped": True, "reason": "no_candidates"}
 
-    for start in range(0, total, max(1, int(batch_size))):
-        batch = cands[start : start + max(1, int(batch_size))]
+    ranges = _pack_batches(
+        [approx_tokens(b[1]) + sum(approx_tokens(t) for _i, t in b[2]) for b in blocks],
+        head_tokens=_SENTENCE_REVIEW_HEADER_TOKENS,
+        max_items=batch_size,
+        max_prompt_tokens=max_prompt_tokens,
+    )
+    jobs: List[Tuple[str, Dict[str, str], int, int]] = []
+    for start, end in ranges:
+        # Neighbouring targets often retrieve the same exemplar passages: each distinct excerpt is
+        # written once as E<n>, and targets list the ids they got. The per-target S<id>_E<j> names
+        # stay valid aliases for answers that still use them.
         allowed: Dict[str, str] = {}
-        prompt_lines: List[str] = []
-        prompt_lines.append("You are a strict academic writing reviewer. Focus on STYLE alignment to exemplars, not new content.")
-        prompt_lines.append("You must be conservative: avoid adding facts, numbers, citations, or new entities.")
-        prompt_lines.append("For each target sentence, explain why it sounds unlike the exemplars and propose actionable edits as templates (NOT a full rewrite).")
-        prompt_lines.append("Return ONLY JSON. No markdown, no code fences.")
-        prompt_lines.append("WHITE-BOX: every point must cite at least one provided exemplar excerpt by id.")
-        prompt_lines.append("Evidence quote can be empty, but if non-empty it MUST be an exact substring of that excerpt.")
-        prompt_lines.append("")
-        prompt_lines.append("OUTPUT_SCHEMA (JSON):")
-        prompt_lines.append(
-            json.dumps(
-                {
-                    "items": [
-                        {
-                            "id": 12,
-                            "diagnosis": [
-                                {
-                                    "problem": "…",
-                                    "suggestion": "…",
-                                    "evidence": [{"id": "S12_E1", "quote": "exact substring"}],
-                                }
-                            ],
-                            "templates": [
-                                {"text": "In this paper, we …", "evidence": [{"id": "S12_E2", "quote": "exact substring"}]}
-                            ],
-                        }
-                    ]
-                },
-                ensure_ascii=False,
-            )
-        )
-        prompt_lines.append("")
-
-        for bi, it in enumerate(batch):
-            sid = int(it.get("id", -1) or -1)
-            txt = str(it.get("text", "") or "").strip()
-            if sid < 0 or not txt:
-                continue
-            prompt_lines.append(f"T{bi}: id={sid}")
-            prompt_lines.append("TEXT: " + _trim_excerpt(txt, max_chars=520))
-            exs = ((it.get("alignment") or {}).get("exemplars", []) or [])[: max(1, int(evidence_top_k))]
-            for ej, ex in enumerate(exs, start=1):
-                ev_id = f"S{sid}_E{ej}"
-                ev_txt = _trim_excerpt(str(ex.get("text", "") or ""), max_chars=520)
-                meta = f"[{str(ex.get('pdf', '') or '')}#p{int(ex.get('page', 0) or 0)}] "
-                allowed[ev_id] = meta + ev_txt
-                prompt_lines.append(f"{ev_id}: " + allowed[ev_id])
+        exemplar_ids: Dict[str, str] = {}
+        exemplar_lines: List[str] = ["EXEMPLARS:"]
+        target_lines: List[str] = []
+        for bi, (sid, text_line, evs) in enumerate(blocks[start:end]):
+            target_lines.append(f"T{bi}: id={sid}")
+            target_lines.append(text_line)
+            ids: List[str] = []
+            for ev_id, ev_text in evs:
+                gid = exemplar_ids.get(ev_text)
+                if gid is None:
+                    gid = exemplar_ids[ev_text] = f"E{len(exemplar_ids) + 1}"
+                    allowed[gid] = ev_text
+                    exemplar_lines.append(f"{gid}: {ev_text}")
+                allowed[ev_id] = ev_text
+                ids.append(gid)
+            if ids:
+                target_lines.append("EVIDENCE: " + ", ".join(dict.fromkeys(ids)))
+            target_lines.append("")
+        prompt_lines = [_SENTENCE_REVIEW_HEADER]
+        if exemplar_ids:
+            prompt_lines.extend(exemplar_lines)
             prompt_lines.append("")
+        prompt_lines.extend(target_lines)
+        jobs.append((_join_prompt(prompt_lines), allowed, start, end))
+
+    n_reviewed = 0
 
-        prompt = "\n".join(prompt_lines).strip()
+    def batch_done(i: int) -> None:
+        nonlocal n_reviewed
+        _p, _a, lo, hi = jobs[i]
+        n_reviewed += hi - lo
         if progress_cb:
             try:
-                progress_cb("llm_sentence", min(start, total), total, f"{start+1}-{min(total, start+len(batch))}")
+                progress_cb("llm_sentence", n_reviewed, total, f"{lo+1}-{hi}")
             except Exception:
                 pass
 
-        obj, meta = _call_llm_json(llm=llm, prompt=prompt, budget=budget, max_tokens=1500, timeout_s=180.0)
-        if obj is None:
-            continue
-        items = obj.get("items", [])
-        if not isinstance(items, list):
+    # Completion size grows with the number of targets in a packed batch.
+    max_tokens = max(1500, _COMPLETION_TOKENS_PER_TARGET * max(hi - lo for _p, _a, lo, hi in jobs))
+    results = _call_llm_json_batches(
+        llm=llm,
+        prompts=[j[0] for j in jobs],
+        budget=budget,
+        max_tokens=max_tokens,
+        timeout_s=180.0,
+        on_done=batch_done,
+        cache=cache,
+        response_schema=_SENTENCE_REVIEW_SCHEMA,
+    )
+    for (_prompt, allowed, _lo, _hi), (obj, meta) in zip(jobs, results):
+        items = _response_items(obj)
+        if not items:
             continue
 
+        allowed_norm = _allowed_norm_map(allowed)
+        allowed_ids = _allowed_id_set(allowed)
+        allowed_text_norm: Dict[str, str] = {}
         for x in items:
-            if not isinstance(x, dict):
-                continue
             try:
                 sid = int(x.get("id", -1))
             except Exception:
@@ -432,33 +1072,9 @@ def review_sentence_alignment(
                 continue
 
             # Validate evidence ids (quote may be missing; we can attach a verified excerpt later).
-            ok_any = False
-            for d in x.get("diagnosis", []) or []:
-                if not isinstance(d, dict):
-                    continue
-                for ev in d.get("evidence", []) or []:
-                    if not isinstance(ev, dict):
-                        continue
-                    if _evidence_id_ok(allowed, ev_id=str(ev.get("id", "") or "")):
-                        ok_any = True
-                        break
-                if ok_any:
-                    break
-            if not ok_any:
-                for t in x.get("templates", []) or []:
-                    if not isinstance(t, dict):
-                        continue
-                    for ev in t.get("evidence", []) or []:
-                        if not isinstance(ev, dict):
-                            continue
-                        if _evidence_id_ok(allowed, ev_id=str(ev.get("id", "") or "")):
-                            ok_any = True
-                            break
-                    if ok_any:
-                        break
-            if not ok_any:
+            if not _has_valid_evidence(x, allowed=allowed, allowed_norm=allowed_norm, allowed_ids=allowed_ids):
                 continue
-            _attach_evidence_meta(x, allowed=allowed)
+            _attach_evidence_meta(x, allowed=allowed, allowed_norm=allowed_norm, allowed_text_norm=allowed_text_norm)
             if coverage is not None:
                 key = id_to_key.get(sid, "")
                 page = id_to_page.get(sid, 0)
@@ -472,6 +1088,48 @@ def review_sentence_alignment(
     return {"items": out_items, "skipped": False}
 
 
+_OUTLINE_REVIEW_HEADER = "\n".join(
+    (
+        "You review a paper's section outline compared to exemplar outlines.",
+        "Focus on structure: missing/odd sections, ordering, granularity, and transitions between sections.",
+        "Do NOT rewrite content. Output actionable suggestions as checklists and section-template hints.",
+        "WHITE-BOX: cite exemplars by id.",
+        "Evidence quote can be empty, but if non-empty it MUST be an exact substring of the provided outline text.",
+        "",
+        "OUTPUT_SCHEMA (JSON):",
+        json.dumps(
+            {
+                "summary": "…",
+                "issues": [
+                    {
+                        "problem": "missing_methods_section",
+                        "detail": "…",
+                        "suggestion": "…",
+                        "evidence": [{"id": "O1", "quote": "exact substring"}],
+                    }
+                ],
+                "section_template_hints": [{"canonical": "methods", "hint": "…", "evidence": [{"id": "O2", "quote": "exact substring"}]}],
+            },
+            ensure_ascii=False,
+        ),
+        "",
+    )
+)
+_OUTLINE_REVIEW_SCHEMA = _strict_object(
+    {
+        "summary": _STR,
+        "issues": {
+            "type": "array",
+            "items": _strict_object({"problem": _STR, "detail": _STR, "suggestion": _STR, "evidence": _EVIDENCE_LIST_SCHEMA}),
+        },
+        "section_template_hints": {
+            "type": "array",
+            "items": _strict_object({"canonical": _STR, "hint": _STR, "evidence": _EVIDENCE_LIST_SCHEMA}),
+        },
+    }
+)
+
+
 def review_outline_structure(
     *,
     paper_headings: List[Dict[str, Any]],
@@ -480,6 +1138,7 @@ def review_outline_structure(
     llm: Optional[OpenAICompatClient],
     coverage: Optional[ReviewCoverageStore] = None,
     progress_cb: Optional[Callable[[str, int, int, str], None]] = None,
+    cache: Optional[LLMJsonCache] = None,
 ) -> Dict[str, Any]:
     if llm is None:
         return {"skipped": True, "reason": "llm_not_configured"}
@@ -493,33 +1152,7 @@ def review_outline_structure(
         return {"skipped": True, "reason": "all_seen"}
 
     allowed: Dict[str, str] = {}
-    lines: List[str] = []
-    lines.append("You review a paper's section outline compared to exemplar outlines.")
-    lines.append("Focus on structure: missing/odd sections, ordering, granularity, and transitions between sections.")
-    lines.append("Do NOT rewrite content. Output actionable suggestions as checklists and section-template hints.")
-    lines.append("Return ONLY JSON. No markdown, no code fences.")
-    lines.append("WHITE-BOX: cite exemplars by id.")
-    lines.append("Evidence quote can be empty, but if non-empty it MUST be an exact substring of the provided outline text.")
-    lines.append("")
-    lines.append("OUTPUT_SCHEMA (JSON):")
-    lines.append(
-        json.dumps(
-            {
-                "summary": "…",
-                "issues": [
-                    {
-                        "problem": "missing_methods_section",
-                        "detail": "…",
-                        "suggestion": "…",
-                        "evidence": [{"id": "O1", "quote": "exact substring"}],
-                    }
-                ],
-                "section_template_hints": [{"canonical": "methods", "hint": "…", "evidence": [{"id": "O2", "quote": "exact substring"}]}],
-            },
-            ensure_ascii=False,
-        )
-    )
-    lines.append("")
+    lines: List[str] = [_OUTLINE_REVIEW_HEADER]
 
     lines.append("PAPER_OUTLINE:")
     for h in paper_headings[:80]:
@@ -547,33 +1180,58 @@ def review_outline_structure(
         except Exception:
             pass
 
-    prompt = "\n".join(lines).strip()
-    obj, meta = _call_llm_json(llm=llm, prompt=prompt, budget=budget, max_tokens=900, timeout_s=180.0)
+    prompt = _join_prompt(lines)
+    obj, meta = _call_llm_json(
+        llm=llm,
+        prompt=prompt,
+        budget=budget,
+        max_tokens=900,
+        timeout_s=180.0,
+        cache=cache,
+        response_schema=_OUTLINE_REVIEW_SCHEMA,
+    )
     if not isinstance(obj, dict):
         return {"skipped": True, "reason": "llm_failed"}
 
     # Validate at least one evidence id exists (quote may be missing; we will attach a verified excerpt).
-    ok_any = False
-    for it in obj.get("issues", []) or []:
-        if not isinstance(it, dict):
-            continue
-        for ev in it.get("evidence", []) or []:
-            if not isinstance(ev, dict):
-                continue
-            if _evidence_id_ok(allowed, ev_id=str(ev.get("id", "") or "")):
-                ok_any = True
-                break
-        if ok_any:
-            break
-    if not ok_any:
+    allowed_norm = _allowed_norm_map(allowed)
+    if not _has_valid_evidence(obj, allowed=allowed, allowed_norm=allowed_norm, keys=("issues",)):
         return {"skipped": True, "reason": "invalid_evidence"}
-    _attach_evidence_meta(obj, allowed=allowed)
+    _attach_evidence_meta(obj, allowed=allowed, allowed_norm=allowed_norm)
     obj["skipped"] = False
     if coverage is not None:
         coverage.mark_seen("outline", outline_key, page=0, meta={"kind": "outline"})
     return obj
 
 
+_CITATION_STYLE_REVIEW_HEADER = "\n".join(
+    (
+        "You review in-text citation sentence style compared to exemplar citation sentences.",
+        "Goal: make the sentence sound like top papers while keeping the same meaning (no new claims).",
+        "Do NOT produce a full rewrite; only output diagnosis + template snippets.",
+        "WHITE-BOX: cite exemplar sentences by id.",
+        "Evidence quote can be empty, but if non-empty it MUST be an exact substring of provided exemplar text.",
+        "",
+        "OUTPUT_SCHEMA (JSON):",
+        json.dumps(
+            {
+                "items": [
+                    {
+                        "page": 3,
+                        "sentence": "…",
+                        "diagnosis": [{"problem": "…", "suggestion": "…", "evidence": [{"id": "CSd34db33f_E1", "quote": "…"}]}],
+                        "templates": [{"text": "Consistent with …, we …", "evidence": [{"id": "CSd34db33f_E2", "quote": "…"}]}],
+                    }
+                ]
+            },
+            ensure_ascii=False,
+        ),
+        "",
+    )
+)
+_CITATION_STYLE_REVIEW_SCHEMA = _review_items_schema({"page": _INT, "sentence": _STR})
+
+
 def review_citation_style(
     *,
     paper_citation_sentences: List[Dict[str, Any]],
@@ -585,11 +1243,13 @@ def review_citation_style(
     batch_size: int = 6,
     evidence_top_k: int = 3,
     progress_cb: Optional[Callable[[str, int, int, str], None]] = None,
+    cache: Optional[LLMJsonCache] = None,
 ) -> Dict[str, Any]:
     if llm is None:
         return {"items": [], "skipped": True, "reason": "llm_not_configured"}
     if not paper_citation_sentences:
         return {"items": [], "skipped": True, "reason": "no_citations"}
+    cite_search = _memoize_search(cite_search)
 
     # Pick richer citation sentences first (more cited items, longer).
     def key(it: dict) -> Tuple[int, int]:
@@ -608,11 +1268,13 @@ def review_citation_style(
         page = int(it.get("page", 0) or 0)
         it["_stable_key"] = stable_text_key(prefix="cs", page=page, text=sent_raw)
 
+    seen_by_key, page_seen_by_page = _coverage_counts(coverage, "citation_style", cands)
+
     def cov_key(it: dict) -> Tuple[int, int, int, int]:
         page = int(it.get("page", 0) or 0)
         sk = str(it.get("_stable_key", "") or "")
-        seen = int(coverage.seen_count("citation_style", sk)) if (coverage is not None and sk) else 0
-        page_seen = int(coverage.page_seen_count("citation_style", page)) if (coverage is not None and page) else 0
+        seen = seen_by_key.get(sk, 0) if sk else 0
+        page_seen = page_seen_by_page.get(page, 0) if page else 0
         base = key(it)
         return (0 if seen <= 0 else 1, page_seen, int(base[0]), int(base[1]))
 
@@ -622,128 +1284,97 @@ def review_citation_style(
             sk = str(it.get("_stable_key", "") or "")
             if not sk:
                 continue
-            if int(coverage.seen_count("citation_style", sk)) <= 0:
+            if seen_by_key.get(sk, 0) <= 0:
                 unseen.append(it)
         if unseen:
             cands = unseen
         else:
             return {"items": [], "skipped": True, "reason": "all_seen"}
 
-    cands.sort(key=cov_key)
-    max_per_page = 8
-    picked = []
-    per_page: Dict[int, int] = {}
-    for it in cands:
-        page = int(it.get("page", 0) or 0)
-        if page > 0 and max_per_page > 0:
-            if int(per_page.get(page, 0) or 0) >= int(max_per_page):
-                continue
-        picked.append(it)
-        if page > 0:
-            per_page[page] = int(per_page.get(page, 0) or 0) + 1
-        if len(picked) >= max(1, int(top_n)):
-            break
-    cands = picked
+    cands = _pick_page_capped(cands, key=cov_key, top_n=top_n, max_per_page=8)
     total = len(cands)
 
     out_items: List[Dict[str, Any]] = []
     out_seen: set[str] = set()
 
-    for start in range(0, total, max(1, int(batch_size))):
-        batch = cands[start : start + max(1, int(batch_size))]
-        allowed: Dict[str, str] = {}
-        lines: List[str] = []
-        lines.append("You review in-text citation sentence style compared to exemplar citation sentences.")
-        lines.append("Goal: make the sentence sound like top papers while keeping the same meaning (no new claims).")
-        lines.append("Do NOT produce a full rewrite; only output diagnosis + template snippets.")
-        lines.append("Return ONLY JSON. No markdown, no code fences.")
-        lines.append("WHITE-BOX: cite exemplar sentences by id.")
-        lines.append("Evidence quote can be empty, but if non-empty it MUST be an exact substring of provided exemplar text.")
-        lines.append("")
-        lines.append("OUTPUT_SCHEMA (JSON):")
-        lines.append(
-            json.dumps(
-                {
-                    "items": [
-                        {
-                            "page": 3,
-                            "sentence": "…",
-                            "diagnosis": [{"problem": "…", "suggestion": "…", "evidence": [{"id": "CSd34db33f_E1", "quote": "…"}]}],
-                            "templates": [{"text": "Consistent with …, we …", "evidence": [{"id": "CSd34db33f_E2", "quote": "…"}]}],
-                        }
-                    ]
-                },
-                ensure_ascii=False,
-            )
-        )
-        lines.append("")
+    jobs: List[Tuple[str, Dict[str, str], int, int]] = []
 
-        for bi, it in enumerate(batch):
-            sent_raw = str(it.get("sentence", "") or "").strip()
-            sent = _trim_excerpt(sent_raw, max_chars=520)
-            if not sent:
-                continue
-            sid = hashlib.sha1(sent_raw.encode("utf-8", errors="ignore")).hexdigest()[:8]
-            page = int(it.get("page", 0) or 0)
-            lines.append(f"P{bi}: page={page}")
-            lines.append("SENTENCE: " + sent)
-            exs = cite_search(sent, max(1, int(evidence_top_k))) or []
-            for ej, (_sc, ex) in enumerate(exs[: max(1, int(evidence_top_k))], start=1):
-                ev_id = f"CS{sid}_E{ej}"
-                ev_txt = _trim_excerpt(str(ex.get("sentence", "") or ex.get("text", "") or ""), max_chars=520)
-                meta = f"[{str(ex.get('pdf', '') or ex.get('pdf_rel', '') or '')}#p{int(ex.get('page', 0) or 0)}] "
-                allowed[ev_id] = meta + ev_txt
-                lines.append(f"{ev_id}: " + allowed[ev_id])
-            lines.append("")
-
-        prompt = "\n".join(lines).strip()
+    # Built lazily: each batch's exemplar searches overlap the calls already sent.
+    def prompts() -> Iterator[str]:
+        for start in range(0, total, max(1, int(batch_size))):
+            batch = cands[start : start + max(1, int(batch_size))]
+            allowed: Dict[str, str] = {}
+            lines: List[str] = [_CITATION_STYLE_REVIEW_HEADER]
+
+            n_targets = 0
+            for bi, it in enumerate(batch):
+                sent_raw = str(it.get("sentence", "") or "").strip()
+                sent = _trim_excerpt(sent_raw, max_chars=520)
+                if not sent:
+                    continue
+                # A sentence with no exemplar hits has nothing to cite; its answer would be dropped.
+                exs = cite_search(sent, max(1, int(evidence_top_k))) or []
+                if not exs:
+                    continue
+                n_targets += 1
+                # Evidence ids only need to be distinct within one prompt; crc32 is deterministic across runs
+                # (unlike hash()), so cached prompts stay byte-identical.
+                sid = f"{zlib.crc32(sent_raw.encode('utf-8', errors='ignore')):08x}"
+                page = int(it.get("page", 0) or 0)
+                lines.append(f"P{bi}: page={page}")
+                lines.append(f"SENTENCE: {sent}")
+                for ej, (_sc, ex) in enumerate(exs[: max(1, int(evidence_top_k))], start=1):
+                    ev_id = f"CS{sid}_E{ej}"
+                    ev_text = allowed[ev_id] = (
+                        f"[{str(ex.get('pdf', '') or ex.get('pdf_rel', '') or '')}#p{int(ex.get('page', 0) or 0)}] "
+                        f"{_trim_excerpt(str(ex.get('sentence', '') or ex.get('text', '') or ''), max_chars=520)}"
+                    )
+                    lines.append(f"{ev_id}: {ev_text}")
+                lines.append("")
+
+            if n_targets:
+                jobs.append((_join_prompt(lines), allowed, start, min(total, start + len(batch))))
+                yield jobs[-1][0]
+
+    n_reviewed = 0
+
+    def batch_done(i: int) -> None:
+        nonlocal n_reviewed
+        _p, _a, lo, hi = jobs[i]
+        n_reviewed += hi - lo
         if progress_cb:
             try:
-                progress_cb("llm_cite", min(start, total), total, f"{start+1}-{min(total, start+len(batch))}")
+                progress_cb("llm_cite", n_reviewed, total, f"{lo+1}-{hi}")
             except Exception:
                 pass
 
-        obj, meta = _call_llm_json(llm=llm, prompt=prompt, budget=budget, max_tokens=1200, timeout_s=180.0)
-        if not isinstance(obj, dict):
-            continue
-        items = obj.get("items", [])
-        if not isinstance(items, list):
+    results = _call_llm_json_batches(
+        llm=llm,
+        prompts=prompts(),
+        max_prompts=-(-total // max(1, int(batch_size))),
+        budget=budget,
+        max_tokens=1200,
+        timeout_s=180.0,
+        on_done=batch_done,
+        cache=cache,
+        response_schema=_CITATION_STYLE_REVIEW_SCHEMA,
+    )
+    for (_prompt, allowed, _lo, _hi), (obj, meta) in zip(jobs, results):
+        items = _response_items(obj)
+        if not items:
             continue
 
+        allowed_norm = _allowed_norm_map(allowed)
+        allowed_ids = _allowed_id_set(allowed)
+        allowed_text_norm: Dict[str, str] = {}
         for x in items:
-            if not isinstance(x, dict):
-                continue
             sent = _norm_ws(str(x.get("sentence", "") or ""))
             if not sent or sent in out_seen:
                 continue
 
-            ok_any = False
-            for d in x.get("diagnosis", []) or []:
-                if not isinstance(d, dict):
-                    continue
-                for ev in d.get("evidence", []) or []:
-                    if not isinstance(ev, dict):
-                        continue
-                    if _evidence_id_ok(allowed, ev_id=str(ev.get("id", "") or "")):
-                        ok_any = True
-                        break
-                if ok_any:
-                    break
-            if not ok_any:
-                for t in x.get("templates", []) or []:
-                    if not isinstance(t, dict):
-                        continue
-                    for ev in t.get("evidence", []) or []:
-                        if not isinstance(ev, dict):
-                            continue
-                        if _evidence_id_ok(allowed, ev_id=str(ev.get("id", "") or "")):
-                            ok_any = True
-                            break
-                    if ok_any:
-                        break
-            if not ok_any:
+            if not _has_valid_evidence(x, allowed=allowed, allowed_norm=allowed_norm, allowed_ids=allowed_ids):
                 continue
-            _attach_evidence_meta(x, allowed=allowed)
+            _attach_evidence_meta(x, allowed=allowed, allowed_norm=allowed_norm, allowed_text_norm=allowed_text_norm)
             if coverage is not None:
                 page = int(x.get("page", 0) or 0)
                 sent_raw = str(x.get("sentence", "") or "").strip()
@@ -756,6 +1387,81 @@ def review_citation_style(
     return {"items": out_items, "skipped": False}
 
 
+_PARAGRAPH_REVIEW_HEADER = "\n".join(
+    (
+        "You are a strict academic writing reviewer. Focus on PARAGRAPH structure and academic tone.",
+        "Do NOT rewrite the paragraph. Only provide diagnosis + reusable templates/snippets.",
+        "Do NOT add new facts, numbers, citations, or entities.",
+        "WHITE-BOX: every point must cite exemplars by id.",
+        "Evidence quote can be empty, but if non-empty it MUST be an exact substring of the provided exemplar excerpt.",
+        "",
+        "OUTPUT_SCHEMA (JSON):",
+        json.dumps(
+            {
+                "items": [
+                    {
+                        "paragraph_id": "P0",
+                        "page": 1,
+                        "diagnosis": [
+                            {
+                                "problem": "…",
+                                "suggestion": "…",
+                                "evidence": [{"id": "P0_E1", "quote": "exact substring"}],
+                            }
+                        ],
+                        "templates": [
+                            {"text": "To this end, we …", "evidence": [{"id": "P0_E2", "quote": "exact substring"}]}
+                        ],
+                    }
+                ]
+            },
+            ensure_ascii=False,
+        ),
+        "",
+    )
+)
+_PARAGRAPH_REVIEW_SCHEMA = _review_items_schema({"paragraph_id": _STR, "page": _INT})
+_PARAGRAPH_REVIEW_HEADER_TOKENS = approx_tokens(_PARAGRAPH_REVIEW_HEADER)
+# The old fixed 5-paragraph batches used 1400 completion tokens.
+_PARAGRAPH_COMPLETION_TOKENS_PER_TARGET = 280
+
+
+_EN_WORD_RE = re.compile(r"\b[a-z]+\b")
+_ZH_CHAR_RE = re.compile(r"[\u4e00-\u9fff]")
+# Below this length the regexes beat the vectorized scans (array setup dominates).
+_COUNT_NUMPY_MIN_CHARS = 512
+if np is not None:
+    _ASCII_IS_WORD = np.zeros(128, dtype=bool)
+    _ASCII_IS_LETTER = np.zeros(128, dtype=bool)
+    for _c in b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz":
+        _ASCII_IS_WORD[_c] = _ASCII_IS_LETTER[_c] = True
+    for _c in b"0123456789_":
+        _ASCII_IS_WORD[_c] = True
+
+
+def _count_en_zh(txt: str) -> Tuple[int, int]:
+    r"""
+    (English words, CJK chars) of a paragraph, i.e. the lengths of `\b[a-z]+\b` matches in the
+    lowercased text and of `[\u4e00-\u9fff]` matches.
+    """
+    if np is None or len(txt) < _COUNT_NUMPY_MIN_CHARS:
+        zh = 0 if txt.isascii() else len(_ZH_CHAR_RE.findall(txt))
+        return len(_EN_WORD_RE.findall(txt.lower())), zh
+    if not txt.isascii():
+        # Same UTF-16 scan as approx_tokens; `\b` on non-ASCII text needs Unicode `\w`, so words stay regex.
+        units = np.frombuffer(txt.encode("utf-16-le", errors="surrogatepass"), dtype=np.uint16)
+        zh = int(np.count_nonzero((units >= 0x4E00) & (units <= 0x9FFF)))
+        return len(_EN_WORD_RE.findall(txt.lower())), zh
+    # ASCII: a word is a maximal `\w` run made only of letters.
+    codes = np.frombuffer(txt.encode("ascii"), dtype=np.uint8)
+    word = _ASCII_IS_WORD[codes]
+    starts = word.copy()
+    starts[1:] &= ~word[:-1]
+    run_ids = np.cumsum(starts)
+    mixed = np.unique(run_ids[word & ~_ASCII_IS_LETTER[codes]]).size
+    return int(np.count_nonzero(starts)) - int(mixed), 0
+
+
 def review_paragraph_alignment(
     *,
     paper_paragraphs: List[Dict[str, Any]],
@@ -767,14 +1473,27 @@ def review_paragraph_alignment(
     batch_size: int = 3,
     evidence_top_k: int = 3,
     progress_cb: Optional[Callable[[str, int, int, str], None]] = None,
+    cache: Optional[LLMJsonCache] = None,
+    max_prompt_tokens: int = 0,
+    rag_search_batch: Optional[_SearchBatchFn] = None,
 ) -> Dict[str, Any]:
+    """
+    With `max_prompt_tokens` > 0, batches are packed up to that prompt size (at most `batch_size`
+    paragraphs), so a run of long or CJK paragraphs is split while short ones share one call.
+
+    `rag_search_batch(texts, k)`, if given, retrieves exemplars for up to `batch_size` paragraphs
+    at a time (one list of hits per text, in order); `rag_search` remains the fallback.
+    """
     if llm is None:
         return {"items": [], "skipped": True, "reason": "llm_not_configured"}
     if not paper_paragraphs:
         return {"items": [], "skipped": True, "reason": "no_paragraphs"}
+    rag_search = _memoize_search(rag_search, rag_search_batch)
 
     # Pick paragraphs that are likely problematic (too long / too dense / early sections).
-    scored: List[Tuple[int, int, int, float, Dict[str, Any]]] = []
+    rows: List[Tuple[str, int, float, str, str, Dict[str, Any]]] = []
+    # (sort key, (id, page, stripped text)): both are built once here; sort() and the prompt reuse them.
+    scored: List[Tuple[Tuple[int, int, float, int, str], Tuple[str, int, str]]] = []
     pid_to_key: Dict[str, str] = {}
     for p in paper_paragraphs:
         if not isinstance(p, dict):
@@ -785,8 +1504,7 @@ def review_paragraph_alignment(
             continue
         page = int(p.get("page", 0) or 0)
         lang = str(p.get("lang", "") or "").strip().lower() or "en"
-        en_words = len(re.findall(r"\b[a-z]+\b", txt.lower()))
-        zh_chars = len(re.findall(r"[\u4e00-\u9fff]", txt))
+        en_words, zh_chars = _count_en_zh(txt)
         sent_count = 0
         try:
             sent_count = int(len(p.get("sentences", []) or []))
@@ -810,31 +1528,42 @@ def review_paragraph_alignment(
 
         sk = stable_text_key(prefix="pa", page=page, text=txt)
         pid_to_key[pid] = sk
-        seen = int(coverage.seen_count("paragraph_alignment", sk)) if (coverage is not None and sk) else 0
-        page_seen = int(coverage.page_seen_count("paragraph_alignment", page)) if (coverage is not None and page) else 0
-        scored.append((0 if seen <= 0 else 1, page_seen, seen, score, p))
+        rows.append((sk, page, score, pid, txt, p))
+
+    seen_by_key, page_seen_by_page = _coverage_counts(
+        coverage, "paragraph_alignment", [{"_stable_key": r[0], "page": r[1]} for r in rows]
+    )
+    for sk, page, score, pid, txt, p in rows:
+        seen = seen_by_key.get(sk, 0)
+        page_seen = page_seen_by_page.get(page, 0)
+        scored.append(((0 if seen <= 0 else 1, page_seen, -score, page, str(p.get("id", ""))), (pid, page, txt)))
 
     if coverage is not None:
-        scored_unseen = [x for x in scored if int(x[0]) == 0]
+        scored_unseen = [x for x in scored if x[0][0] == 0]
         if scored_unseen:
             scored = scored_unseen
         else:
             return {"items": [], "skipped": True, "reason": "all_seen"}
 
-    scored.sort(key=lambda kv: (int(kv[0]), int(kv[1]), -float(kv[3]), int((kv[4] or {}).get("page", 0) or 0), str((kv[4] or {}).get("id", ""))))
+    scored.sort(key=itemgetter(0))
     # Page-cap to avoid concentrating review on the same early pages.
     max_per_page = 3
     picked = []
-    per_page: Dict[int, int] = {}
-    for _a, _b, _c, _s, p in scored:
-        page = int((p or {}).get("page", 0) or 0)
-        if page > 0 and max_per_page > 0:
-            if int(per_page.get(page, 0) or 0) >= int(max_per_page):
-                continue
-        picked.append(p)
+    per_page: Counter[int] = Counter()
+    limit = max(1, int(top_n))
+    picked_ids: set[str] = set()
+    for _sort_key, target in scored:
+        # Results are merged by paragraph id; a duplicate id would be reviewed only to be overwritten.
+        if target[0] in picked_ids:
+            continue
+        page = target[1]
         if page > 0:
-            per_page[page] = int(per_page.get(page, 0) or 0) + 1
-        if len(picked) >= max(1, int(top_n)):
+            if per_page[page] >= max_per_page:
+                continue
+            per_page[page] += 1
+        picked.append(target)
+        picked_ids.add(target[0])
+        if len(picked) >= limit:
             break
     cands = picked
     total = len(cands)
@@ -842,109 +1571,89 @@ def review_paragraph_alignment(
         return {"items": [], "skipped": True, "reason": "no_candidates"}
 
     out_map: Dict[str, Dict[str, Any]] = {}
-
-    for start in range(0, total, max(1, int(batch_size))):
-        batch = cands[start : start + max(1, int(batch_size))]
-        allowed: Dict[str, str] = {}
-        lines: List[str] = []
-        lines.append("You are a strict academic writing reviewer. Focus on PARAGRAPH structure and academic tone.")
-        lines.append("Do NOT rewrite the paragraph. Only provide diagnosis + reusable templates/snippets.")
-        lines.append("Do NOT add new facts, numbers, citations, or entities.")
-        lines.append("Return ONLY JSON. No markdown, no code fences.")
-        lines.append("WHITE-BOX: every point must cite exemplars by id.")
-        lines.append("Evidence quote can be empty, but if non-empty it MUST be an exact substring of the provided exemplar excerpt.")
-        lines.append("")
-        lines.append("OUTPUT_SCHEMA (JSON):")
-        lines.append(
-            json.dumps(
-                {
-                    "items": [
-                        {
-                            "paragraph_id": "P0",
-                            "page": 1,
-                            "diagnosis": [
-                                {
-                                    "problem": "…",
-                                    "suggestion": "…",
-                                    "evidence": [{"id": "P0_E1", "quote": "exact substring"}],
-                                }
-                            ],
-                            "templates": [
-                                {"text": "To this end, we …", "evidence": [{"id": "P0_E2", "quote": "exact substring"}]}
-                            ],
-                        }
-                    ]
-                },
-                ensure_ascii=False,
-            )
-        )
-        lines.append("")
-
-        for p in batch:
-            pid = str(p.get("id", "") or "").strip()
-            page = int(p.get("page", 0) or 0)
-            txt = str(p.get("text", "") or "").strip()
-            if not pid or not txt:
-                continue
-            lines.append(f"PARAGRAPH {pid} (p{page}):")
-            lines.append("TEXT: " + _trim_excerpt(txt, max_chars=1100))
+    step = max(1, int(batch_size))
+
+    # Per-paragraph prompt blocks and their exemplar ids. They are built (retrieval included) as the
+    # batches are sent, so later batches are prepared while earlier ones are with the LLM.
+    blocks: List[Tuple[List[str], Dict[str, str]]] = []
+
+    def block_tokens() -> Iterator[int]:
+        for i, (pid, page, txt) in enumerate(cands):
+            if i % step == 0:
+                rag_search.prefetch((c[2] for c in cands[i : i + step]), max(1, int(evidence_top_k)))
+            block = [f"PARAGRAPH {pid} (p{page}):", "TEXT: " + _trim_excerpt(txt, max_chars=1100)]
+            evs: Dict[str, str] = {}
             exs = rag_search(txt, max(1, int(evidence_top_k))) or []
             for ej, (_sc, ex) in enumerate(exs[: max(1, int(evidence_top_k))], start=1):
                 ev_id = f"{pid}_E{ej}"
                 ev_txt = _trim_excerpt(str(ex.get("text", "") or ""), max_chars=520)
                 meta = f"[{str(ex.get('pdf', '') or '')}#p{int(ex.get('page', 0) or 0)}] "
-                allowed[ev_id] = meta + ev_txt
-                lines.append(f"{ev_id}: " + allowed[ev_id])
-            lines.append("")
-
-        prompt = "\n".join(lines).strip()
+                evs[ev_id] = meta + ev_txt
+                block.append(f"{ev_id}: " + evs[ev_id])
+            blocks.append((block, evs))
+            yield sum(approx_tokens(line) for line in block)
+
+    jobs: List[Tuple[str, Dict[str, str], int, int]] = []
+
+    def prompts() -> Iterator[str]:
+        ranges = _iter_pack_batches(
+            block_tokens(),
+            head_tokens=_PARAGRAPH_REVIEW_HEADER_TOKENS,
+            max_items=batch_size,
+            max_prompt_tokens=max_prompt_tokens,
+        )
+        for start, end in ranges:
+            allowed: Dict[str, str] = {}
+            lines: List[str] = [_PARAGRAPH_REVIEW_HEADER]
+            for block, evs in blocks[start:end]:
+                lines.extend(block)
+                lines.append("")
+                allowed.update(evs)
+            jobs.append((_join_prompt(lines), allowed, start, end))
+            yield jobs[-1][0]
+
+    n_reviewed = 0
+
+    def batch_done(i: int) -> None:
+        nonlocal n_reviewed
+        _p, _a, lo, hi = jobs[i]
+        n_reviewed += hi - lo
         if progress_cb:
             try:
-                progress_cb("llm_paragraph", min(start, total), total, f"{start+1}-{min(total, start+len(batch))}")
+                progress_cb("llm_paragraph", n_reviewed, total, f"{lo+1}-{hi}")
             except Exception:
                 pass
 
-        obj, meta = _call_llm_json(llm=llm, prompt=prompt, budget=budget, max_tokens=1400, timeout_s=180.0)
-        if not isinstance(obj, dict):
-            continue
-        items = obj.get("items", [])
-        if not isinstance(items, list):
+    # Batch sizes are only known as they are packed; size the completion for a full batch.
+    max_tokens = max(1400, _PARAGRAPH_COMPLETION_TOKENS_PER_TARGET * min(step, total))
+    results = _call_llm_json_batches(
+        llm=llm,
+        prompts=prompts(),
+        # Token-capped packing can split further, but rarely; the per-call check still guards the rest.
+        max_prompts=-(-total // step),
+        budget=budget,
+        max_tokens=max_tokens,
+        timeout_s=180.0,
+        on_done=batch_done,
+        cache=cache,
+        response_schema=_PARAGRAPH_REVIEW_SCHEMA,
+    )
+    for (_prompt, allowed, _lo, _hi), (obj, meta) in zip(jobs, results):
+        items = _response_items(obj)
+        if not items:
             continue
 
+        allowed_norm = _allowed_norm_map(allowed)
+        allowed_ids = _allowed_id_set(allowed)
+        allowed_text_norm: Dict[str, str] = {}
         for x in items:
-            if not isinstance(x, dict):
-                continue
             pid = str(x.get("paragraph_id", "") or "").strip()
             if not pid:
                 continue
             # Validate at least one evidence id (quote may be missing; we can attach a verified excerpt later).
-            ok_any = False
-            for d in x.get("diagnosis", []) or []:
-                if not isinstance(d, dict):
-                    continue
-                for ev in d.get("evidence", []) or []:
-                    if not isinstance(ev, dict):
-                        continue
-                    if _evidence_id_ok(allowed, ev_id=str(ev.get("id", "") or "")):
-                        ok_any = True
-                        break
-                if ok_any:
-                    break
-            if not ok_any:
-                for t in x.get("templates", []) or []:
-                    if not isinstance(t, dict):
-                        continue
-                    for ev in t.get("evidence", []) or []:
-                        if not isinstance(ev, dict):
-                            continue
-                        if _evidence_id_ok(allowed, ev_id=str(ev.get("id", "") or "")):
-                            ok_any = True
-                            break
-                    if ok_any:
-                        break
-            if not ok_any:
+            if not _has_valid_evidence(x, allowed=allowed, allowed_norm=allowed_norm, allowed_ids=allowed_ids):
                 continue
-            _attach_evidence_meta(x, allowed=allowed)
+            _attach_evidence_meta(x, allowed=allowed, allowed_norm=allowed_norm, allowed_text_norm=allowed_text_norm)
             if coverage is not None:
                 key = pid_to_key.get(pid, "")
                 page = int(x.get("page", 0) or 0)
@@ -958,6 +1667,13 @@ def review_paragraph_alignment(
     return {"items": out_items, "skipped": False}
 
 
+@functools.lru_cache(maxsize=4096)
+def _token_pattern(token: str) -> "re.Pattern[str]":
+    # Each rare token is tested against every sentence until it is found; more distinct patterns
+    # than the `re` module's own cache holds would otherwise be recompiled on every call.
+    return re.compile(rf"(?i)(?<![A-Za-z]){re.escape(token)}(?![A-Za-z])")
+
+
 def _token_in_text(token: str, text: str, *, language: str) -> bool:
     token = (token or "").strip()
     if not token:
@@ -968,7 +1684,7 @@ def _token_in_text(token: str, text: str, *, language: str) -> bool:
         return token in s
     # English (case-insensitive word-boundary match).
     try:
-        return re.search(rf"(?i)(?<![A-Za-z]){re.escape(token)}(?![A-Za-z])", s) is not None
+        return _token_pattern(token).search(s) is not None
     except Exception:
         return token.lower() in s.lower()
 
@@ -1014,6 +1730,125 @@ def _find_token_context(paper_structure: Dict[str, Any], *, token: str, language
     return {"page": 0, "paragraph_id": "", "sentence": ""}
 
 
+_LEXICAL_REVIEW_HEADER = "\n".join(
+    (
+        "You review WORD CHOICE issues based on a top-paper exemplar corpus.",
+        "Input includes tokens that are frequent in the user's paper but rare in the exemplar corpus.",
+        "Your goal is to explain whether the token should be kept (domain term/variable) or replaced, and how to rewrite conservatively.",
+        "Do NOT add new facts, numbers, citations, or entities.",
+        "WHITE-BOX: cite exemplar excerpts by id. Evidence quote can be empty, but if non-empty it MUST be an exact substring of the provided exemplar excerpt.",
+        "",
+        "OUTPUT_SCHEMA (JSON):",
+        json.dumps(
+            {
+                "items": [
+                    {
+                        "token": "oracle",
+                        "language": "en|zh",
+                        "page": 12,
+                        "paper_count": 62,
+                        "exemplar_doc_freq": 2,
+                        "exemplar_doc_ratio": 0.008,
+                        "context_sentence": "…",
+                        "diagnosis": [{"problem": "…", "suggestion": "…", "evidence": [{"id": "T0_E1", "quote": "…"}]}],
+                        "templates": [{"text": "…", "evidence": [{"id": "T0_E2", "quote": "…"}]}],
+                    }
+                ]
+            },
+            ensure_ascii=False,
+        ),
+        "",
+    )
+)
+_LEXICAL_REVIEW_SCHEMA = _review_items_schema(
+    {
+        "token": _STR,
+        "language": _STR,
+        "page": _INT,
+        "paper_count": _INT,
+        "exemplar_doc_freq": _INT,
+        "exemplar_doc_ratio": {"type": "number"},
+        "context_sentence": _STR,
+    }
+)
+
+
+_ASCII_WORD_RE = re.compile(r"[A-Za-z]+")
+# Non-ASCII characters that `(?i)[A-Za-z]` also matches; text containing them is not indexed.
+_CASEFOLD_LETTERS = ("\u0130", "\u0131", "\u017f", "\u212a")
+
+
+class _TokenContextIndex:
+    """
+    `_find_token_context` for many tokens over one paper.
+
+    Paragraph sentences, paragraph texts and headings are walked once, in the scan order of
+    `_find_token_context`, and every lowercased ASCII word maps to the first text containing it.
+    Tokens that are not a single ASCII word (and Chinese tokens) still use the linear scan.
+    """
+
+    def __init__(self, paper_structure: Dict[str, Any]):
+        self._paper_structure = paper_structure
+        # (page, paragraph_id, text, is_whole_paragraph) in scan order.
+        self._units: List[Tuple[int, str, str, bool]] = []
+        self._first: Dict[str, int] = {}
+        self._casefold_units: List[int] = []
+
+        paras = paper_structure.get("paragraphs", []) if isinstance(paper_structure, dict) else []
+        for p in paras if isinstance(paras, list) else []:
+            if not isinstance(p, dict):
+                continue
+            page = int(p.get("page", 0) or 0)
+            pid = str(p.get("id", "") or "").strip()
+            sents = p.get("sentences", [])
+            if isinstance(sents, list) and sents:
+                for s in sents:
+                    if not isinstance(s, dict):
+                        continue
+                    st = str(s.get("text", "") or "").strip()
+                    if st:
+                        self._add(page, pid, st, False)
+            txt = str(p.get("text", "") or "").strip()
+            if txt:
+                self._add(page, pid, txt, True)
+
+        heads = paper_structure.get("headings", []) if isinstance(paper_structure, dict) else []
+        for h in heads if isinstance(heads, list) else []:
+            if not isinstance(h, dict):
+                continue
+            t = str(h.get("text", "") or "").strip()
+            if t:
+                self._add(int(h.get("page", 0) or 0), "", t, False)
+
+    def _add(self, page: int, pid: str, text: str, whole: bool) -> None:
+        i = len(self._units)
+        self._units.append((page, pid, text, whole))
+        if any(c in text for c in _CASEFOLD_LETTERS):
+            self._casefold_units.append(i)
+            return
+        first = self._first
+        for w in _ASCII_WORD_RE.findall(text):
+            first.setdefault(w.lower(), i)
+
+    def find(self, *, token: str, language: str) -> Dict[str, Any]:
+        lang = (language or "").strip().lower() or "en"
+        tok = (token or "").strip()
+        if lang == "zh" or not _ASCII_WORD_RE.fullmatch(tok):
+            return _find_token_context(self._paper_structure, token=token, language=language)
+        n = len(self._units)
+        i = self._first.get(tok.lower(), n)
+        for j in self._casefold_units:
+            if j >= i:
+                break
+            if _token_in_text(tok, self._units[j][2], language=lang):
+                i = j
+                break
+        if i >= n:
+            return {"page": 0, "paragraph_id": "", "sentence": ""}
+        page, pid, text, whole = self._units[i]
+        return {"page": page, "paragraph_id": pid, "sentence": _trim_excerpt(text, max_chars=520) if whole else text}
+
+
 def review_lexical_alignment(
     *,
     lexical: Dict[str, Any],
@@ -1026,9 +1861,13 @@ def review_lexical_alignment(
     batch_size: int = 6,
     evidence_top_k: int = 2,
     progress_cb: Optional[Callable[[str, int, int, str], None]] = None,
+    cache: Optional[LLMJsonCache] = None,
+    rag_search_batch: Optional[_SearchBatchFn] = None,
 ) -> Dict[str, Any]:
     """
     Token-level "rare in exemplars" review (programmatic detection + LLM explanation).
+
+    `rag_search_batch` is used as in `review_paragraph_alignment`, once per batch of token contexts.
     """
 
     if llm is None:
@@ -1038,6 +1877,7 @@ def review_lexical_alignment(
     rare = lexical.get("rare_in_exemplars", {}) if isinstance(lexical.get("rare_in_exemplars", {}), dict) else {}
     if not rare:
         return {"items": [], "skipped": True, "reason": "no_rare_tokens"}
+    rag_search = _memoize_search(rag_search, rag_search_batch)
 
     cands: List[Dict[str, Any]] = []
     for lang in ("en", "zh"):
@@ -1081,14 +1921,24 @@ def review_lexical_alignment(
 
     # Prefer unseen tokens to make repeated runs converge.
     if coverage is not None:
-        unseen = [x for x in cands if int(coverage.seen_count("lexical", str(x.get("_stable_key", "") or ""))) <= 0]
+        seen = coverage.seen_counts("lexical", [str(x.get("_stable_key", "") or "") for x in cands])
+        unseen = [x for x, n in zip(cands, seen) if int(n) <= 0]
         if unseen:
             cands = unseen
         else:
             return {"items": [], "skipped": True, "reason": "all_seen"}
 
-    cands.sort(key=lambda d: (-int(d.get("paper_count", 0) or 0), int(d.get("exemplar_doc_freq", 0) or 0), float(d.get("exemplar_doc_ratio", 0.0) or 0.0)))
-    cands = cands[: max(1, int(top_n))]
+    # The fields were coerced to int/float when the candidates were built.
+    cands.sort(key=lambda d: (-d["paper_count"], d["exemplar_doc_freq"], d["exemplar_doc_ratio"]))
+    # Results are merged by token (first wins), so a repeated token would only spend prompt tokens.
+    seen_tokens: set[str] = set()
+    unique: List[Dict[str, Any]] = []
+    for d in cands:
+        t = _norm_ws(str(d.get("token", "") or ""))
+        if t not in seen_tokens:
+            seen_tokens.add(t)
+            unique.append(d)
+    cands = unique[: max(1, int(top_n))]
     total = len(cands)
     if total <= 0:
         return {"items": [], "skipped": True, "reason": "no_candidates"}
@@ -1096,130 +1946,100 @@ def review_lexical_alignment(
     out_items: List[Dict[str, Any]] = []
     out_seen: set[str] = set()
 
-    for start in range(0, total, max(1, int(batch_size))):
-        batch = cands[start : start + max(1, int(batch_size))]
-        allowed: Dict[str, str] = {}
-        lines: List[str] = []
-
-        lines.append("You review WORD CHOICE issues based on a top-paper exemplar corpus.")
-        lines.append("Input includes tokens that are frequent in the user's paper but rare in the exemplar corpus.")
-        lines.append("Your goal is to explain whether the token should be kept (domain term/variable) or replaced, and how to rewrite conservatively.")
-        lines.append("Do NOT add new facts, numbers, citations, or entities.")
-        lines.append("Return ONLY JSON. No markdown, no code fences.")
-        lines.append("WHITE-BOX: cite exemplar excerpts by id. Evidence quote can be empty, but if non-empty it MUST be an exact substring of the provided exemplar excerpt.")
-        lines.append("")
-        lines.append("OUTPUT_SCHEMA (JSON):")
-        lines.append(
-            json.dumps(
-                {
-                    "items": [
-                        {
-                            "token": "oracle",
-                            "language": "en|zh",
-                            "page": 12,
-                            "paper_count": 62,
-                            "exemplar_doc_freq": 2,
-                            "exemplar_doc_ratio": 0.008,
-                            "context_sentence": "…",
-                            "diagnosis": [{"problem": "…", "suggestion": "…", "evidence": [{"id": "T0_E1", "quote": "…"}]}],
-                            "templates": [{"text": "…", "evidence": [{"id": "T0_E2", "quote": "…"}]}],
-                        }
-                    ]
-                },
-                ensure_ascii=False,
-            )
-        )
-        lines.append("")
-
-        included = []
-        for bi, it in enumerate(batch):
-            tok = str(it.get("token", "") or "").strip()
-            lang = str(it.get("language", "") or "en").strip().lower() or "en"
-            pc = int(it.get("paper_count", 0) or 0)
-            df = int(it.get("exemplar_doc_freq", 0) or 0)
-            ratio = float(it.get("exemplar_doc_ratio", 0.0) or 0.0)
-            ctx = _find_token_context(paper_structure, token=tok, language=lang)
-            page = int(ctx.get("page", 0) or 0)
-            sent = _trim_excerpt(str(ctx.get("sentence", "") or ""), max_chars=520)
-
-            if not sent:
-                continue
+    contexts = _TokenContextIndex(paper_structure)
+    jobs: List[Tuple[str, Dict[str, str], int, int]] = []
+
+    # Built lazily: each batch's context lookups and retrieval overlap the calls already sent.
+    def prompts() -> Iterator[str]:
+        for start in range(0, total, max(1, int(batch_size))):
+            batch = cands[start : start + max(1, int(batch_size))]
+            allowed: Dict[str, str] = {}
+            lines: List[str] = [_LEXICAL_REVIEW_HEADER]
+
+            rows = []
+            for it in batch:
+                tok = str(it.get("token", "") or "").strip()
+                lang = str(it.get("language", "") or "en").strip().lower() or "en"
+                ctx = contexts.find(token=tok, language=lang)
+                sent = _trim_excerpt(str(ctx.get("sentence", "") or ""), max_chars=520)
+                if sent:
+                    rows.append((it, tok, lang, int(ctx.get("page", 0) or 0), sent))
+            rag_search.prefetch((r[4] for r in rows), max(1, int(evidence_top_k)))
+
+            included = []
+            for it, tok, lang, page, sent in rows:
+                pc = int(it.get("paper_count", 0) or 0)
+                df = int(it.get("exemplar_doc_freq", 0) or 0)
+                ratio = float(it.get("exemplar_doc_ratio", 0.0) or 0.0)
 
-            exs = []
-            try:
-                exs = rag_search(sent, max(1, int(evidence_top_k))) or []
-            except Exception:
                 exs = []
-            if not exs:
-                continue
+                try:
+                    exs = rag_search(sent, max(1, int(evidence_top_k))) or []
+                except Exception:
+                    exs = []
+                if not exs:
+                    continue
 
-            ix = len(included)
-            included.append({"tok": tok, "lang": lang, "pc": pc, "df": df, "ratio": ratio, "page": page, "sent": sent})
-            lines.append(f"T{ix}: token={tok} lang={lang} page={page} paper_count={pc} exemplar_doc_freq={df} exemplar_doc_ratio={ratio:.4f}")
-            lines.append("CONTEXT: " + sent)
+                ix = len(included)
+                included.append({"tok": tok, "lang": lang, "pc": pc, "df": df, "ratio": ratio, "page": page, "sent": sent})
+                lines.append(f"T{ix}: token={tok} lang={lang} page={page} paper_count={pc} exemplar_doc_freq={df} exemplar_doc_ratio={ratio:.4f}")
+                lines.append("CONTEXT: " + sent)
 
-            # Provide a small set of exemplar excerpts to constrain suggestions.
-            for ej, (_sc, ex) in enumerate(exs[: max(1, int(evidence_top_k))], start=1):
-                ev_id = f"T{ix}_E{ej}"
-                ev_txt = _trim_excerpt(str(ex.get("text", "") or ""), max_chars=380)
-                meta = f"[{str(ex.get('pdf', '') or '')}#p{int(ex.get('page', 0) or 0)}] "
-                allowed[ev_id] = meta + ev_txt
-                lines.append(f"{ev_id}: " + allowed[ev_id])
+                # Provide a small set of exemplar excerpts to constrain suggestions.
+                for ej, (_sc, ex) in enumerate(exs[: max(1, int(evidence_top_k))], start=1):
+                    ev_id = f"T{ix}_E{ej}"
+                    ev_txt = _trim_excerpt(str(ex.get("text", "") or ""), max_chars=380)
+                    meta = f"[{str(ex.get('pdf', '') or '')}#p{int(ex.get('page', 0) or 0)}] "
+                    allowed[ev_id] = meta + ev_txt
+                    lines.append(f"{ev_id}: " + allowed[ev_id])
 
-            lines.append("")
+                lines.append("")
 
-        if not included:
-            continue
+            if not included:
+                continue
+            jobs.append((_join_prompt(lines), allowed, start, min(total, start + len(batch))))
+            yield jobs[-1][0]
 
-        prompt = "\n".join(lines).strip()
+    n_reviewed = 0
+
+    def batch_done(i: int) -> None:
+        nonlocal n_reviewed
+        _p, _a, lo, hi = jobs[i]
+        n_reviewed += hi - lo
         if progress_cb:
             try:
-                progress_cb("llm_lexical", min(start, total), total, f"{start+1}-{min(total, start+len(batch))}")
+                progress_cb("llm_lexical", n_reviewed, total, f"{lo+1}-{hi}")
             except Exception:
                 pass
 
-        obj, meta = _call_llm_json(llm=llm, prompt=prompt, budget=budget, max_tokens=2200, timeout_s=180.0)
-        if not isinstance(obj, dict):
-            continue
-        items = obj.get("items", [])
-        if not isinstance(items, list):
+    results = _call_llm_json_batches(
+        llm=llm,
+        prompts=prompts(),
+        max_prompts=-(-total // max(1, int(batch_size))),
+        budget=budget,
+        max_tokens=2200,
+        timeout_s=180.0,
+        on_done=batch_done,
+        cache=cache,
+        response_schema=_LEXICAL_REVIEW_SCHEMA,
+    )
+    for (_prompt, allowed, _lo, _hi), (obj, meta) in zip(jobs, results):
+        items = _response_items(obj)
+        if not items:
             continue
 
+        allowed_norm = _allowed_norm_map(allowed)
+        allowed_ids = _allowed_id_set(allowed)
+        allowed_text_norm: Dict[str, str] = {}
         for x in items:
-            if not isinstance(x, dict):
-                continue
             tok = _norm_ws(str(x.get("token", "") or ""))
             if not tok or tok in out_seen:
                 continue
 
-            ok_any = False
-            for d in x.get("diagnosis", []) or []:
-                if not isinstance(d, dict):
-                    continue
-                for ev in d.get("evidence", []) or []:
-                    if not isinstance(ev, dict):
-                        continue
-                    if _evidence_id_ok(allowed, ev_id=str(ev.get("id", "") or "")):
-                        ok_any = True
-                        break
-                if ok_any:
-                    break
-            if not ok_any:
-                for t in x.get("templates", []) or []:
-                    if not isinstance(t, dict):
-                        continue
-                    for ev in t.get("evidence", []) or []:
-                        if not isinstance(ev, dict):
-                            continue
-                        if _evidence_id_ok(allowed, ev_id=str(ev.get("id", "") or "")):
-                            ok_any = True
-                            break
-                    if ok_any:
-                        break
-            if not ok_any:
+            if not _has_valid_evidence(x, allowed=allowed, allowed_norm=allowed_norm, allowed_ids=allowed_ids):
                 continue
 
-            _attach_evidence_meta(x, allowed=allowed)
+            _attach_evidence_meta(x, allowed=allowed, allowed_norm=allowed_norm, allowed_text_norm=allowed_text_norm)
 
             # Attach stable_key + coverage
             lang = str(x.get("language", "") or "").strip().lower() or "en"
@@ -1245,6 +2065,7 @@ def run_llm_audit_pack(
     exemplar_outlines: List[Dict[str, Any]],
     rag_search: Optional[Callable[[str, int], List[Tuple[float, Dict[str, Any]]]]] = None,
     cite_search: Optional[Callable[[str, int], List[Tuple[float, Dict[str, Any]]]]] = None,
+    rag_search_batch: Optional[Callable[[List[str], int], List[List[Tuple[float, Dict[str, Any]]]]]] = None,
     llm: Optional[OpenAICompatClient],
     budget: Optional[LLMBudget] = None,
     coverage: Optional[ReviewCoverageStore] = None,
@@ -1255,6 +2076,7 @@ def run_llm_audit_pack(
     cost_per_1m_tokens_rmb: Optional[float] = None,
     max_cost_rmb: Optional[float] = None,
     progress_cb: Optional[Callable[[str, int, int, str], None]] = None,
+    cache_dir: str = "",
 ) -> Dict[str, Any]:
     if cost_per_1m_tokens_rmb is not None:
         cost_per_1m_tokens = float(cost_per_1m_tokens_rmb or 0.0)
@@ -1267,6 +2089,9 @@ def run_llm_audit_pack(
             max_cost=float(max_cost),
         )
 
+    # Optional persistent response cache (repeat runs over unchanged text skip the API).
+    cache = LLMJsonCache(cache_dir=cache_dir) if (cache_dir or "").strip() else None
+
     reviews: Dict[str, Any] = {}
 
     items = audit_result.get("items", []) if isinstance(audit_result, dict) else []
@@ -1277,9 +2102,11 @@ def run_llm_audit_pack(
             llm=llm,
             coverage=coverage,
             top_n=500,
-            batch_size=10,
+            batch_size=16,
             evidence_top_k=3,
             progress_cb=progress_cb,
+            cache=cache,
+            max_prompt_tokens=6000,
         )
 
     paras = paper_structure.get("paragraphs", []) if isinstance(paper_structure, dict) else []
@@ -1291,9 +2118,12 @@ def run_llm_audit_pack(
             llm=llm,
             coverage=coverage,
             top_n=160,
-            batch_size=5,
+            batch_size=8,
             evidence_top_k=3,
             progress_cb=progress_cb,
+            cache=cache,
+            max_prompt_tokens=6000,
+            rag_search_batch=rag_search_batch,
         )
 
     heads = paper_structure.get("headings", []) if isinstance(paper_structure, dict) else []
@@ -1305,6 +2135,7 @@ def run_llm_audit_pack(
             llm=llm,
             coverage=coverage,
             progress_cb=progress_cb,
+            cache=cache,
         )
 
     cits = paper_structure.get("citations", []) if isinstance(paper_structure, dict) else []
@@ -1319,6 +2150,7 @@ def run_llm_audit_pack(
             batch_size=10,
             evidence_top_k=3,
             progress_cb=progress_cb,
+            cache=cache,
         )
 
     # Lexical review (rare-in-exemplars token list -> LLM explanation)
@@ -1335,6 +2167,8 @@ def run_llm_audit_pack(
             batch_size=4,
             evidence_top_k=1,
             progress_cb=progress_cb,
+            cache=cache,
+            rag_search_batch=rag_search_batch,
         )
 
     return {
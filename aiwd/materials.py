@@ -19,9 +19,9 @@ from ai_word_detector import (  # type: ignore
     split_sentences_with_positions,
 )
 
-from aiwd.citeextract.pipeline import iter_citation_sentences_from_pages, load_pdf_pages
+from aiwd.citeextract.pipeline import iter_citation_sentence_dicts_from_pages, load_pdf_pages
 from aiwd.citeextract.references import iter_reference_entries_from_pages
-from aiwd.citeextract.text_clean import find_references_heading_line_index, page_has_references_heading
+from aiwd.citeextract.text_clean import locate_references_heading
 from aiwd.openai_compat import OpenAICompatClient, extract_first_content
 from aiwd.polish import extract_json
 
@@ -140,17 +140,12 @@ def _cut_pages_before_references(pages: List[str]) -> List[str]:
     if not pages:
         return pages
     for i, text in enumerate(pages):
-        if page_has_references_heading(text):
+        idx = locate_references_heading(text)
+        if idx is not None:
             kept = pages[:i]
-            idx = find_references_heading_line_index(text)
-            if idx is not None:
-                try:
-                    lines = (text or "").splitlines()
-                    head = "\n".join(lines[:idx]).strip()
-                except Exception:
-                    head = ""
-                if head:
-                    kept.append(head)
+            head = "\n".join(text.splitlines()[:idx]).strip()
+            if head:
+                kept.append(head)
             return kept
     return pages
 
@@ -303,8 +298,9 @@ def build_material_doc(
     # Citation sentences (stop at references).
     citations = []
     try:
-        for rec in iter_citation_sentences_from_pages(pages_all, pdf_label=os.path.basename(pdf_path), stop_at_references=True):
-            citations.append(rec.to_dict())
+        citations = list(
+            iter_citation_sentence_dicts_from_pages(pages_all, pdf_label=os.path.basename(pdf_path), stop_at_references=True)
+        )
     except Exception:
         citations = []
 
@@ -2,16 +2,16 @@
 
 from __future__ import annotations
 
-import json
 import os
 import re
 import secrets
 import time
-import urllib.error
 import urllib.parse
 import urllib.request
 from typing import Any, Dict, List, Optional, Tuple
 
+from aiwd.openai_compat import KeepAlivePool
+
 
 _HEADERS = {"User-Agent": "Mozilla/5.0 (TopHumanWriting)"}
 
@@ -28,26 +28,19 @@ def sanitize_filename(name: str, *, max_len: int = 140) -> str:
     return s[: max(20, min(int(max_len or 140), 240))].rstrip(". ")
 
 
+# Lookups for a batch of missing references hit the same two API hosts back to back;
+# keep those connections open instead of re-handshaking TLS per query.
+_POOL = KeepAlivePool()
+
+
 def _http_json_get(url: str, *, timeout_s: float = 20.0) -> Tuple[int, dict]:
-    req = urllib.request.Request(url, headers=_HEADERS, method="GET")
-    try:
-        with urllib.request.urlopen(req, timeout=float(timeout_s or 20.0)) as resp:
-            status = int(getattr(resp, "status", 200))
-            body = resp.read() or b""
-        try:
-            data = json.loads(body.decode("utf-8", errors="replace"))
-            return status, data if isinstance(data, dict) else {}
-        except Exception:
-            return status, {}
-    except urllib.error.HTTPError as e:
-        try:
-            body = e.read() or b""
-            data = json.loads(body.decode("utf-8", errors="replace"))
-            return int(getattr(e, "code", 500) or 500), data if isinstance(data, dict) else {}
-        except Exception:
-            return int(getattr(e, "code", 500) or 500), {"_error": str(e)}
-    except Exception as e:
-        return 0, {"_error": str(e)}
+    status, data = _POOL.request_json("GET", url, headers=_HEADERS, timeout_s=float(timeout_s or 20.0))
+    if isinstance(data, dict) and "_raw" not in data:
+        return status, data
+    # Non-object or non-JSON body: empty on success, an error note otherwise (as urllib's HTTPError gave).
+    if 200 <= int(status or 0) < 300:
+        return status, {}
+    return status, {"_error": f"HTTP Error {int(status or 0)}"}
 
 
 def semantic_scholar_search(query: str, *, limit: int = 3, timeout_s: float = 20.0) -> List[dict]:
@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
+import http.client
 import json
 import random
+import ssl
+import threading
 import time
 import urllib.error
+import urllib.parse
 import urllib.request
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
 
 
 def mask_secret(value: str, *, show_last: int = 4) -> str:
@@ -49,47 +58,198 @@ def _http_json(
     headers: Optional[dict] = None,
     timeout_s: float = 30.0,
 ) -> Tuple[int, dict]:
-    data = None
-    req_headers = {"Content-Type": "application/json"}
-    if headers:
-        req_headers.update({str(k): str(v) for k, v in headers.items() if v is not None})
-    if payload is not None:
-        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    req_headers = _json_request_headers(headers, has_body=payload is not None)
+    data = _encode_json_body(payload) if payload is not None else None
     req = urllib.request.Request(url, data=data, headers=req_headers, method=method.upper())
     try:
         with urllib.request.urlopen(req, timeout=float(timeout_s)) as resp:
             status = int(getattr(resp, "status", 200))
-            body = resp.read() or b""
-            try:
-                return status, json.loads(body.decode("utf-8", errors="replace"))
-            except Exception:
-                raw = body.decode("utf-8", errors="replace").strip()
-                if raw:
-                    if len(raw) > 2000:
-                        raw = raw[:2000] + "…"
-                    return status, {"_raw": raw}
-                return status, {}
+            return status, _decode_json_body(resp.read() or b"")
     except urllib.error.HTTPError as e:
         try:
             body = e.read() or b""
-            return int(e.code), json.loads(body.decode("utf-8", errors="replace"))
         except Exception:
-            try:
-                body = body if "body" in locals() else b""
-                raw = (body or b"").decode("utf-8", errors="replace").strip()
-                if raw:
-                    if len(raw) > 2000:
-                        raw = raw[:2000] + "…"
-                    return int(getattr(e, "code", 500)), {"_raw": raw}
-            except Exception:
-                pass
-            return int(getattr(e, "code", 500)), {}
+            body = b""
+        return int(getattr(e, "code", 500) or 500), _decode_json_body(body)
     except Exception as e:
         # Network error, DNS, TLS, timeout etc.
-        msg = (str(e) or "request failed").strip()
-        if len(msg) > 500:
-            msg = msg[:500] + "…"
-        return 0, {"_error": msg}
+        return 0, {"_error": _short_error(e)}
+
+
+def _json_request_headers(headers: Optional[dict], *, has_body: bool) -> Dict[str, str]:
+    # Only requests that carry a JSON body declare one; a GET goes out without Content-Type.
+    req_headers = {"Content-Type": "application/json"} if has_body else {}
+    if headers:
+        req_headers.update({str(k): str(v) for k, v in headers.items() if v is not None})
+    return req_headers
+
+
+def _encode_json_body(payload: Any) -> bytes:
+    if orjson is not None:
+        try:
+            # Already UTF-8 bytes, same as json.dumps(ensure_ascii=False).encode().
+            return orjson.dumps(payload)
+        except Exception:
+            pass  # e.g. non-str keys or >64-bit ints: let the stdlib handle them
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _decode_json_body(body: bytes) -> dict:
+    if orjson is not None and body:
+        try:
+            return orjson.loads(body)
+        except Exception:
+            pass  # invalid UTF-8 / non-JSON: fall through to the lenient path
+    try:
+        return json.loads((body or b"").decode("utf-8", errors="replace"))
+    except Exception:
+        raw = (body or b"").decode("utf-8", errors="replace").strip()
+        if raw:
+            if len(raw) > 2000:
+                raw = raw[:2000] + "…"
+            return {"_raw": raw}
+        return {}
+
+
+def _short_error(e: Exception) -> str:
+    msg = (str(e) or "request failed").strip()
+    if len(msg) > 500:
+        msg = msg[:500] + "…"
+    return msg
+
+
+def _close_all(conns: Dict[Tuple[str, str], http.client.HTTPConnection]) -> None:
+    for conn in list(conns.values()):
+        try:
+            conn.close()
+        except Exception:
+            pass
+    conns.clear()
+
+
+class KeepAlivePool:
+    """
+    Per-thread persistent HTTP(S) connections keyed by (scheme, host:port).
+
+    urllib opens a fresh TCP/TLS connection per request; reusing one connection
+    removes that handshake from every call. Hosts that should go through an
+    environment proxy, and 3xx redirects, fall back to `_http_json` (urllib).
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Every live thread's connection map, so close() also reaches batch worker threads.
+        self._all_conns: List[Tuple[threading.Thread, Dict[Tuple[str, str], http.client.HTTPConnection]]] = []
+        self._ssl_ctx: Optional[ssl.SSLContext] = None
+
+    def _conns(self) -> Dict[Tuple[str, str], http.client.HTTPConnection]:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = {}
+            self._local.conns = conns
+            with self._lock:
+                dead = [c for t, c in self._all_conns if not t.is_alive()]
+                self._all_conns = [(t, c) for t, c in self._all_conns if t.is_alive()]
+                self._all_conns.append((threading.current_thread(), conns))
+            for c in dead:
+                _close_all(c)
+        return conns
+
+    def _ssl_context(self) -> ssl.SSLContext:
+        # One context for all connections: the CA store is loaded once, not per TLS handshake.
+        with self._lock:
+            if self._ssl_ctx is None:
+                self._ssl_ctx = ssl.create_default_context()
+            return self._ssl_ctx
+
+    def close(self) -> None:
+        """Close every thread's connections; call when no request is in flight."""
+        with self._lock:
+            maps = [c for _t, c in self._all_conns]
+        for conns in maps:
+            _close_all(conns)
+
+    def request_json(
+        self,
+        method: str,
+        url: str,
+        *,
+        payload: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout_s: float = 30.0,
+    ) -> Tuple[int, dict]:
+        parts = urllib.parse.urlsplit(url)
+        scheme = (parts.scheme or "").lower()
+        host = parts.hostname or ""
+        if scheme not in ("http", "https") or not host:
+            return _http_json(method, url, payload=payload, headers=headers, timeout_s=timeout_s)
+        try:
+            proxies = urllib.request.getproxies()
+            if proxies.get(scheme) and not urllib.request.proxy_bypass(host):
+                return _http_json(method, url, payload=payload, headers=headers, timeout_s=timeout_s)
+        except Exception:
+            pass
+
+        req_headers = _json_request_headers(headers, has_body=payload is not None)
+        data = _encode_json_body(payload) if payload is not None else None
+        path = parts.path or "/"
+        if parts.query:
+            path = path + "?" + parts.query
+
+        key = (scheme, parts.netloc)
+        conns = self._conns()
+        for attempt in range(2):
+            conn = conns.get(key)
+            reused = conn is not None
+            if conn is None:
+                if scheme == "https":
+                    conn = http.client.HTTPSConnection(host, parts.port, timeout=float(timeout_s), context=self._ssl_context())
+                else:
+                    conn = http.client.HTTPConnection(host, parts.port, timeout=float(timeout_s))
+                conns[key] = conn
+            try:
+                conn.timeout = float(timeout_s)
+                if conn.sock is not None:
+                    conn.sock.settimeout(float(timeout_s))
+                conn.request(method.upper(), path, body=data, headers=req_headers)
+                resp = conn.getresponse()
+                status = int(resp.status or 0)
+                body = resp.read() or b""
+                if resp.will_close:
+                    conns.pop(key, None)
+                    conn.close()
+                location = resp.getheader("Location") if 300 <= status < 400 else None
+                if location:
+                    # http.client does not follow redirects; fetch the target (and any further hops) via urllib.
+                    # As urllib does, 301/302/303 turn a POST into a bodiless GET; 307/308 keep both.
+                    keep = status in (307, 308) or method.upper() in ("GET", "HEAD")
+                    return _http_json(
+                        method if keep else "GET",
+                        urllib.parse.urljoin(url, location),
+                        payload=payload if keep else None,
+                        headers=headers,
+                        timeout_s=timeout_s,
+                    )
+                return status, _decode_json_body(body)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, http.client.CannotSendRequest) as e:
+                conns.pop(key, None)
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+                # The server may drop idle keep-alive connections; retry once on a fresh one.
+                if reused and attempt == 0:
+                    continue
+                return 0, {"_error": _short_error(e)}
+            except Exception as e:
+                conns.pop(key, None)
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+                return 0, {"_error": _short_error(e)}
+        return 0, {"_error": "request failed"}
 
 
 def _is_transient_status(status: int) -> bool:
@@ -139,6 +299,8 @@ class OpenAICompatConfig:
     max_retries: int = 5
     base_retry_delay_s: float = 0.9
     max_retry_delay_s: float = 10.0
+    # Provider accepts response_format={"type": "json_schema", ...} (structured outputs).
+    json_schema_output: bool = False
 
     @property
     def base_url_v1(self) -> str:
@@ -156,8 +318,25 @@ class OpenAICompatConfig:
 
 
 class OpenAICompatClient:
+    """
+    OpenAI-compatible chat client.
+
+    Requests reuse a persistent (keep-alive) connection per thread, so callers
+    that issue many small calls (e.g. cite-check verification) should share one
+    client instance rather than creating one per call.
+    """
+
     def __init__(self, cfg: OpenAICompatConfig):
         self.cfg = cfg
+        self._pool = KeepAlivePool()
+        self._json_schema_rejected = False
+
+    @property
+    def supports_json_schema(self) -> bool:
+        return bool(self.cfg.json_schema_output) and not self._json_schema_rejected
+
+    def close(self) -> None:
+        self._pool.close()
 
     def chat_completions(self, payload: dict, *, timeout_s: Optional[float] = None) -> Tuple[int, dict]:
         base = self.cfg.base_url_v1
@@ -173,7 +352,7 @@ class OpenAICompatClient:
         last_status = 0
         last_data: dict = {}
         for attempt in range(max_retries + 1):
-            status, data = _http_json(
+            status, data = self._pool.request_json(
                 "POST",
                 url,
                 payload=payload,
@@ -220,8 +399,17 @@ class OpenAICompatClient:
 
         status, data = self.chat_completions(payload, timeout_s=timeout_s)
 
+        # A rejected json_schema format falls back to plain JSON mode first (and is not tried again).
+        rejected = (400, 404, 405, 409, 415, 422)
+        if int(status or 0) in rejected and (payload.get("response_format") or {}).get("type") == "json_schema":
+            self._json_schema_rejected = True
+            payload["response_format"] = {"type": "json_object"}
+            status2, data2 = self.chat_completions(payload, timeout_s=timeout_s)
+            if int(status2 or 0) != 0:
+                status, data = status2, data2
+
         # JSON mode fallback (some providers reject response_format).
-        if int(status or 0) in (400, 404, 405, 409, 415, 422) and "response_format" in payload:
+        if int(status or 0) in rejected and "response_format" in payload:
             payload.pop("response_format", None)
             status2, data2 = self.chat_completions(payload, timeout_s=timeout_s)
             if int(status2 or 0) != 0:
@@ -7,6 +7,11 @@ import re
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Sequence, Tuple
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
 
 @dataclass(frozen=True)
 class Citation:
@@ -43,6 +48,31 @@ class PolishValidationError(ValueError):
     pass
 
 
+# Dumped once: the schema text is the same in every polish prompt.
+_POLISH_SCHEMA_JSON = json.dumps(
+    {
+        "language": "zh|en|mixed",
+        "diagnosis": [
+            {
+                "title": "...",
+                "problem": "...",
+                "suggestion": "...",
+                "evidence": [{"id": "C1", "pdf": "path.pdf", "page": 1, "quote": "exact excerpt substring"}],
+            }
+        ],
+        "variants": [
+            {
+                "level": "light|medium",
+                "rewrite": "...",
+                "changes": ["..."],
+                "citations": [{"id": "C1", "pdf": "path.pdf", "page": 1, "quote": "exact excerpt substring"}],
+            }
+        ],
+    },
+    ensure_ascii=False,
+)
+
+
 def build_polish_prompt(
     *,
     selected_text: str,
@@ -93,28 +123,9 @@ def build_polish_prompt(
             "LANGUAGE: follow LANGUAGE_HINT strictly; write diagnosis + rewrites in the same language as USER_TEXT (zh/en/mixed).",
             "Return STRICT JSON only (no markdown), matching the schema described.",
         ]
-    schema = {
-        "language": "zh|en|mixed",
-        "diagnosis": [
-            {
-                "title": "...",
-                "problem": "...",
-                "suggestion": "...",
-                "evidence": [{"id": "C1", "pdf": "path.pdf", "page": 1, "quote": "exact excerpt substring"}],
-            }
-        ],
-        "variants": [
-            {
-                "level": "light|medium",
-                "rewrite": "...",
-                "changes": ["..."],
-                "citations": [{"id": "C1", "pdf": "path.pdf", "page": 1, "quote": "exact excerpt substring"}],
-            }
-        ],
-    }
     parts = []
     parts.append("RULES:\n- " + "\n- ".join(rules))
-    parts.append("OUTPUT_SCHEMA:\n" + json.dumps(schema, ensure_ascii=False))
+    parts.append("OUTPUT_SCHEMA:\n" + _POLISH_SCHEMA_JSON)
     parts.append(f"LANGUAGE_HINT: {language}")
     parts.append("USER_TEXT:\n" + (selected_text or "").strip())
     parts.append("EXEMPLARS:")
@@ -123,12 +134,24 @@ def build_polish_prompt(
     return "\n\n".join(parts).strip()
 
 
+_LONG_DIGITS_RE = re.compile(r"\d{19}")
+
+
 def extract_json(text: str) -> Optional[dict]:
     if not isinstance(text, str):
         return None
     s = text.strip()
     if not s:
         return None
+    # JSON-mode answers are usually one bare object; fences, prose or trailing text fall through.
+    # (orjson turns integers past 64 bits into floats, so long digit runs take the stdlib path.)
+    if orjson is not None and s[0] == "{" and _LONG_DIGITS_RE.search(s) is None:
+        try:
+            obj = orjson.loads(s)
+        except Exception:
+            pass
+        else:
+            return obj if isinstance(obj, dict) else None
     # Remove common Markdown fences.
     s = re.sub(r"^\s*```(?:json)?\s*", "", s, flags=re.IGNORECASE)
     s = re.sub(r"\s*```\s*$", "", s, flags=re.IGNORECASE)
@@ -6,9 +6,11 @@ import hashlib
 import json
 import os
 import re
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 
 def _safe_filename(name: str, *, fallback: str = "default") -> str:
@@ -24,13 +26,35 @@ def _safe_filename(name: str, *, fallback: str = "default") -> str:
     return s
 
 
+_WS_RE = re.compile(r"\s+")
+
+
+# Pure, and asked for the same (prefix, page, text) by every review pass and iteration of a run.
+# Memoized on a digest of the raw text (hashing it is far cheaper than the whitespace pass), so
+# the memo holds short keys rather than pinning every paragraph it has seen.
+_KEY_MEMO: "OrderedDict[tuple, str]" = OrderedDict()
+_KEY_MEMO_MAX = 65536
+_KEY_MEMO_LOCK = threading.Lock()
+
+
 def stable_text_key(*, prefix: str, page: int = 0, text: str = "", extra: str = "") -> str:
     p = int(page or 0)
-    t = re.sub(r"\s+", " ", (text or "")).strip()
+    memo_key = (prefix, p, hashlib.sha1((text or "").encode("utf-8", errors="ignore")).digest(), extra[:200])
+    with _KEY_MEMO_LOCK:
+        hit = _KEY_MEMO.get(memo_key)
+        if hit is not None:
+            _KEY_MEMO.move_to_end(memo_key)
+            return hit
+    t = _WS_RE.sub(" ", (text or "")).strip()
     base = f"{p}|{t[:1200]}|{extra[:200]}".strip("|")
     h = hashlib.sha1(base.encode("utf-8", errors="ignore")).hexdigest()[:16]
     pre = (prefix or "k").strip()[:6]
-    return f"{pre}_{h}"
+    key = f"{pre}_{h}"
+    with _KEY_MEMO_LOCK:
+        _KEY_MEMO[memo_key] = key
+        while len(_KEY_MEMO) > _KEY_MEMO_MAX:
+            _KEY_MEMO.popitem(last=False)
+    return key
 
 
 @dataclass
@@ -99,6 +123,43 @@ class ReviewCoverageStore:
                 continue
         return int(n)
 
+    def seen_counts(self, category: str, keys: Sequence[str]) -> List[int]:
+        """Bulk `seen_count`: one category lookup for many keys, results in input order."""
+        items = self._cat(category).get("items", {})
+        if not isinstance(items, dict) or not items:
+            return [0] * len(keys)
+        out: List[int] = []
+        for key in keys:
+            ent = items.get(str(key or "").strip(), None)
+            try:
+                out.append(int(ent.get("count", 0) or 0) if isinstance(ent, dict) else 0)
+            except Exception:
+                out.append(0)
+        return out
+
+    def page_seen_counts(self, category: str, pages: Sequence[int]) -> List[int]:
+        """Bulk `page_seen_count`: one pass over the category items for all requested pages."""
+        items = self._cat(category).get("items", {})
+        if not isinstance(items, dict) or not items:
+            return [0] * len(pages)
+        hist: Dict[int, int] = {}
+        for ent in items.values():
+            if not isinstance(ent, dict):
+                continue
+            try:
+                p = int(ent.get("page", 0) or 0)
+            except Exception:
+                continue
+            if p > 0:
+                hist[p] = hist.get(p, 0) + 1
+        out: List[int] = []
+        for page in pages:
+            try:
+                out.append(int(hist.get(int(page or 0), 0)))
+            except Exception:
+                out.append(0)
+        return out
+
     def mark_seen(self, category: str, key: str, *, page: int = 0, meta: Optional[dict] = None):
         key = str(key or "").strip()
         if not key:
@@ -20,7 +20,7 @@ from aiwd.llm_budget import LLMBudget  # noqa: E402
 from aiwd.llm_review import run_llm_audit_pack  # noqa: E402
 from aiwd.materials import MaterialsIndexer, build_material_doc  # noqa: E402
 from aiwd.openai_compat import OpenAICompatClient, OpenAICompatConfig  # noqa: E402
-from aiwd.rag_index import RagIndexer  # noqa: E402
+from aiwd.rag_index import RagIndexer, normalize_ws  # noqa: E402
 from aiwd.report import audit_to_markdown  # noqa: E402
 from aiwd.review_coverage import ReviewCoverageStore  # noqa: E402
 
@@ -97,7 +97,14 @@ def main() -> int:
         raise RuntimeError(f"Missing semantic model folder: {semantic_dir}")
     embedder = SemanticEmbedder(semantic_dir, model_id="Xenova/paraphrase-multilingual-MiniLM-L12-v2")
 
+    # Filled by `rag_search_batch`: the session asks for one query vector at a time, so a batch's
+    # queries are embedded together up front and handed out here.
+    query_vecs: Dict[str, Any] = {}
+
     def embed_query(q: str):
+        v = query_vecs.pop(q, None)
+        if v is not None:
+            return v
         vecs = embedder.embed([q], batch_size=1, progress_callback=None, progress_every_s=0.0, cancel_event=None)
         try:
             return vecs[0]
@@ -114,6 +121,18 @@ def main() -> int:
             out.append((float(sc or 0.0), {"pdf": getattr(node, "pdf", "") or "", "page": int(getattr(node, "page", 0) or 0), "text": getattr(node, "text", "") or ""}))
         return out
 
+    def rag_search_batch(queries: List[str], top_k: int) -> List[List[Tuple[float, Dict[str, Any]]]]:
+        # The session embeds the whitespace-normalized query, so that is what gets pre-embedded.
+        keys = [normalize_ws(q) for q in queries]
+        todo = [k for k in dict.fromkeys(keys) if k]
+        if todo:
+            vecs = embedder.embed(todo, batch_size=len(todo), progress_callback=None, progress_every_s=0.0, cancel_event=None)
+            query_vecs.update(zip(todo, vecs))
+        try:
+            return [rag_search(q, top_k) for q in queries]
+        finally:
+            query_vecs.clear()
+
     cite_search_fn = None
     cite_ix = CitationBankIndexer(data_dir=data_dir, library_name=library)
     if cite_ix.index_ready():
@@ -161,6 +180,7 @@ def main() -> int:
         paper_structure=paper_struct if isinstance(paper_struct, dict) else {},
         exemplar_outlines=outlines,
         rag_search=rag_search,
+        rag_search_batch=rag_search_batch,
         cite_search=cite_search_fn,
         llm=llm,
         budget=budget,
@@ -23,7 +23,7 @@ from aiwd.llm_budget import LLMBudget
 from aiwd.llm_review import run_llm_audit_pack
 from aiwd.materials import MaterialsIndexer, build_material_doc
 from aiwd.openai_compat import OpenAICompatClient, OpenAICompatConfig
-from aiwd.rag_index import RagIndexer
+from aiwd.rag_index import RagIndexer, normalize_ws
 from aiwd.report import audit_to_markdown
 from aiwd.review_coverage import ReviewCoverageStore
 
@@ -143,7 +143,14 @@ def main() -> int:
     except Exception:
         corpus = None
 
+    # Filled by `rag_search_batch`: the session asks for one query vector at a time, so a batch's
+    # queries are embedded together up front and handed out here.
+    query_vecs: Dict[str, Any] = {}
+
     def embed_query(q: str):
+        v = query_vecs.pop(q, None)
+        if v is not None:
+            return v
         vecs = embedder.embed([q], batch_size=1, progress_callback=None, progress_every_s=0.0, cancel_event=None)
         try:
             return vecs[0]
@@ -164,6 +171,18 @@ def main() -> int:
             out.append((float(sc or 0.0), {"pdf": getattr(node, "pdf", "") or "", "page": int(getattr(node, "page", 0) or 0), "text": getattr(node, "text", "") or ""}))
         return out
 
+    def rag_search_batch(queries: List[str], top_k: int) -> List[List[Tuple[float, Dict[str, Any]]]]:
+        # The session embeds the whitespace-normalized query, so that is what gets pre-embedded.
+        keys = [normalize_ws(q) for q in queries]
+        todo = [k for k in dict.fromkeys(keys) if k]
+        if todo:
+            vecs = embedder.embed(todo, batch_size=len(todo), progress_callback=None, progress_every_s=0.0, cancel_event=None)
+            query_vecs.update(zip(todo, vecs))
+        try:
+            return [rag_search(q, top_k) for q in queries]
+        finally:
+            query_vecs.clear()
+
     # Exemplar outline templates (from materials manifest)
     outlines: List[Dict[str, Any]] = []
     materials_manifest: dict = {}
@@ -256,6 +275,7 @@ def main() -> int:
                 paper_structure=paper_struct if isinstance(paper_struct, dict) else {},
                 exemplar_outlines=outlines,
                 rag_search=rag_search,
+                rag_search_batch=rag_search_batch,
                 cite_search=cite_search_fn,
                 llm=llm,
                 budget=budget,
@@ -263,6 +283,7 @@ def main() -> int:
                 cost_per_1m_tokens=float(args.cost_per_1m_tokens),
                 max_cost=float(args.max_cost),
                 progress_cb=progress,
+                cache_dir=os.path.join(data_dir, "audit", "llm_cache"),
             )
             if isinstance(result, dict):
                 result["llm_reviews"] = pack.get("reviews", {}) if isinstance(pack, dict) else {}
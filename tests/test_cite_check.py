@@ -1,5 +1,6 @@
 import os
 import sys
+import tempfile
 import unittest
 
 
@@ -8,7 +9,18 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
 
-from aiwd.cite_check import extract_reference_title, match_reference_entry  # noqa: E402
+from aiwd import cite_check  # noqa: E402
+from aiwd.cite_check import (  # noqa: E402
+    CiteCheckConfig,
+    CiteCheckLLMCache,
+    CiteCheckRunner,
+    EvidenceParagraph,
+    PapersTitleIndex,
+    extract_reference_title,
+    group_references_by_year,
+    match_reference_entry,
+    verify_citation_with_llm,
+)
 from aiwd.citeextract.references import ReferenceEntry  # noqa: E402
 
 
@@ -31,6 +43,8 @@ class TestCiteCheckHelpers(unittest.TestCase):
         hit = match_reference_entry(cited_author="Smith", cited_year="2020", references=refs)
         self.assertIsNotNone(hit)
         self.assertEqual(hit.year, "2020")
+        grouped = match_reference_entry(cited_author="Smith", cited_year="2020", references=group_references_by_year(refs))
+        self.assertIs(grouped, hit)
         self.assertIn("Smith", hit.authors)
 
     def test_match_reference_entry_short_surname_boundary(self):
@@ -52,5 +66,367 @@ class TestCiteCheckHelpers(unittest.TestCase):
         self.assertEqual(hit.authors, "张三")
 
 
+
+class TestThrottledReport(unittest.TestCase):
+    def test_emits_bounded_updates_per_stage(self):
+        calls = []
+        report = cite_check._throttled_report(lambda *a: calls.append(a))
+        for i in range(0, 1001):
+            report("checking", i, 1000, "x")
+        report("para", 0, 0, "indeterminate")
+        n_checking = sum(1 for c in calls if c[0] == "checking")
+        self.assertLessEqual(n_checking, 102)
+        self.assertEqual(calls[0][:3], ("checking", 0, 1000))
+        self.assertIn(("checking", 1000, 1000, "x"), calls)
+        self.assertEqual(calls[-1][0], "para")
+
+        # A stage restarting from a lower count is not swallowed.
+        calls.clear()
+        report("checking", 3, 1000, "restart")
+        self.assertEqual(len(calls), 1)
+
+        cite_check._throttled_report(None)("checking", 1, 2)
+
+
+class CountingLLM:
+    def __init__(self, content: str):
+        self.content = content
+        self.calls = 0
+
+    def chat(self, *args, **kwargs):
+        self.calls += 1
+        return 200, {"choices": [{"message": {"content": self.content}}], "usage": {"prompt_tokens": 5, "completion_tokens": 5, "total_tokens": 10}}
+
+
+class TestCiteCheckLLMCache(unittest.TestCase):
+    def setUp(self):
+        cite_check._VERIFY_MEMO.clear()
+        self.addCleanup(cite_check._VERIFY_MEMO.clear)
+
+    def _verify(self, llm, cache, sentence: str) -> dict:
+        return verify_citation_with_llm(
+            llm=llm,
+            citation_sentence=sentence,
+            cited_author="Smith",
+            cited_year="2020",
+            ref_title="A Paper",
+            paper_summary="",
+            evidence=[EvidenceParagraph(page=2, score=0.8, text="Liquidity affects returns.")],
+            cache=cache,
+        )
+
+    def test_cache_hit_skips_llm_across_instances(self):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        llm = CountingLLM('{"verdict":"ACCURATE","confidence":0.9,"claim":"c","reason":"r","suggested_fix":""}')
+
+        cache = CiteCheckLLMCache(cache_dir=td.name, model="m")
+        v1 = self._verify(llm, cache, "Smith (2020) shows liquidity affects returns.")
+        self.assertEqual(v1["verdict"], "ACCURATE")
+        self.assertEqual(llm.calls, 1)
+        cache.save()
+        cite_check._VERIFY_MEMO.clear()
+
+        cache2 = CiteCheckLLMCache(cache_dir=td.name, model="m")
+        v2 = self._verify(llm, cache2, "Smith  (2020) shows liquidity\naffects returns.")
+        self.assertEqual(v2["verdict"], "ACCURATE")
+        self.assertEqual(llm.calls, 1)
+
+    def test_similar_sentence_is_verified_on_its_own(self):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        llm = CountingLLM('{"verdict":"ACCURATE","confidence":0.9,"claim":"c","reason":"r","suggested_fix":""}')
+        cache = CiteCheckLLMCache(cache_dir=td.name, model="m")
+        self._verify(llm, cache, "Smith (2020) shows liquidity affects returns.")
+        # A negation is a near-duplicate to an embedding model, but never shares a verdict.
+        self._verify(llm, cache, "Smith (2020) shows liquidity does not affect returns.")
+        self.assertEqual(llm.calls, 2)
+
+    def test_in_process_memo_dedupes_without_disk_cache(self):
+        llm = CountingLLM('{"verdict":"INACCURATE","confidence":0.7,"claim":"c","reason":"r","suggested_fix":"f"}')
+        v1 = self._verify(llm, None, "Smith (2020) shows liquidity affects returns.")
+        v2 = self._verify(llm, None, "Smith (2020) shows liquidity affects returns.")
+        self.assertEqual(v1, v2)
+        self.assertEqual(llm.calls, 1)
+        self._verify(llm, None, "Smith (2020) finds no effect of liquidity.")
+        self.assertEqual(llm.calls, 2)
+
+    def test_in_process_memo_keys_on_evidence_as_prompted(self):
+        llm = CountingLLM('{"verdict":"ACCURATE","confidence":0.9,"claim":"c","reason":"r","suggested_fix":""}')
+        prefix = "Liquidity affects returns in every market we study, " * 2
+        a = EvidenceParagraph(page=2, score=0.8, text=prefix + "and the effect is large.")
+        b = EvidenceParagraph(page=3, score=0.7, text="Volatility is unrelated.")
+        c = EvidenceParagraph(page=2, score=0.8, text=prefix + "but the effect vanishes after 2000.")
+        for ev in ([a, b], [b, a], [c, b]):
+            verify_citation_with_llm(
+                llm=llm, citation_sentence="Smith (2020) shows liquidity affects returns.", cited_author="Smith", cited_year="2020", ref_title="A Paper", paper_summary="", evidence=ev
+            )
+        # Reordered evidence and evidence that differs only after a long shared prefix are new prompts.
+        self.assertEqual(llm.calls, 3)
+
+
+class TestPapersTitleIndexDelta(unittest.TestCase):
+    def _make_pdf(self, path, text):
+        import fitz  # PyMuPDF
+
+        doc = fitz.open()
+        p = doc.new_page()
+        p.insert_text((72, 72), text)
+        doc.save(path)
+        doc.close()
+
+    def test_rebuild_embeds_only_new_pdfs(self):
+        import numpy as np
+
+        embedded = []
+
+        def embed(texts):
+            embedded.extend(texts)
+            return np.ones((len(texts), 4), dtype=np.float32)
+
+        with tempfile.TemporaryDirectory() as td:
+            papers = os.path.join(td, "papers")
+            os.makedirs(papers)
+            self._make_pdf(os.path.join(papers, "a.pdf"), "Alpha Paper Title")
+            self._make_pdf(os.path.join(papers, "b.pdf"), "Beta Paper Title")
+
+            def make_index():
+                return PapersTitleIndex(cache_dir=td, papers_root=papers, embed_texts=embed, model_fingerprint={"m": 1})
+
+            idx = make_index()
+            idx.build()
+            self.assertEqual(len(embedded), 2)
+
+            embedded.clear()
+            idx = make_index()
+            idx.build()
+            self.assertEqual(embedded, [])
+            self.assertEqual(len(idx.entries), 2)
+            self.assertEqual(idx.vecs.dtype, np.int8)
+            self.assertAlmostEqual(idx.search("Alpha", top_k=1)[0]["score"], 1.0, places=2)
+            embedded.clear()
+
+            self._make_pdf(os.path.join(papers, "c.pdf"), "Gamma Paper Title")
+            os.remove(os.path.join(papers, "a.pdf"))
+            idx = make_index()
+            idx.build()
+            self.assertEqual(len(embedded), 1)
+            self.assertTrue(embedded[0].startswith("c.pdf"))
+            self.assertEqual(sorted(e["rel"] for e in idx.entries), ["b.pdf", "c.pdf"])
+            self.assertEqual(int(idx.vecs.shape[0]), 2)
+
+    def test_runner_reuses_built_index_in_process(self):
+        import numpy as np
+
+        def embed(texts):
+            return np.ones((len(texts), 4), dtype=np.float32)
+
+        with tempfile.TemporaryDirectory() as td:
+            papers = os.path.join(td, "papers")
+            os.makedirs(papers)
+            self._make_pdf(os.path.join(papers, "a.pdf"), "Alpha Paper Title")
+            self.addCleanup(CiteCheckRunner._title_index_cache.clear)
+
+            r1 = CiteCheckRunner(data_dir=td, embed_texts=embed, model_fingerprint={"m": 1})
+            idx = r1._title_index(papers)
+            idx.build()
+
+            r2 = CiteCheckRunner(data_dir=td, embed_texts=embed, model_fingerprint={"m": 1})
+            self.assertIs(r2._title_index(papers), idx)
+            self.assertIsNot(r2._title_index(td), idx)
+            r3 = CiteCheckRunner(data_dir=td, embed_texts=embed, model_fingerprint={"m": 2})
+            self.assertIsNot(r3._title_index(papers), idx)
+
+            # A rebuild diffs against memory (no cache read) and still sees new PDFs.
+            reads = []
+            orig = idx._read_cache
+            idx._read_cache = lambda: reads.append(1) or orig()
+            self._make_pdf(os.path.join(papers, "b.pdf"), "Beta Paper Title")
+            idx.build()
+            self.assertEqual(reads, [])
+            self.assertEqual(sorted(e["rel"] for e in idx.entries), ["a.pdf", "b.pdf"])
+
+    def test_shared_index_cache_is_bounded_and_keeps_its_embedder(self):
+        import numpy as np
+
+        calls = []
+
+        def embed1(texts):
+            calls.append("r1")
+            return np.ones((len(texts), 4), dtype=np.float32)
+
+        def embed2(texts):
+            calls.append("r2")
+            return np.ones((len(texts), 4), dtype=np.float32)
+
+        with tempfile.TemporaryDirectory() as td:
+            self.addCleanup(CiteCheckRunner._title_index_cache.clear)
+            CiteCheckRunner._title_index_cache.clear()
+            r1 = CiteCheckRunner(data_dir=td, embed_texts=embed1, model_fingerprint={"m": 1})
+            r2 = CiteCheckRunner(data_dir=td, embed_texts=embed2, model_fingerprint={"m": 1})
+            idx = r1._title_index(td)
+            self.assertIs(r2._title_index(td), idx)
+            self.assertIs(idx.embed_texts, embed1)
+
+            idx.entries = [{"rel": "a.pdf", "filename": "a.pdf", "title_area": ""}]
+            idx.vecs = np.ones((1, 4), dtype=np.float32)
+            idx.search("alpha", embed_texts=embed2)
+            idx.search("alpha")
+            self.assertEqual(calls, ["r2", "r1"])
+
+            for i in range(CiteCheckRunner._TITLE_INDEX_CACHE_MAX + 2):
+                r1._title_index(os.path.join(td, str(i)))
+            self.assertEqual(len(CiteCheckRunner._title_index_cache), CiteCheckRunner._TITLE_INDEX_CACHE_MAX)
+            self.assertIsNot(r1._title_index(td), idx)
+
+    def test_find_by_author_year_uses_year_buckets(self):
+        with tempfile.TemporaryDirectory() as td:
+            idx = PapersTitleIndex(cache_dir=td, papers_root=td, embed_texts=None, model_fingerprint={})
+            idx.entries = [
+                {"rel": "a.pdf", "filename": "Smith 2020 Liquidity.pdf"},
+                {"rel": "b.pdf", "filename": "Wang and Li 2019a.pdf"},
+                {"rel": "c.pdf", "filename": "Li 2019.pdf"},
+            ]
+            self.assertEqual(idx.find_by_author_year("Smith", "2020")["rel"], "a.pdf")
+            self.assertEqual(idx.find_by_author_year("Wang and Li", "2019a")["rel"], "b.pdf")
+            self.assertEqual(idx.find_by_author_year("Li", "2019")["rel"], "b.pdf")
+            self.assertIsNone(idx.find_by_author_year("Smith", "2019"))
+
+            # Replacing entries invalidates the buckets.
+            idx.entries = [{"rel": "d.pdf", "filename": "Smith_2019.pdf"}]
+            self.assertEqual(idx.find_by_author_year("Smith", "2019")["rel"], "d.pdf")
+
+    def test_search_batch_matches_single_queries(self):
+        import numpy as np
+
+        basis = {"alpha": [1, 0, 0], "beta": [0, 1, 0], "gamma": [0, 0, 1]}
+
+        def embed(texts):
+            rows = []
+            for t in texts:
+                v = np.zeros(3, dtype=np.float32)
+                for word, b in basis.items():
+                    if word in t.lower():
+                        v += np.asarray(b, dtype=np.float32)
+                rows.append(v)
+            return np.stack(rows)
+
+        with tempfile.TemporaryDirectory() as td:
+            idx = PapersTitleIndex(cache_dir=td, papers_root=td, embed_texts=embed, model_fingerprint={})
+            idx.entries = [{"rel": f"{w}.pdf", "filename": f"{w}.pdf", "title_area": w} for w in basis]
+            idx.vecs = embed([e["title_area"] for e in idx.entries])
+
+            batch = idx.search_batch(["alpha", "", "beta gamma"], top_k=2)
+            self.assertEqual(batch[1], [])
+            self.assertEqual([e["rel"] for e in batch[0]][0], "alpha.pdf")
+            self.assertEqual(batch[2], idx.search("beta gamma", top_k=2))
+
+            found = idx.find_by_title_batch([("Gamma", ""), ("", ""), ("delta", "")], threshold=0.5)
+            self.assertEqual(found[0]["rel"], "gamma.pdf")
+            self.assertIsNone(found[1])
+            self.assertIsNone(found[2])
+
+
+
+class TestCiteCheckEvidenceFloor(unittest.TestCase):
+    def _make_pdf(self, path, pages):
+        import fitz  # PyMuPDF
+
+        doc = fitz.open()
+        for text in pages:
+            p = doc.new_page()
+            p.insert_textbox(fitz.Rect(50, 50, 550, 800), text)
+        doc.save(path)
+        doc.close()
+
+    def _run(self, embed):
+        llm = CountingLLM('{"verdict":"ACCURATE","confidence":0.9,"claim":"c","reason":"ok","suggested_fix":""}')
+        with tempfile.TemporaryDirectory() as td:
+            papers = os.path.join(td, "papers")
+            os.makedirs(papers)
+            self._make_pdf(
+                os.path.join(papers, "Smith 2020 Liquidity.pdf"),
+                ["Liquidity and Returns. Smith. We show liquidity affects returns strongly in many markets. This paragraph is long enough to be indexed as evidence."],
+            )
+            main = os.path.join(td, "main.pdf")
+            self._make_pdf(
+                main,
+                [
+                    "Introduction\nPrior work shows liquidity affects returns (Smith, 2020).",
+                    "References\nSmith, J. (2020). Liquidity and Returns. Journal of Finance.",
+                ],
+            )
+            runner = CiteCheckRunner(data_dir=td, embed_texts=embed, model_fingerprint={"m": 1})
+            self.addCleanup(CiteCheckRunner._title_index_cache.clear)
+            out = runner.run(main_pdf_path=main, papers_root=papers, library_pdf_root=papers, cfg=CiteCheckConfig(), llm=llm)
+        return out, llm
+
+    def test_low_evidence_skips_llm(self):
+        import numpy as np
+
+        def embed(texts):
+            # Citation sentences and PDF paragraphs land on orthogonal axes.
+            return np.stack([np.asarray([1, 0] if "Prior work" in t else [0, 1], dtype=np.float32) for t in texts])
+
+        out, llm = self._run(embed)
+        self.assertEqual(out["counts"], {"NO_EVIDENCE": 1})
+        self.assertEqual(llm.calls, 0)
+
+    def test_relevant_evidence_calls_llm(self):
+        import numpy as np
+
+        def embed(texts):
+            return np.ones((len(texts), 2), dtype=np.float32)
+
+        cite_check._VERIFY_MEMO.clear()
+        out, llm = self._run(embed)
+        self.assertEqual(out["counts"], {"ACCURATE": 1})
+        self.assertEqual(llm.calls, 1)
+
+    def test_failed_batch_embed_is_reported_and_built_per_pdf(self):
+        import numpy as np
+
+        def embed(texts):
+            # The cross-PDF paragraph batch fails (title-index texts carry the file name); the per-PDF
+            # builds in the main loop succeed.
+            paras = [t for t in texts if ".pdf" not in t]
+            if any("Liquidity and Returns" in t for t in paras) and any("Momentum Everywhere" in t for t in paras):
+                raise RuntimeError("embed backend down")
+            return np.ones((len(texts), 2), dtype=np.float32)
+
+        events = []
+        with tempfile.TemporaryDirectory() as td:
+            papers = os.path.join(td, "papers")
+            os.makedirs(papers)
+            self._make_pdf(
+                os.path.join(papers, "Smith 2020 Liquidity.pdf"),
+                ["Liquidity and Returns. Smith. We show liquidity affects returns strongly in many markets. This paragraph is long enough to be indexed as evidence."],
+            )
+            self._make_pdf(
+                os.path.join(papers, "Doe 2019 Momentum.pdf"),
+                ["Momentum Everywhere. Doe. Momentum profits are robust across asset classes and time. This paragraph is long enough to be indexed as evidence."],
+            )
+            main = os.path.join(td, "main.pdf")
+            self._make_pdf(
+                main,
+                [
+                    "Introduction\nPrior work shows liquidity affects returns (Smith, 2020). Momentum is robust (Doe, 2019).",
+                    "References\nSmith, J. (2020). Liquidity and Returns. Journal of Finance.\nDoe, K. (2019). Momentum Everywhere. Journal of Finance.",
+                ],
+            )
+            runner = CiteCheckRunner(data_dir=td, embed_texts=embed, model_fingerprint={"m": 1})
+            self.addCleanup(CiteCheckRunner._title_index_cache.clear)
+            out = runner.run(
+                main_pdf_path=main,
+                papers_root=papers,
+                library_pdf_root=papers,
+                cfg=CiteCheckConfig(use_llm=False),
+                progress_cb=lambda *a: events.append(a),
+            )
+        self.assertTrue(any(st == "para" and "embed backend down" in detail for st, _d, _t, detail in events))
+        self.assertEqual(out["counts"], {"EVIDENCE_ONLY": 2})
+        self.assertTrue(all(item["evidence"] for item in out["items"]))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,6 @@
 import os
 import sys
+import tempfile
 import unittest
 
 
@@ -8,7 +9,15 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
 
-from aiwd.citeextract.pipeline import iter_citation_sentences_from_pages  # noqa: E402
+from aiwd.citeextract import pdf_text  # noqa: E402
+from aiwd.citeextract.pdf_text import extract_pdf_pages, extract_pdf_pages_parallel, iter_pdf_pages  # noqa: E402
+from aiwd.citeextract.pipeline import (  # noqa: E402
+    _clear_pages_cache,
+    iter_citation_sentence_dicts_from_pages,
+    iter_citation_sentences,
+    iter_citation_sentences_from_pages,
+    iter_citation_sentences_parallel,
+)
 
 
 class TestCiteExtractPipeline(unittest.TestCase):
@@ -27,6 +36,122 @@ class TestCiteExtractPipeline(unittest.TestCase):
         self.assertTrue(recs, "should extract citation sentences before References heading on same page")
         self.assertTrue(any("Smith" in r.sentence and "2020" in r.sentence for r in recs))
 
+    def test_page_stream_is_not_read_past_references(self):
+        read = []
+
+        def stream():
+            for text in ["Smith (2020) shows this.", "References\nSmith, J. (2020). Title.", "Doe (2019) appendix."]:
+                read.append(text)
+                yield text
+
+        recs = list(iter_citation_sentences_from_pages(stream(), pdf_label="main.pdf", stop_at_references=True))
+        self.assertEqual([r.page for r in recs], [1])
+        self.assertEqual(len(read), 2)
+
+    def test_sentence_dicts_match_record_to_dict(self):
+        pages = [
+            "Smith (2020) and Doe (2019a, b) disagree. No citation here.",
+            "As shown before (Lee, 2018; Kim and Park, 2021), results hold.",
+            "References\nSmith, J. (2020). Title.",
+        ]
+        recs = list(iter_citation_sentences_from_pages(pages, pdf_label="main.pdf"))
+        rows = list(iter_citation_sentence_dicts_from_pages(pages, pdf_label="main.pdf"))
+        self.assertTrue(rows)
+        self.assertEqual(rows, [r.to_dict() for r in recs])
+
+
+class TestPdfTextParallel(unittest.TestCase):
+    def test_parallel_extraction_matches_serial(self):
+        import fitz  # PyMuPDF
+
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "long.pdf")
+            doc = fitz.open()
+            for i in range(11):
+                page = doc.new_page()
+                page.insert_text((72, 72), f"Page {i + 1} body text.")
+            doc.save(path)
+            doc.close()
+
+            serial = extract_pdf_pages(path)
+            self.assertEqual(len(serial), 11)
+            self.assertEqual(list(iter_pdf_pages(path, max_pages=3)), serial[:3])
+            self.assertEqual(extract_pdf_pages_parallel(path, workers=3), serial)
+            self.assertEqual(extract_pdf_pages_parallel(path, max_pages=9, workers=2), serial[:9])
+
+    def test_load_pdf_pages_stays_serial_by_default(self):
+        import fitz  # PyMuPDF
+        from unittest import mock
+
+        from aiwd.citeextract.pipeline import load_pdf_pages
+
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "long.pdf")
+            doc = fitz.open()
+            for i in range(11):
+                page = doc.new_page()
+                page.insert_text((72, 72), f"Page {i + 1} body text.")
+            doc.save(path)
+            doc.close()
+
+            _clear_pages_cache()
+            self.addCleanup(_clear_pages_cache)
+            with mock.patch.dict(os.environ, {"TOPHUMANWRITING_PDF_WORKERS": ""}), mock.patch.object(
+                pdf_text, "_get_pool", side_effect=AssertionError("process pool used")
+            ):
+                pages = load_pdf_pages(path)
+            self.assertEqual(len(pages), 11)
+            self.assertEqual(load_pdf_pages(path, workers=2), pages)
+
+    def test_page_cache_is_bounded_by_text_size(self):
+        import fitz  # PyMuPDF
+        from unittest import mock
+
+        from aiwd.citeextract import pipeline
+
+        with tempfile.TemporaryDirectory() as td:
+            paths = []
+            for name in ("a", "b", "c"):
+                path = os.path.join(td, f"{name}.pdf")
+                doc = fitz.open()
+                page = doc.new_page()
+                page.insert_text((72, 72), f"Paper {name} body text.")
+                doc.save(path)
+                doc.close()
+                paths.append(path)
+
+            _clear_pages_cache()
+            self.addCleanup(_clear_pages_cache)
+            one = sum(len(p) for p in pipeline.load_pdf_pages(paths[0]))
+            _clear_pages_cache()
+            with mock.patch.object(pipeline, "_PAGES_CACHE_MAX_CHARS", 2 * one):
+                for path in paths:
+                    pipeline.load_pdf_pages(path)
+                pipeline.load_pdf_pages(paths[2])
+                self.assertEqual([k[0] for k in pipeline._PAGES_CACHE], paths[1:])
+                self.assertLessEqual(pipeline._PAGES_CACHE_CHARS, 2 * one)
+
+    def test_parallel_citation_sentences_match_serial(self):
+        import fitz  # PyMuPDF
+
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "cites.pdf")
+            doc = fitz.open()
+            words = ["liquidity", "momentum", "value", "size", "quality", "carry", "volatility", "growth", "profit", "beta"]
+            for i, word in enumerate(words):
+                page = doc.new_page()
+                page.insert_text((72, 72), f"The {word} effect follows Smith ({2000 + i}). No citation on {word}.")
+            page = doc.new_page()
+            page.insert_text((72, 72), "References")
+            page.insert_text((72, 100), "Smith, J. (2001). Title.")
+            doc.save(path)
+            doc.close()
+
+            serial = [r.to_dict() for r in iter_citation_sentences(path, pdf_label="p")]
+            self.assertEqual(len(serial), 10)
+            par = [r.to_dict() for r in iter_citation_sentences_parallel(path, pdf_label="p", workers=2)]
+            self.assertEqual(par, serial)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,16 @@
 # -*- coding: utf-8 -*-
 
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
+from unittest.mock import patch
 
-from aiwd.llm_review import LLMBudget, review_outline_structure, review_paragraph_alignment, review_sentence_alignment
+from aiwd.llm_budget import approx_tokens
+from aiwd.llm_cache import LLMJsonCache
+from aiwd.llm_review import _LLM_BREAKERS, LLMBudget, _call_llm_json, _CircuitBreaker, _count_en_zh, _find_token_context, _get_llm_pool, _pack_batches, _TokenContextIndex, review_citation_style, review_lexical_alignment, review_outline_structure, review_paragraph_alignment, review_sentence_alignment
 
 
 class StubLLM:
@@ -41,6 +49,33 @@ class TestLLMReview(unittest.TestCase):
         self.assertEqual(len(items), 1)
         self.assertEqual(int(items[0].get("id", -1)), 12)
 
+    def test_sentence_alignment_lists_shared_exemplars_once(self):
+        shared = {"pdf": "ex.pdf", "page": 3, "text": "In this paper, we study how risk premia vary."}
+        audit_items = [
+            {"id": sid, "page": 1, "text": f"Target sentence {sid}.", "alignment": {"score": 0.1, "exemplars": [shared]}}
+            for sid in (1, 2)
+        ]
+        llm = ScriptedLLM(
+            [(200, '{"items":[{"id":2,"diagnosis":[{"problem":"p","suggestion":"s","evidence":[{"id":"E1","quote":"In this paper"}]}]}]}')]
+        )
+        r = review_sentence_alignment(audit_items=audit_items, budget=LLMBudget(), llm=llm, batch_size=6, evidence_top_k=1)
+        self.assertEqual(llm.prompts[0].count(shared["text"]), 1)
+        self.assertEqual(llm.prompts[0].count("EVIDENCE: E1"), 2)
+        self.assertEqual([int(x["id"]) for x in r.get("items", [])], [2])
+        self.assertEqual(r["items"][0]["diagnosis"][0]["evidence"][0]["pdf"], "ex.pdf")
+
+    def test_targets_without_exemplars_are_not_sent(self):
+        audit_items = [{"id": 1, "page": 1, "text": "No exemplar for this one.", "alignment": {"score": 0.1, "exemplars": []}}]
+        llm = ScriptedLLM([])
+        r = review_sentence_alignment(audit_items=audit_items, budget=LLMBudget(), llm=llm)
+        self.assertEqual(r.get("reason"), "no_candidates")
+        self.assertEqual(llm.prompts, [])
+
+        sents = [{"pdf": "p.pdf", "page": 2, "sentence": "Smith (2020) shows this.", "citations": []}]
+        r = review_citation_style(paper_citation_sentences=sents, cite_search=lambda q, k: [], budget=LLMBudget(), llm=llm)
+        self.assertEqual(r.get("items"), [])
+        self.assertEqual(llm.prompts, [])
+
     def test_outline_review_requires_evidence_quote(self):
         paper_heads = [{"page": 1, "level": 1, "text": "1 Introduction"}]
         exemplar_outlines = [{"seq": "introduction > data > results > conclusion", "example": {"pdf_rel": "a.pdf"}}]
@@ -67,6 +102,377 @@ class TestLLMReview(unittest.TestCase):
         self.assertFalse(r.get("skipped", False))
         self.assertEqual(len(r.get("items", [])), 1)
 
+    def test_paragraph_review_searches_duplicate_text_once(self):
+        text = "This is a long paragraph about liquidity and returns. " * 30
+        paras = [{"id": f"P{i}", "page": 1, "text": text, "lang": "en", "sentences": []} for i in range(3)]
+        queries = []
+
+        def rag_search(q: str, k: int):
+            queries.append((q, k))
+            return [(0.8, {"pdf": "ex.pdf", "page": 2, "text": "To this end, we propose a simple approach."})]
+
+        budget = LLMBudget(max_cost=5.0, cost_per_1m_tokens=0.2)
+        r = review_paragraph_alignment(paper_paragraphs=paras, rag_search=rag_search, budget=budget, llm=StubLLM('{"items":[]}'), top_n=3, batch_size=1, evidence_top_k=1)
+        self.assertFalse(r.get("skipped", False))
+        self.assertEqual(queries, [(text.strip(), 1)])
+
+    def test_paragraph_review_retrieves_each_batch_in_one_call(self):
+        paras = [{"id": f"P{i}", "page": 1, "text": f"Paragraph {i} about liquidity and returns. " * 30, "lang": "en", "sentences": []} for i in range(3)]
+        single, batched = [], []
+        hit = (0.8, {"pdf": "ex.pdf", "page": 2, "text": "To this end, we propose a simple approach."})
+
+        def rag_search(q: str, k: int):
+            single.append(q)
+            return [hit]
+
+        def rag_search_batch(qs, k: int):
+            batched.append(len(qs))
+            return [[hit] for _ in qs]
+
+        r = review_paragraph_alignment(
+            paper_paragraphs=paras, rag_search=rag_search, rag_search_batch=rag_search_batch, budget=LLMBudget(), llm=StubLLM('{"items":[]}'), top_n=3, batch_size=2, evidence_top_k=1
+        )
+        self.assertFalse(r.get("skipped", False))
+        # The trailing one-paragraph batch takes the plain path.
+        self.assertEqual(batched, [2])
+        self.assertEqual(len(single), 1)
+
+    def test_paragraph_batches_pack_to_prompt_token_cap(self):
+        prompts = []
+
+        class RecordingLLM(StubLLM):
+            def chat(self, *args, **kwargs):
+                prompts.append(kwargs["messages"][-1]["content"])
+                return super().chat(*args, **kwargs)
+
+        short = "A short paragraph about returns and liquidity in markets. " * 2
+        long = "\u98ce\u9669\u6ea2\u4ef7" * 200
+        paras = [{"id": f"P{i}", "page": i + 1, "text": t, "lang": "en", "sentences": []} for i, t in enumerate([short, short, long, long])]
+
+        def rag_search(q: str, k: int):
+            return [(0.8, {"pdf": "ex.pdf", "page": 2, "text": "To this end, we propose a simple approach."})]
+
+        review_paragraph_alignment(
+            paper_paragraphs=paras, rag_search=rag_search, budget=LLMBudget(), llm=RecordingLLM('{"items":[]}'), top_n=4, batch_size=4, evidence_top_k=1, max_prompt_tokens=1200
+        )
+        # The two long paragraphs cannot share a prompt; the short ones fill the second one.
+        self.assertEqual(sorted(p.count("PARAGRAPH P") for p in prompts), [1, 3])
+
+    def test_token_context_index_matches_linear_scan(self):
+        paper = {
+            "paragraphs": [
+                {"id": "P0", "page": 1, "text": "Risk-premia vary. " * 40, "sentences": [{"text": "Risk-premia vary."}]},
+                {"id": "P1", "page": 2, "text": "A \u017ftrong and strong signal; risky bets.", "sentences": []},
+            ],
+            "headings": [{"page": 3, "text": "Kelvin \u212aelvin data"}],
+        }
+        idx = _TokenContextIndex(paper)
+        for tok in ["risk", "RISK", "premia", "strong", "trong", "risky", "kelvin", "data", "p-value", "missing", "", "\u98ce\u9669"]:
+            for lang in ("en", "zh"):
+                self.assertEqual(idx.find(token=tok, language=lang), _find_token_context(paper, token=tok, language=lang), (tok, lang))
+
+    def test_lexical_review_sends_each_token_once(self):
+        prompts = []
+
+        class RecordingLLM(StubLLM):
+            def chat(self, *args, **kwargs):
+                prompts.append(kwargs["messages"][-1]["content"])
+                return super().chat(*args, **kwargs)
+
+        rare = {"en": [{"token": "utilize", "paper_count": 3}, {"token": "utilize", "paper_count": 2}, {"token": "leverage", "paper_count": 1}]}
+        paper = {"paragraphs": [{"id": "P0", "page": 1, "text": "We utilize and leverage the data."}]}
+
+        def rag_search(q: str, k: int):
+            return [(0.8, {"pdf": "ex.pdf", "page": 2, "text": "We use the data."})]
+
+        review_lexical_alignment(
+            lexical={"rare_in_exemplars": rare}, paper_structure=paper, rag_search=rag_search, budget=LLMBudget(), llm=RecordingLLM('{"items":[]}'), top_n=2, batch_size=4
+        )
+        self.assertEqual(len(prompts), 1)
+        self.assertEqual(prompts[0].count("token=utilize"), 1)
+        self.assertIn("token=leverage", prompts[0])
+
+
+class EchoLLM:
+    """Answers every batch for all of its target ids, and records how many calls overlap."""
+
+    def __init__(self, delay_s: float = 0.05):
+        self.delay_s = delay_s
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def chat(self, *, messages, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay_s)
+            prompt = messages[-1]["content"]
+            ids = [int(line.split("id=")[1]) for line in prompt.splitlines() if line.startswith("T") and ": id=" in line]
+            items = [
+                {"id": sid, "diagnosis": [{"problem": "p", "suggestion": "s", "evidence": [{"id": f"S{sid}_E1", "quote": ""}]}]}
+                for sid in ids
+            ]
+            usage = {"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30}
+            return 200, {"choices": [{"message": {"content": json.dumps({"items": items})}}], "usage": usage}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestLLMReviewBatchDispatch(unittest.TestCase):
+    def _audit_items(self, n: int):
+        return [
+            {
+                "id": i,
+                "page": 1 + i // 3,
+                "text": f"Target sentence number {i} about liquidity.",
+                "issues": [{"issue_type": "low_alignment"}],
+                "alignment": {"score": 0.1, "exemplars": [{"pdf": "ex.pdf", "page": 2, "text": f"Exemplar {i} text."}]},
+            }
+            for i in range(1, n + 1)
+        ]
+
+    def test_batches_run_concurrently_and_merge_in_order(self):
+        llm = EchoLLM()
+        budget = LLMBudget(max_cost=5.0, cost_per_1m_tokens=0.2)
+        r = review_sentence_alignment(audit_items=self._audit_items(8), budget=budget, llm=llm, top_n=8, batch_size=2, evidence_top_k=1)
+        self.assertEqual([int(x["id"]) for x in r["items"]], list(range(1, 9)))
+        self.assertEqual(llm.calls, 4)
+        self.assertGreater(llm.max_in_flight, 1)
+        self.assertEqual(budget.calls, 4)
+        self.assertEqual(budget.total_tokens, 4 * 30)
+
+    def test_tight_budget_dispatches_one_batch_at_a_time(self):
+        llm = EchoLLM(delay_s=0.01)
+        # Each call reserves a 4096-token completion: room for one call in flight, not two.
+        budget = LLMBudget(max_total_tokens=6000)
+        review_sentence_alignment(audit_items=self._audit_items(8), budget=budget, llm=llm, top_n=8, batch_size=2, evidence_top_k=1)
+        self.assertEqual(llm.max_in_flight, 1)
+        self.assertGreaterEqual(llm.calls, 1)
+
+        # Room for two calls in flight, not all four: concurrency is capped, not given up.
+        llm = EchoLLM(delay_s=0.01)
+        budget = LLMBudget(max_total_tokens=10000)
+        review_sentence_alignment(audit_items=self._audit_items(8), budget=budget, llm=llm, top_n=8, batch_size=2, evidence_top_k=1)
+        self.assertLessEqual(llm.max_in_flight, 2)
+        self.assertEqual(llm.calls, 4)
+
+    def test_other_worker_count_keeps_a_running_pool_usable(self):
+        pool = _get_llm_pool(3)
+        other = _get_llm_pool(5)
+        self.assertIsNot(pool, other)
+        self.assertIs(_get_llm_pool(3), pool)
+        # A pass still holding the first executor can keep submitting to it.
+        self.assertEqual(pool.submit(lambda: 7).result(), 7)
+
+    def test_large_budget_keeps_paragraph_batches_concurrent(self):
+        llm = EchoLLM(delay_s=0.02)
+        paras = [{"id": f"P{i}", "page": 1 + i // 2, "text": f"Paragraph {i} on liquidity and returns. " * 30, "lang": "en", "sentences": []} for i in range(160)]
+        hit = [(0.8, {"pdf": "ex.pdf", "page": 2, "text": "To this end, we propose a simple approach."})]
+        review_paragraph_alignment(
+            paper_paragraphs=paras, rag_search=lambda q, k: hit, budget=LLMBudget(max_total_tokens=1_000_000), llm=llm, top_n=160, batch_size=8, evidence_top_k=1, max_prompt_tokens=6000
+        )
+        self.assertGreater(llm.calls, 1)
+        self.assertGreater(llm.max_in_flight, 1)
+
+
+    def test_retrieval_for_later_batches_overlaps_sent_calls(self):
+        events = []
+
+        class SlowLLM(StubLLM):
+            def chat(self, *args, **kwargs):
+                events.append("call")
+                time.sleep(0.05)
+                return super().chat(*args, **kwargs)
+
+        def rag_search(q: str, k: int):
+            events.append("search")
+            time.sleep(0.01)
+            return [(0.8, {"pdf": "ex.pdf", "page": 2, "text": "To this end, we propose a simple approach."})]
+
+        paras = [{"id": f"P{i}", "page": 1 + i // 2, "text": f"Paragraph {i} about liquidity and returns. " * 4, "lang": "en", "sentences": []} for i in range(4)]
+        review_paragraph_alignment(paper_paragraphs=paras, rag_search=rag_search, budget=LLMBudget(), llm=SlowLLM('{"items":[]}'), top_n=4, batch_size=1, evidence_top_k=1)
+        self.assertEqual(events.count("call"), 4)
+        self.assertLess(events.index("call"), len(events) - 1 - events[::-1].index("search"))
+
+    def test_repeat_review_is_served_from_cache(self):
+        with tempfile.TemporaryDirectory() as td:
+            cache = LLMJsonCache(cache_dir=td)
+            first_llm = EchoLLM(delay_s=0.0)
+            first = review_sentence_alignment(
+                audit_items=self._audit_items(4), budget=LLMBudget(), llm=first_llm, top_n=4, batch_size=2, evidence_top_k=1, cache=cache
+            )
+            self.assertEqual(first_llm.calls, 2)
+
+            second_llm = EchoLLM(delay_s=0.0)
+            budget = LLMBudget()
+            second = review_sentence_alignment(
+                audit_items=self._audit_items(4), budget=budget, llm=second_llm, top_n=4, batch_size=2, evidence_top_k=1, cache=cache
+            )
+            self.assertEqual(second_llm.calls, 0)
+            self.assertEqual(budget.calls, 0)
+            self.assertEqual(second["items"], first["items"])
+
+    def test_cache_keys_on_response_format_and_writes_unique_temp_files(self):
+        base = dict(model="m", system="s", prompt="p", max_tokens=10, temperature=0.0)
+        k_obj = LLMJsonCache.key(**base, response_format={"type": "json_object"})
+        k_schema = LLMJsonCache.key(**base, response_format={"type": "json_schema", "json_schema": {"name": "review"}})
+        self.assertNotEqual(k_obj, k_schema)
+        self.assertEqual(LLMJsonCache.key(**base), LLMJsonCache.key(**base, response_format=None))
+
+        with tempfile.TemporaryDirectory() as td:
+            cache = LLMJsonCache(cache_dir=td)
+            threads = [threading.Thread(target=cache.put, args=(k_obj, {"n": i})) for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertIn(cache.get(k_obj)[0]["n"], range(8))
+            leftovers = [n for _root, _dirs, files in os.walk(td) for n in files if n.endswith(".tmp")]
+            self.assertEqual(leftovers, [])
+
+
+    def test_pack_batches_fills_token_budget(self):
+        # Without a token cap: the fixed stride.
+        self.assertEqual(_pack_batches([10] * 7, head_tokens=100, max_items=3), [(0, 3), (3, 6), (6, 7)])
+        # With one: grow while the prompt fits, never past max_items, at least one item per batch.
+        sizes = [50, 50, 50, 400, 50, 50]
+        packed = _pack_batches(sizes, head_tokens=100, max_items=4, max_prompt_tokens=300)
+        self.assertEqual(packed, [(0, 3), (3, 4), (4, 6)])
+        self.assertEqual(_pack_batches([10] * 9, head_tokens=0, max_items=4, max_prompt_tokens=10**6), [(0, 4), (4, 8), (8, 9)])
+
+    def test_token_estimate_tolerates_lone_surrogates(self):
+        import re
+
+        # Long enough for the vectorized path; the surrogate is counted as a non-CJK char.
+        for text in ("é word " * 300 + "\ud800", "中文 " * 400 + "\udfff tail"):
+            cjk = len(re.findall(r"[\u4e00-\u9fff]", text))
+            self.assertEqual(approx_tokens(text), max(1, int(cjk + (len(text) - cjk) / 4)))
+            self.assertEqual(_count_en_zh(text), (len(re.findall(r"\b[a-z]+\b", text.lower())), cjk))
+
+
+
+class ScriptedLLM:
+    """Replies from a fixed list of (status, content) pairs and records each prompt."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.prompts = []
+        self.formats = []
+
+    def chat(self, *, messages, **kwargs):
+        self.prompts.append(messages[-1]["content"])
+        self.formats.append(kwargs.get("response_format"))
+        status, content = self.replies.pop(0)
+        return status, {"choices": [{"message": {"content": content}}], "usage": {"total_tokens": 5}}
+
+
+class TestCallLLMJsonRetry(unittest.TestCase):
+    def test_client_error_is_not_resent(self):
+        llm = ScriptedLLM([(400, "bad request"), (200, '{"ok": 1}')])
+        obj, meta = _call_llm_json(llm=llm, prompt="p", budget=LLMBudget(), max_tokens=100)
+        self.assertIsNone(obj)
+        self.assertEqual(len(llm.prompts), 1)
+        self.assertEqual(meta.get("status"), 400)
+
+    def test_transient_error_backs_off_then_resends_same_prompt(self):
+        llm = ScriptedLLM([(503, "busy"), (200, '{"ok": 1}')])
+        with patch("aiwd.llm_review.time.sleep") as sleep:
+            obj, _meta = _call_llm_json(llm=llm, prompt="p", budget=LLMBudget(), max_tokens=100)
+        self.assertEqual(obj, {"ok": 1})
+        self.assertEqual(sleep.call_count, 1)
+        self.assertEqual(llm.prompts, ["p", "p"])
+
+    def test_parse_error_resends_with_json_reminder(self):
+        llm = ScriptedLLM([(200, "not json"), (200, '{"ok": 1}')])
+        with patch("aiwd.llm_review.time.sleep") as sleep:
+            obj, _meta = _call_llm_json(llm=llm, prompt="p", budget=LLMBudget(), max_tokens=100)
+        self.assertEqual(obj, {"ok": 1})
+        self.assertEqual(sleep.call_count, 0)
+        self.assertIn("not valid JSON", llm.prompts[1])
+
+    def test_response_schema_sent_only_when_client_supports_it(self):
+        schema = {"type": "object", "properties": {"ok": {"type": "integer"}}}
+        llm = ScriptedLLM([(200, '{"ok": 1}')])
+        _call_llm_json(llm=llm, prompt="p", budget=LLMBudget(), max_tokens=100, response_schema=schema)
+        self.assertEqual(llm.formats, [{"type": "json_object"}])
+
+        llm = ScriptedLLM([(200, '{"ok": 1}')])
+        llm.supports_json_schema = True
+        obj, _meta = _call_llm_json(llm=llm, prompt="p", budget=LLMBudget(), max_tokens=100, response_schema=schema)
+        self.assertEqual(obj, {"ok": 1})
+        self.assertEqual(llm.formats[0]["type"], "json_schema")
+        self.assertEqual(llm.formats[0]["json_schema"]["schema"], schema)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_threshold_then_half_opens_after_cooldown(self):
+        now = [0.0]
+        br = _CircuitBreaker(threshold=3, cooldown_s=30.0, clock=lambda: now[0])
+        self.assertFalse(br.record_failure("k"))
+        self.assertFalse(br.record_failure("k"))
+        self.assertTrue(br.record_failure("k"))
+        self.assertFalse(br.allow("k"))
+        self.assertTrue(br.allow("other"))
+
+        now[0] = 31.0
+        self.assertTrue(br.allow("k"))  # the single half-open trial
+        self.assertFalse(br.allow("k"))
+        self.assertTrue(br.record_failure("k"))  # failed trial re-opens
+        self.assertFalse(br.allow("k"))
+
+        now[0] = 62.0
+        self.assertTrue(br.allow("k"))
+        br.record_success("k")
+        self.assertTrue(br.allow("k"))
+        self.assertTrue(br.allow("k"))
+
+    def test_outage_short_circuits_later_calls(self):
+        llm = ScriptedLLM([(503, "down")] * 10)
+        budget = LLMBudget()
+        _LLM_BREAKERS[llm] = _CircuitBreaker(threshold=3)
+        with patch("aiwd.llm_review.time.sleep"):
+            metas = [_call_llm_json(llm=llm, prompt=f"p{i}", budget=budget, max_tokens=100)[1] for i in range(4)]
+        # One outcome per call: three calls (each resent once) open the breaker, the fourth is refused.
+        self.assertEqual(len(llm.prompts), 6)
+        self.assertEqual(metas[-1].get("reason"), "circuit_open")
+        self.assertIn("llm_error:circuit_open", budget.warnings)
+
+    def test_request_errors_do_not_open_the_breaker(self):
+        llm = ScriptedLLM([(400, "bad request")] * 3 + [(200, '{"ok": 1}')])
+        _LLM_BREAKERS[llm] = _CircuitBreaker(threshold=2)
+        for i in range(3):
+            _call_llm_json(llm=llm, prompt=f"p{i}", budget=LLMBudget(), max_tokens=100)
+        obj, _meta = _call_llm_json(llm=llm, prompt="p3", budget=LLMBudget(), max_tokens=100)
+        self.assertEqual(obj, {"ok": 1})
+
+    def test_budget_skip_hands_back_the_half_open_trial(self):
+        now = [0.0]
+        br = _CircuitBreaker(threshold=1, cooldown_s=30.0, clock=lambda: now[0])
+        br.record_failure("|")
+        now[0] = 31.0
+        llm = ScriptedLLM([(200, '{"ok": 1}')])
+        _LLM_BREAKERS[llm] = br
+        _obj, meta = _call_llm_json(llm=llm, prompt="p", budget=LLMBudget(max_total_tokens=10), max_tokens=100)
+        self.assertEqual(meta.get("reason"), "budget_exceeded")
+        obj, _meta = _call_llm_json(llm=llm, prompt="p", budget=LLMBudget(), max_tokens=100)
+        self.assertEqual(obj, {"ok": 1})
+
+    def test_outage_on_one_client_leaves_others_closed(self):
+        down = ScriptedLLM([(503, "down")] * 20)
+        up = ScriptedLLM([(200, '{"ok": 1}')])
+        with patch("aiwd.llm_review.time.sleep"):
+            for i in range(6):
+                _call_llm_json(llm=down, prompt=f"p{i}", budget=LLMBudget(), max_tokens=100)
+        _obj, meta = _call_llm_json(llm=down, prompt="p6", budget=LLMBudget(), max_tokens=100)
+        self.assertEqual(meta.get("reason"), "circuit_open")
+        obj, _meta = _call_llm_json(llm=up, prompt="p", budget=LLMBudget(), max_tokens=100)
+        self.assertEqual(obj, {"ok": 1})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+
+from aiwd.openai_compat import OpenAICompatClient, OpenAICompatConfig
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+
+    def do_POST(self):
+        _Handler.connections.add(self.client_address)
+        n = int(self.headers.get("Content-Length", "0") or 0)
+        req = json.loads(self.rfile.read(n).decode("utf-8"))
+        body = json.dumps({"choices": [{"message": {"content": req["model"]}}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        _Handler.connections.add(self.client_address)
+        body = json.dumps({"message": {"items": [{"title": self.path}]}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestOpenAICompatKeepAlive(unittest.TestCase):
+    def test_chat_reuses_connection(self):
+        _Handler.connections = set()
+        srv = HTTPServer(("127.0.0.1", 0), _Handler)
+        t = threading.Thread(target=srv.serve_forever, daemon=True)
+        t.start()
+        self.addCleanup(srv.server_close)
+        self.addCleanup(srv.shutdown)
+
+        cfg = OpenAICompatConfig(api_key="k", base_url=f"http://127.0.0.1:{srv.server_port}", model="m1", max_retries=0)
+        cli = OpenAICompatClient(cfg)
+        self.addCleanup(cli.close)
+        for _ in range(3):
+            status, data = cli.chat(messages=[{"role": "user", "content": "hi"}], timeout_s=5.0)
+            self.assertEqual(status, 200)
+            self.assertEqual(data["choices"][0]["message"]["content"], "m1")
+        self.assertEqual(len(_Handler.connections), 1)
+
+
+class _SchemaRejectingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    formats = []
+
+    def do_POST(self):
+        n = int(self.headers.get("Content-Length", "0") or 0)
+        req = json.loads(self.rfile.read(n).decode("utf-8"))
+        fmt = req.get("response_format")
+        _SchemaRejectingHandler.formats.append(fmt)
+        if (fmt or {}).get("type") == "json_schema":
+            code, body = 400, b'{"error": "json_schema unsupported"}'
+        else:
+            code, body = 200, json.dumps({"choices": [{"message": {"content": "{}"}}]}).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestOpenAICompatJsonSchema(unittest.TestCase):
+    def test_rejected_json_schema_falls_back_to_json_object(self):
+        _SchemaRejectingHandler.formats = []
+        srv = HTTPServer(("127.0.0.1", 0), _SchemaRejectingHandler)
+        t = threading.Thread(target=srv.serve_forever, daemon=True)
+        t.start()
+        self.addCleanup(srv.server_close)
+        self.addCleanup(srv.shutdown)
+
+        cfg = OpenAICompatConfig(
+            api_key="k", base_url=f"http://127.0.0.1:{srv.server_port}", model="m1", max_retries=0, json_schema_output=True
+        )
+        cli = OpenAICompatClient(cfg)
+        self.addCleanup(cli.close)
+        self.assertTrue(cli.supports_json_schema)
+        fmt = {"type": "json_schema", "json_schema": {"name": "review", "schema": {"type": "object"}, "strict": True}}
+        status, _data = cli.chat(messages=[{"role": "user", "content": "hi"}], response_format=fmt, timeout_s=5.0)
+        self.assertEqual(status, 200)
+        self.assertEqual([f["type"] for f in _SchemaRejectingHandler.formats], ["json_schema", "json_object"])
+        self.assertFalse(cli.supports_json_schema)
+
+
+class TestOALookupKeepAlive(unittest.TestCase):
+    def test_json_get_reuses_connection(self):
+        from aiwd import oa_lookup
+
+        _Handler.connections = set()
+        srv = HTTPServer(("127.0.0.1", 0), _Handler)
+        t = threading.Thread(target=srv.serve_forever, daemon=True)
+        t.start()
+        self.addCleanup(srv.server_close)
+        self.addCleanup(srv.shutdown)
+        self.addCleanup(oa_lookup._POOL.close)
+
+        for q in ("a", "b"):
+            status, data = oa_lookup._http_json_get(f"http://127.0.0.1:{srv.server_port}/works?q={q}", timeout_s=5.0)
+            self.assertEqual(status, 200)
+            self.assertEqual(data["message"]["items"][0]["title"], f"/works?q={q}")
+        self.assertEqual(len(_Handler.connections), 1)
+
+    def test_json_get_follows_redirects_and_keeps_error_notes(self):
+        from aiwd import oa_lookup
+
+        _LookupHandler.content_types = []
+        # Threaded: the redirect is re-fetched over urllib while the kept-alive connection stays open.
+        srv = ThreadingHTTPServer(("127.0.0.1", 0), _LookupHandler)
+        t = threading.Thread(target=srv.serve_forever, daemon=True)
+        t.start()
+        self.addCleanup(srv.server_close)
+        self.addCleanup(srv.shutdown)
+        self.addCleanup(oa_lookup._POOL.close)
+        base = f"http://127.0.0.1:{srv.server_port}"
+
+        status, data = oa_lookup._http_json_get(f"{base}/moved", timeout_s=5.0)
+        self.assertEqual((status, data), (200, {"path": "/works"}))
+        self.assertEqual(_LookupHandler.content_types, [None, None])
+
+        status, data = oa_lookup._http_json_get(f"{base}/down", timeout_s=5.0)
+        self.assertEqual(status, 503)
+        self.assertIn("_error", data)
+
+
+class _LookupHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    content_types = []
+
+    def do_GET(self):
+        _LookupHandler.content_types.append(self.headers.get("Content-Type"))
+        if self.path == "/moved":
+            code, body, headers = 301, b"", {"Location": "/works"}
+        elif self.path == "/down":
+            code, body, headers = 503, b"<html>Service Unavailable</html>", {"Content-Type": "text/html"}
+        else:
+            code, body, headers = 200, json.dumps({"path": self.path}).encode("utf-8"), {"Content-Type": "application/json"}
+        self.send_response(code)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
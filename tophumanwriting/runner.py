@@ -117,6 +117,7 @@ def _load_llm(*, timeout_s: float = 90.0):
         max_retries=5,
         base_retry_delay_s=0.9,
         max_retry_delay_s=10.0,
+        json_schema_output=(os.environ.get("TOPHUMANWRITING_LLM_JSON_SCHEMA", "") or "").strip().lower() in ("1", "true", "yes"),
     )
     return OpenAICompatClient(cfg)
 
@@ -329,6 +330,7 @@ class AuditRunner:
                     cost_per_1m_tokens=float(cfg.cost_per_1m_tokens),
                     max_cost=float(cfg.max_cost),
                     progress_cb=progress_cb,
+                    cache_dir=str(self.ws.audit_llm_cache_dir()),
                 )
                 if isinstance(result, dict):
                     result["llm_reviews"] = pack.get("reviews", {}) if isinstance(pack, dict) else {}
@@ -79,3 +79,6 @@ class Workspace:
     def audit_coverage_dir(self) -> Path:
         return self.data_dir / "audit" / "coverage"
 
+    def audit_llm_cache_dir(self) -> Path:
+        return self.data_dir / "audit" / "llm_cache"
+